@@ -0,0 +1,100 @@
+# ================================================================
+# Script: bench_spatial_reader.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Compara a leitura completa de uma camada vetorial com a
+#            leitura filtrada por bbox/mask (spatial_reader.py) em
+#            camadas sintéticas com até milhões de feições.
+# Linguagem: Python
+# Dependências: geopandas, pyogrio, shapely, numpy
+# Data: 2026-10-18
+# ================================================================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import geopandas as gpd
+import numpy as np
+import pyogrio
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geoproc.spatial_reader import build_spatial_index, read_layer  # noqa: E402
+
+
+# --------------------
+# DADOS SINTÉTICOS
+# --------------------
+def gerar_camada(path: str, n: int, tamanho: float = 10.0):
+    """Gera ``n`` quadrados em grade regular (determinístico) em EPSG:32721."""
+    lado = int(np.ceil(np.sqrt(n)))
+    i = np.arange(n)
+    x = 500_000 + (i % lado) * tamanho
+    y = 7_000_000 + (i // lado) * tamanho
+    gdf = gpd.GeoDataFrame(
+        {"id": i, "talhao": (i // 1000).astype(str)},
+        geometry=shapely.box(x, y, x + 0.8 * tamanho, y + 0.8 * tamanho),
+        crs="EPSG:32721",
+    )
+    pyogrio.write_dataframe(gdf, path)
+    return (x.min(), y.min(), x.max() + tamanho, y.max() + tamanho)
+
+
+def cronometrar(funcao, repeticoes: int):
+    """Menor tempo (s) de ``repeticoes`` execuções e o último resultado."""
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+# --------------------
+# EXECUÇÃO
+# --------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000, help="número de feições")
+    parser.add_argument("--fracao", type=float, default=0.01, help="fração da extensão consultada")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--pasta", default=None, help="pasta de trabalho (padrão: temporária)")
+    args = parser.parse_args()
+
+    pasta = args.pasta or tempfile.mkdtemp(prefix="bench_spatial_")
+    path = os.path.join(pasta, f"sintetico_{args.n}.shp")
+    print(f"Gerando {args.n:,} feições em {path} ...")
+    xmin, ymin, xmax, ymax = gerar_camada(path, args.n)
+
+    # consulta: quadrado no centro com a fração de área pedida (≈ uma fazenda)
+    lado = np.sqrt(args.fracao) * (xmax - xmin)
+    cx, cy = (xmin + xmax) / 2, (ymin + ymax) / 2
+    bbox = (cx - lado / 2, cy - lado / 2, cx + lado / 2, cy + lado / 2)
+    mask = shapely.Point(cx, cy).buffer(lado / 2)
+
+    t_indice, _ = cronometrar(lambda: build_spatial_index(path, force=True), 1)
+
+    casos = {
+        "leitura completa + filtro": lambda: (lambda g: g[g.intersects(shapely.box(*bbox))])(
+            pyogrio.read_dataframe(path)
+        ),
+        "bbox OGR (sem índice)": lambda: read_layer(path, bbox=bbox, usar_indice=False),
+        "bbox com índice": lambda: read_layer(path, bbox=bbox),
+        "mask OGR (sem índice)": lambda: read_layer(path, mask=mask, usar_indice=False),
+        "mask com índice": lambda: read_layer(path, mask=mask),
+    }
+
+    print(f"\nÍndice construído em {t_indice:.2f} s\n")
+    print(f"{'caso':<28}{'tempo (s)':>12}{'feições':>12}")
+    referencia = None
+    for nome, funcao in casos.items():
+        tempo, gdf = cronometrar(funcao, args.repeticoes)
+        print(f"{nome:<28}{tempo:>12.3f}{len(gdf):>12,}")
+        if nome.startswith("bbox"):
+            referencia = referencia or len(gdf)
+            assert len(gdf) == referencia, "leituras por bbox retornaram resultados diferentes"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+# ================================================================
+# Script: bench_suite.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Suíte de benchmarks das rotinas do repositório sobre dados
+#            sintéticos determinísticos (sinteticos.py), em vários
+#            tamanhos. Cada caso roda em um processo próprio, para medir
+#            o tempo (parede e CPU) e o pico de memória (RSS) apenas
+#            daquele caso. Os resultados são gravados em JSON, com o
+#            commit e as versões das bibliotecas, e podem ser comparados
+#            com os de outro commit (--comparar).
+# Linguagem: Python
+# Dependências: geopandas, pyogrio, rasterio, shapely, numpy, pandas,
+#               pyarrow, psutil (opcional, pico de memória no Windows)
+# Data: 2026-10-18
+# ================================================================
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from importlib import metadata
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# avisos do GDAL (p. ex. campos renomeados no KML) não poluem a saída
+os.environ.setdefault("CPL_LOG", os.devnull)
+
+import sinteticos  # noqa: E402
+from geoproc.instrument import pico_rss_mb, reiniciar_pico, rss_atual_mb  # noqa: E402
+
+# --------------------
+# TAMANHOS DOS DADOS
+# --------------------
+TAMANHOS = {
+    "pequeno": {
+        "poligonos": 2_000, "raster": 1_024, "bandas": 4, "dms": 20_000, "pontos": 20_000,
+        "kml_arquivos": 8, "kml_feicoes": 200, "merge_camadas": 4, "merge_feicoes": 5_000,
+        "classes_feicoes": 2_000, "amostras": 20_000, "preditoras": 20, "replicas": 10,
+    },
+    "medio": {
+        "poligonos": 20_000, "raster": 4_096, "bandas": 4, "dms": 200_000, "pontos": 200_000,
+        "kml_arquivos": 32, "kml_feicoes": 1_000, "merge_camadas": 8, "merge_feicoes": 50_000,
+        "classes_feicoes": 20_000, "amostras": 200_000, "preditoras": 100, "replicas": 50,
+    },
+    "grande": {
+        "poligonos": 200_000, "raster": 10_240, "bandas": 4, "dms": 2_000_000, "pontos": 1_000_000,
+        "kml_arquivos": 64, "kml_feicoes": 5_000, "merge_camadas": 16, "merge_feicoes": 250_000,
+        "classes_feicoes": 100_000, "amostras": 2_000_000, "preditoras": 200, "replicas": 100,
+    },
+}
+
+PACOTES = ("numpy", "pandas", "geopandas", "shapely", "pyogrio", "rasterio", "pyproj", "pyarrow")
+
+
+# --------------------
+# PREPARAÇÃO DOS DADOS
+# --------------------
+def preparar_dados(pasta: str, tamanho: str, semente: int = 0) -> dict:
+    """Gera (ou reaproveita) os dados sintéticos de um tamanho; retorna os caminhos."""
+    t = TAMANHOS[tamanho]
+    base = os.path.join(pasta, f"{tamanho}_s{semente}")
+    d = {
+        "shp_dir": os.path.join(base, "zonal", "shp"),
+        "tif_dir": os.path.join(base, "zonal", "tif"),
+        "kml_dir": os.path.join(base, "kml"),
+        "merge_dir": os.path.join(base, "merge"),
+        "classes_dir": os.path.join(base, "classes"),
+    }
+    for pasta_dados in d.values():
+        os.makedirs(pasta_dados, exist_ok=True)
+
+    extensao = t["raster"] * sinteticos.TAMANHO_PIXEL
+    d["poligonos"] = sinteticos.gerar_poligonos(
+        os.path.join(d["shp_dir"], "talhoes.shp"), t["poligonos"], extensao, semente
+    )
+    d["tifs"] = [
+        sinteticos.gerar_geotiff(os.path.join(d["tif_dir"], f"imagem_{i}.tif"),
+                                 t["raster"], t["raster"], t["bandas"], semente=semente + i)
+        for i in range(2)
+    ]
+    d["dms_csv"] = sinteticos.gerar_csv_dms(os.path.join(base, "coordenadas_dms.csv"), t["dms"], semente)
+    d["pontos_csv"] = sinteticos.gerar_csv_pontos(os.path.join(base, "pontos.csv"), t["pontos"], semente)
+    sinteticos.gerar_pasta_kml(d["kml_dir"], t["kml_arquivos"], t["kml_feicoes"], semente)
+    # uma das camadas em WGS84, para exercitar a reprojeção do merge
+    d["merge"] = [
+        sinteticos.gerar_poligonos(os.path.join(d["merge_dir"], f"camada_{i}.shp"), t["merge_feicoes"],
+                                   extensao, semente + i, crs="EPSG:4326" if i == 1 else sinteticos.CRS_UTM)
+        for i in range(t["merge_camadas"])
+    ]
+    d["classes"] = [
+        sinteticos.gerar_poligonos(os.path.join(d["classes_dir"], f"classe_{i}.shp"), t["classes_feicoes"],
+                                   extensao, semente + 100 + i)
+        for i in range(3)
+    ]
+    d["amostras_csv"] = sinteticos.gerar_csv_amostras(
+        os.path.join(base, "amostras.csv"), t["amostras"], t["preditoras"], semente=semente
+    )
+    d["replicas"] = t["replicas"]
+    d["talhao_ha"] = extensao ** 2 / 10_000
+    return d
+
+
+# --------------------
+# CASOS (cada um retorna o número de linhas/feições/arquivos produzidos)
+# --------------------
+def caso_zonal(d, saida, n_workers):
+    from geoproc.zonal import zonal_stats_folders
+
+    path = zonal_stats_folders(d["shp_dir"], d["tif_dir"], os.path.join(saida, "zonal.parquet"),
+                               n_workers=n_workers, usar_cache=False, progresso=False)
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def caso_dms(d, saida, n_workers):
+    from geoproc.dms import convert_dms_csv
+
+    return convert_dms_csv(d["dms_csv"], output_dir=saida)["linhas"]
+
+
+def caso_kml_pontos(d, saida, n_workers):
+    from geoproc.kml import points_to_kml
+
+    return points_to_kml(d["pontos_csv"], "kmz", output_dir=saida)["sucesso"]
+
+
+def caso_kml_shp(d, saida, n_workers):
+    from geoproc.kml import convert_folder
+
+    pasta = os.path.join(saida, "kml")
+    shutil.copytree(d["kml_dir"], pasta, ignore=shutil.ignore_patterns("*.zip"))
+    resultado = convert_folder(pasta, n_workers=n_workers)
+    return sum(nome.endswith(".kml") for nome in os.listdir(pasta)) - len(resultado["falhas"])
+
+
+def caso_merge(d, saida, n_workers):
+    from geoproc.vector import merge_layers
+
+    return merge_layers(d["merge"], os.path.join(saida, "unificado.gpkg"), n_workers=n_workers)
+
+
+def caso_filtro(d, saida, n_workers):
+    from geoproc.vector import filter_export
+
+    valores = [f"{i:03d}M" for i in range(0, 50, 5)]
+    return len(filter_export(d["poligonos"], "CD_TALHAO", valores, saida, n_workers=n_workers))
+
+
+def caso_reprojecao(d, saida, n_workers):
+    from geoproc.vector import reproject_layer
+    import pyogrio
+
+    path, _ = reproject_layer(d["poligonos"], "EPSG:4326", os.path.join(saida, "talhoes_4326.gpkg"))
+    return pyogrio.read_info(path)["features"]
+
+
+def caso_recorte(d, saida, n_workers):
+    import pyogrio
+    from geoproc.raster import clip_raster
+
+    shape = pyogrio.read_dataframe(d["classes"][0])
+    return sum(
+        bool(clip_raster(tif, shape, os.path.join(saida, f"recorte_{i}.tif"), n_workers=n_workers))
+        for i, tif in enumerate(d["tifs"])
+    )
+
+
+def caso_reflectancia(d, saida, n_workers):
+    from geoproc.raster import dn_to_reflectance
+
+    estatisticas, _ = dn_to_reflectance(d["tifs"], saida, n_workers=n_workers)
+    return len(estatisticas)
+
+
+def caso_areas(d, saida, n_workers):
+    from geoproc.areas import areas_por_classe
+
+    return len(areas_por_classe(d["classes"], ["Doentes", "Saudaveis", "Mortas"], d["talhao_ha"]))
+
+
+def caso_composicoes(d, saida, n_workers):
+    import pandas as pd
+    from geoproc.composites import amostras_compostas
+
+    df = pd.read_csv(d["amostras_csv"], sep=";")
+    resultado = amostras_compostas(df, 15, 42)
+    resultado.to_csv(os.path.join(saida, "amostras_compostas_wide.csv"), index=False)
+    return len(resultado)
+
+
+def caso_composicoes_replicas(d, saida, n_workers):
+    import pandas as pd
+    from geoproc.composites import composite_replicates
+
+    df = pd.read_csv(d["amostras_csv"], sep=";")
+    return composite_replicates(df, os.path.join(saida, "replicas"), list(range(d["replicas"])), [15],
+                                n_workers=n_workers, progresso=False)
+
+
+# nome → (função, script correspondente)
+CASOS = {
+    "zonal": (caso_zonal, "estati_zonal.py"),
+    "dms": (caso_dms, "convert_dms_to_utm.py"),
+    "kml_pontos": (caso_kml_pontos, "generate_kml_points.py"),
+    "kml_shp": (caso_kml_shp, "convert_kml_shp_auto.py"),
+    "merge": (caso_merge, "merge_shapefiles.py"),
+    "filtro": (caso_filtro, "filter_and_export_features.py"),
+    "reprojecao": (caso_reprojecao, "reproject.py"),
+    "recorte": (caso_recorte, "recorte_raster_por_shapefile.py"),
+    "reflectancia": (caso_reflectancia, "convert_dn_to_reflectance.py"),
+    "areas": (caso_areas, "calcula_areas_classes_shp.py"),
+    "composicoes": (caso_composicoes, "generate_composite_samples.py"),
+    "composicoes_replicas": (caso_composicoes_replicas, "generate_composite_samples.py"),
+}
+
+
+# --------------------
+# MEDIÇÃO
+# --------------------
+def rodar_caso(nome, dados, repeticoes, aquecimento, n_workers, pasta_tmp):
+    """Executa um caso (no processo filho) e devolve tempos e memória."""
+    warnings.simplefilter("ignore")
+    funcao = CASOS[nome][0]
+    rss_base = None
+    tempos, tempos_cpu, resultado = [], [], None
+    for i in range(aquecimento + repeticoes):
+        if i == aquecimento:
+            # o pico passa a valer só para as repetições medidas; sem como
+            # zerá-lo, a base é o pico até aqui (importações e aquecimento)
+            rss_base = rss_atual_mb() if reiniciar_pico() else pico_rss_mb()
+        saida = tempfile.mkdtemp(prefix=f"{nome}_", dir=pasta_tmp)
+        try:
+            with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+                inicio, inicio_cpu = time.perf_counter(), time.process_time()
+                resultado = funcao(dados, saida, n_workers)
+                fim, fim_cpu = time.perf_counter(), time.process_time()
+        finally:
+            shutil.rmtree(saida, ignore_errors=True)
+        if i >= aquecimento:
+            tempos.append(fim - inicio)
+            tempos_cpu.append(fim_cpu - inicio_cpu)
+    rss_pico = pico_rss_mb()
+    return {
+        "caso": nome,
+        "script": CASOS[nome][1],
+        "resultado": resultado,
+        "tempos_s": [round(t, 6) for t in tempos],
+        "melhor_s": round(min(tempos), 6),
+        "mediana_s": round(statistics.median(tempos), 6),
+        "cpu_s": round(statistics.median(tempos_cpu), 6),
+        "rss_base_mb": None if rss_base is None else round(rss_base, 1),
+        "rss_pico_mb": None if rss_pico is None else round(rss_pico, 1),
+        "rss_delta_mb": None if None in (rss_base, rss_pico) else round(max(rss_pico - rss_base, 0), 1),
+    }
+
+
+def _executar_isolado(*args):
+    """Roda o caso em um processo novo (spawn): o pico de RSS é só daquele caso."""
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+        return executor.submit(rodar_caso, *args).result()
+
+
+# --------------------
+# METADADOS E COMPARAÇÃO
+# --------------------
+def metadados(tamanho, semente, repeticoes, n_workers):
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=RAIZ, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    versoes = {}
+    for pacote in PACOTES:
+        try:
+            versoes[pacote] = metadata.version(pacote)
+        except metadata.PackageNotFoundError:
+            versoes[pacote] = None
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "alteracoes_locais": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "tamanho": tamanho,
+        "parametros": TAMANHOS[tamanho],
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "n_workers": n_workers,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "versoes": versoes,
+    }
+
+
+def comparar(base: dict, atual: dict, limite: float = 0.10):
+    """Imprime a razão atual/base de tempo e memória por caso; ⚠️ acima do limite."""
+    if base["meta"]["tamanho"] != atual["meta"]["tamanho"]:
+        print(f"⚠️ Tamanhos diferentes: {base['meta']['tamanho']} × {atual['meta']['tamanho']}")
+    print(f"\nBase: {base['meta']['commit']} ({base['meta']['data']})  →  "
+          f"atual: {atual['meta']['commit']} ({atual['meta']['data']})")
+    print(f"{'caso':<22}{'base (s)':>11}{'atual (s)':>11}{'razão':>8}{'Δ RSS (MB)':>13}")
+    casos_base = {c["caso"]: c for c in base["casos"]}
+    for caso in atual["casos"]:
+        anterior = casos_base.get(caso["caso"])
+        if anterior is None:
+            print(f"{caso['caso']:<22}{'—':>11}{caso['mediana_s']:>11.3f}")
+            continue
+        razao = caso["mediana_s"] / anterior["mediana_s"] if anterior["mediana_s"] else float("nan")
+        delta = caso["rss_delta_mb"]
+        delta_rss = "" if delta is None or anterior["rss_delta_mb"] is None \
+            else f"{delta - anterior['rss_delta_mb']:+.1f}"
+        alerta = " ⚠️" if razao > 1 + limite else (" 🚀" if razao < 1 - limite else "")
+        print(f"{caso['caso']:<22}{anterior['mediana_s']:>11.3f}{caso['mediana_s']:>11.3f}"
+              f"{razao:>8.2f}{delta_rss:>13}{alerta}")
+
+
+# --------------------
+# EXECUÇÃO
+# --------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das rotinas de geoprocessamento.")
+    parser.add_argument("--tamanho", default="pequeno", choices=list(TAMANHOS))
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), help="padrão: todos")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--aquecimento", type=int, default=1, help="execuções descartadas por caso")
+    parser.add_argument("--workers", type=int, default=1, help="n_workers passado às rotinas")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--pasta", default=os.path.join(tempfile.gettempdir(), "geoproc_bench"),
+                        help="pasta dos dados sintéticos (reaproveitados entre execuções)")
+    parser.add_argument("-o", "--saida", help="JSON de resultados (padrão: benchmarks/resultados/)")
+    parser.add_argument("--comparar", nargs="+", metavar="JSON",
+                        help="BASE: compara a execução com BASE; BASE ATUAL: apenas compara os dois")
+    parser.add_argument("--limite", type=float, default=0.10, help="variação destacada na comparação")
+    args = parser.parse_args()
+
+    if args.comparar and len(args.comparar) == 2:
+        with open(args.comparar[0], encoding="utf-8") as f, open(args.comparar[1], encoding="utf-8") as g:
+            comparar(json.load(f), json.load(g), args.limite)
+        return
+
+    print(f"Preparando dados sintéticos ({args.tamanho}) em {args.pasta} ...")
+    inicio = time.perf_counter()
+    dados = preparar_dados(args.pasta, args.tamanho, args.semente)
+    print(f"Dados prontos em {time.perf_counter() - inicio:.1f} s\n")
+
+    pasta_tmp = tempfile.mkdtemp(prefix="saidas_", dir=args.pasta)
+    resultados = {"meta": metadados(args.tamanho, args.semente, args.repeticoes, args.workers), "casos": []}
+    print(f"{'caso':<22}{'mediana (s)':>13}{'melhor (s)':>12}{'CPU (s)':>10}{'Δ RSS (MB)':>12}{'resultado':>12}")
+    try:
+        for nome in args.casos or CASOS:
+            caso = _executar_isolado(nome, dados, args.repeticoes, args.aquecimento, args.workers, pasta_tmp)
+            resultados["casos"].append(caso)
+            delta = "—" if caso["rss_delta_mb"] is None else f"{caso['rss_delta_mb']:.1f}"
+            print(f"{nome:<22}{caso['mediana_s']:>13.3f}{caso['melhor_s']:>12.3f}{caso['cpu_s']:>10.3f}"
+                  f"{delta:>12}{caso['resultado']:>12,}")
+    finally:
+        shutil.rmtree(pasta_tmp, ignore_errors=True)
+
+    saida = args.saida or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "resultados",
+        f"{datetime.now():%Y%m%d-%H%M%S}_{resultados['meta']['commit'] or 'sem-git'}_{args.tamanho}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados salvos em: {saida}")
+
+    if args.comparar:
+        with open(args.comparar[0], encoding="utf-8") as f:
+            comparar(json.load(f), resultados, args.limite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# ================================================================
+# Script: sinteticos.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Geradores determinísticos de dados sintéticos para os
+#            benchmarks: camadas de polígonos, GeoTIFFs multibanda,
+#            CSVs de coordenadas DMS e de pontos, pastas de KML e CSV
+#            de amostras para as composições. A mesma semente gera
+#            sempre os mesmos arquivos, e arquivos já gerados com os
+#            mesmos parâmetros são reaproveitados.
+# Linguagem: Python
+# Dependências: geopandas, pyogrio, rasterio, shapely, numpy, pandas
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+import rasterio
+import shapely
+from rasterio.transform import from_origin
+
+# --------------------
+# PARÂMETROS
+# --------------------
+CRS_UTM = "EPSG:32721"          # WGS 84 / UTM 21S
+ORIGEM = (500_000.0, 7_000_000.0)  # canto superior esquerdo da área (m)
+TAMANHO_PIXEL = 1.0             # m
+LON0, LAT0 = -57.0, -27.0       # referência dos pontos em graus
+
+
+def _existe(*paths):
+    return all(os.path.exists(p) for p in paths)
+
+
+# --------------------
+# POLÍGONOS
+# --------------------
+def gerar_poligonos(path: str, n: int, extensao: float = 2_000.0, semente: int = 0,
+                    crs: str = CRS_UTM, raio=(0.5, 20.0)):
+    """
+    Gera ``n`` polígonos (pontos com buffer de raio aleatório) sobre a área
+    ``extensao × extensao`` m a partir de ORIGEM, com os campos id,
+    CD_TALHAO (texto) e area_ha (float).
+
+    Retorna:
+        str: caminho gravado
+    """
+    if _existe(path):
+        return path
+    rng = np.random.default_rng(semente)
+    x0, y0 = ORIGEM
+    pts = rng.uniform([x0, y0 - extensao], [x0 + extensao, y0], (n, 2))
+    geoms = shapely.buffer(shapely.points(pts), rng.uniform(*raio, n), quad_segs=4)
+    gdf = gpd.GeoDataFrame(
+        {
+            "id": np.arange(n),
+            "CD_TALHAO": np.char.add(np.char.zfill((np.arange(n) % 50).astype(str), 3), "M"),
+            "area_ha": shapely.area(geoms) / 10_000,
+        },
+        geometry=geoms,
+        crs=CRS_UTM,
+    )
+    if crs != CRS_UTM:
+        gdf = gdf.to_crs(crs)
+    pyogrio.write_dataframe(gdf, path)
+    return path
+
+
+# --------------------
+# RASTERS
+# --------------------
+def gerar_geotiff(path: str, largura: int, altura: int, bandas: int = 4, dtype: str = "uint16",
+                  semente: int = 0, nodata=None, bloco: int = 256):
+    """
+    Gera um GeoTIFF multibanda ladrilhado (DN aleatórios com gradiente
+    suave, para que a compressão e as estatísticas não sejam triviais).
+
+    Retorna:
+        str: caminho gravado
+    """
+    if _existe(path):
+        return path
+    rng = np.random.default_rng(semente)
+    perfil = {
+        "driver": "GTiff", "width": largura, "height": altura, "count": bandas,
+        "dtype": dtype, "crs": CRS_UTM, "nodata": nodata,
+        "transform": from_origin(*ORIGEM, TAMANHO_PIXEL, TAMANHO_PIXEL),
+        "tiled": True, "blockxsize": bloco, "blockysize": bloco, "compress": "deflate",
+    }
+    maximo = np.iinfo(dtype).max if np.dtype(dtype).kind in "ui" else 1.0
+    with rasterio.open(path, "w", **perfil) as dst:
+        # gravação em faixas de blocos (memória limitada para rasters grandes)
+        for linha in range(0, altura, bloco):
+            h = min(bloco, altura - linha)
+            gradiente = np.linspace(0.2, 0.8, largura)[None, :]
+            for banda in range(1, bandas + 1):
+                ruido = rng.random((h, largura))
+                valores = (0.7 * gradiente + 0.3 * ruido) * maximo
+                dst.write(valores.astype(dtype), banda, window=((linha, linha + h), (0, largura)))
+    return path
+
+
+# --------------------
+# COORDENADAS (CSV)
+# --------------------
+def _dms(valores, casas=4):
+    """Graus decimais → texto DMS (ex.: -27°53'38.9714")."""
+    sinal = np.where(valores < 0, "-", "")
+    absoluto = np.abs(valores)
+    graus = np.floor(absoluto).astype(int)
+    minutos_f = (absoluto - graus) * 60
+    minutos = np.floor(minutos_f).astype(int)
+    segundos = np.round((minutos_f - minutos) * 60, casas)
+    return [f"{s}{g}°{m}'{seg:.{casas}f}\"" for s, g, m, seg in zip(sinal, graus, minutos, segundos)]
+
+
+def gerar_csv_dms(path: str, n: int, semente: int = 0, fracao_invalidas: float = 0.001):
+    """
+    Gera um CSV (separador ';') no formato lido por convert_dms_to_utm.py:
+    ponto;lat;long;alt;sigmaLat;sigmaLong;sigmaAlt, com uma pequena fração
+    de coordenadas inválidas e variações de símbolo (º, '').
+
+    Retorna:
+        str: caminho gravado
+    """
+    if _existe(path):
+        return path
+    rng = np.random.default_rng(semente)
+    lat = LAT0 + rng.uniform(-1.0, 1.0, n)
+    lon = LON0 + rng.uniform(-1.0, 1.0, n)
+    df = pd.DataFrame({
+        "ponto": [f"P{i}" for i in range(n)],
+        "lat": _dms(lat),
+        "long": _dms(lon),
+        "alt": np.round(rng.uniform(50, 900, n), 2),
+        "sigmaLat": 0.1, "sigmaLong": 0.1, "sigmaAlt": 0.2,
+    })
+    # variações de escrita tratadas pela normalização
+    variar = rng.random(n) < 0.1
+    df.loc[variar, "lat"] = df.loc[variar, "lat"].str.replace("°", "º").str.replace('"', "''")
+    invalidas = rng.random(n) < fracao_invalidas
+    df.loc[invalidas, "long"] = "sem coordenada"
+    df.to_csv(path, sep=";", index=False)
+    return path
+
+
+def gerar_csv_pontos(path: str, n: int, semente: int = 0):
+    """
+    Gera o CSV de pontos em graus decimais (ponto, latitude, longitude,
+    alt) lido por generate_kml_points.py.
+
+    Retorna:
+        str: caminho gravado
+    """
+    if _existe(path):
+        return path
+    rng = np.random.default_rng(semente)
+    pd.DataFrame({
+        "ponto": [f"P{i}" for i in range(n)],
+        "latitude": LAT0 + rng.uniform(-1.0, 1.0, n),
+        "longitude": LON0 + rng.uniform(-1.0, 1.0, n),
+        "alt": np.round(rng.uniform(50, 900, n), 2),
+    }).to_csv(path, index=False)
+    return path
+
+
+# --------------------
+# KML
+# --------------------
+def gerar_pasta_kml(pasta: str, n_arquivos: int, n_feicoes: int, semente: int = 0):
+    """
+    Gera ``n_arquivos`` KMLs de polígonos (WGS84) com ``n_feicoes`` cada,
+    para convert_kml_shp_auto.py.
+
+    Retorna:
+        list: caminhos dos KMLs
+    """
+    os.makedirs(pasta, exist_ok=True)
+    paths = [os.path.join(pasta, f"area_{i:03d}.kml") for i in range(n_arquivos)]
+    for i, path in enumerate(paths):
+        if _existe(path):
+            continue
+        tmp = os.path.join(pasta, f"area_{i:03d}.tmp.shp")
+        gerar_poligonos(tmp, n_feicoes, semente=semente + i, crs="EPSG:4326")
+        gdf = pyogrio.read_dataframe(tmp)
+        pyogrio.write_dataframe(gdf, path, driver="KML", layer=f"area_{i:03d}")
+        for ext in (".shp", ".shx", ".dbf", ".prj", ".cpg"):
+            if os.path.exists(tmp[:-4] + ext):
+                os.remove(tmp[:-4] + ext)
+    return paths
+
+
+# --------------------
+# AMOSTRAS (COMPOSIÇÕES)
+# --------------------
+def gerar_csv_amostras(path: str, n_linhas: int, n_preditoras: int = 20, n_classes: int = 4,
+                       semente: int = 0):
+    """
+    Gera o CSV (separador ';') de generate_composite_samples.py, com as
+    colunas classe, preditoras e median.
+
+    Retorna:
+        str: caminho gravado
+    """
+    if _existe(path):
+        return path
+    rng = np.random.default_rng(semente)
+    classes = np.array([chr(ord("A") + i) for i in range(n_classes)])
+    preditoras = np.array([f"p{i:03d}" for i in range(n_preditoras)])
+    pd.DataFrame({
+        "classe": classes[rng.integers(0, n_classes, n_linhas)],
+        "preditoras": preditoras[rng.integers(0, n_preditoras, n_linhas)],
+        "median": rng.normal(0, 100, n_linhas),
+    }).to_csv(path, sep=";", index=False)
+    return path
@@ -0,0 +1,45 @@
+# ================================================================
+# Script: calcula_areas_classes_shp.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Versão em Python de calcula_areas_classes_shp.R.
+#            Calcula área (m² e ha) e porcentagem por classe temática
+#            (ex: Saudáveis, Doentes, Mortas) a partir de shapefiles.
+#            A área de cada feição é obtida de forma vetorizada, sem
+#            dissolver a classe; apenas os grupos de polígonos que se
+#            sobrepõem (detectados por índice espacial) são unidos,
+#            em blocos, para não contar a sobreposição duas vezes.
+#            A lógica está em geoproc.areas (também: geoproc areas ...).
+# Linguagem: Python
+# Dependências: pyogrio, shapely, numpy, pandas, pyproj
+# Data: 2026-10-18
+# ================================================================
+
+import os
+from geoproc.areas import areas_por_classe
+
+# --------------------
+# ENTRADAS
+# --------------------
+# área do talhão (hectares)
+talhao_ha = 26
+
+# caminhos dos shapefiles
+arquivos = [
+    "D:/classificacao/class_0_estress.shp",
+    "D:/classificacao/class_1_saudaveis.shp",
+    "D:/classificacao/class_2_mortas.shp",
+]
+rotulos = ["Doentes", "Saudaveis", "Mortas"]
+
+# classes somadas em TOTAL_PLANTAS
+classes_plantas = ["Doentes", "Saudaveis", "Mortas"]
+
+# --------------------
+# SAÍDA
+# --------------------
+if __name__ == "__main__":
+    tabela_final = areas_por_classe(arquivos, rotulos, talhao_ha, classes_plantas)
+    print(tabela_final.to_string(index=False))
+    saida = os.path.join(os.path.dirname(arquivos[0]), "quantificacao_areas_por_classe.csv")
+    tabela_final.to_csv(saida, index=False)
+    print(f"✅ Tabela salva em: {saida}")
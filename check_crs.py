@@ -3,17 +3,16 @@
 # Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
 # Descrição: Funções utilitárias para leitura e extração do sistema
 #            de referência de coordenadas (CRS) de arquivos shapefile (.shp)
-#            e raster (.tif).
+#            e raster (.tif), e de pastas inteiras pelo catálogo de
+#            metadados do pacote geoproc.
 # Linguagem: Python
-# Dependências: fiona, rasterio
+# Dependências: rasterio, geoproc (get_shapefile_crs, get_folder_crs)
 # Data: 2025-10-25
 # ================================================================
 
 import os
-import fiona
 import rasterio
 from rasterio.crs import CRS
-from fiona.crs import from_epsg, from_string
 
 # --------------------
 # FUNÇÕES
@@ -21,15 +20,17 @@ from fiona.crs import from_epsg, from_string
 def get_shapefile_crs(shapefile_path: str):
     """
     Obtém o CRS (Coordinate Reference System) de um arquivo shapefile (.shp).
+    Mesma leitura usada pelo leitor filtrado (geoproc/spatial_reader.py).
 
     Parâmetros:
         shapefile_path (str): caminho completo do arquivo .shp
 
     Retorna:
-        dict: dicionário com informações do CRS
+        pyproj.CRS: CRS do shapefile (None se não definido)
     """
-    with fiona.open(shapefile_path) as src:
-        return src.crs
+    from geoproc.spatial_reader import get_shapefile_crs as crs_da_camada
+
+    return crs_da_camada(shapefile_path)
 
 
 def get_raster_crs(raster_path: str):
@@ -44,3 +45,26 @@ def get_raster_crs(raster_path: str):
     """
     with rasterio.open(raster_path) as src:
         return src.crs
+
+
+def get_folder_crs(folder_path: str, db_path: str = None) -> dict:
+    """
+    Obtém o CRS de todos os rasters e camadas vetoriais de uma pasta (com
+    subpastas) pelo catálogo de metadados (geoproc/catalog.py): apenas os
+    arquivos novos ou alterados desde a última consulta são abertos.
+
+    Parâmetros:
+        folder_path (str): pasta varrida
+        db_path (str): banco SQLite do catálogo (padrão: dentro da pasta)
+
+    Retorna:
+        dict: {caminho: CRS} (CRS como 'EPSG:xxxx' ou WKT; None se ausente)
+    """
+    from geoproc.catalog import CrsCatalog
+
+    prefixo = os.path.join(os.path.abspath(folder_path), '')
+    with CrsCatalog.for_folder(folder_path, db_path) as catalogo:
+        catalogo.refresh(folder_path)
+        tabela = catalogo.query(where="substr(path, 1, ?) = ?", params=(len(prefixo), prefixo))
+    tabela = tabela.drop_duplicates('path')  # GeoPackage com várias camadas: a primeira
+    return {path: (crs if isinstance(crs, str) else None) for path, crs in zip(tabela['path'], tabela['crs'])}
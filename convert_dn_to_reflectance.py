@@ -0,0 +1,53 @@
+# ================================================================
+# Script: convert_dn_to_reflectance.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Versão em Python de convert_dn_to_reflectance.R.
+#            Converte imagens multibanda (.tif) de valores digitais (DN)
+#            para reflectância normalizada (0–1). Cada arquivo é lido e
+#            gravado uma única vez, em faixas processadas por um pool de
+#            processos; mínimo, máximo e histograma de cada banda são
+#            calculados na mesma passagem (sem reler as saídas).
+#            Saída em float32 comprimido ou uint16 escalonado.
+#            A lógica está em geoproc.raster.dn_to_reflectance
+#            (também: geoproc reflectance <pasta>).
+# Linguagem: Python
+# Dependências: rasterio, numpy, pandas
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import glob
+from geoproc.raster import dn_to_reflectance
+
+# --------------------
+# ENTRADAS
+# --------------------
+# pasta com os arquivos TIFF de entrada
+dir_bandas = "D:/01-TESE/03-Capitulo_IV/orto_teste"
+
+# pasta de saída para os arquivos convertidos
+dir_saida  = "D:/"
+
+# 'float32' (reflectância 0–1) ou 'uint16' (reflectância × 10000, com escala nos metadados)
+tipo_saida = 'float32'
+
+# processos simultâneos (1 = serial)
+n_workers = os.cpu_count() or 4
+
+# --------------------
+# LOOP DE PROCESSAMENTO
+# --------------------
+if __name__ == "__main__":
+    # saídas (_ref.tif) de execuções anteriores não são convertidas de novo
+    arquivos = sorted(f for f in glob.glob(os.path.join(dir_bandas, "*.tif")) if not f.endswith("_ref.tif"))
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum arquivo .tif encontrado em: {dir_bandas}")
+
+    estatisticas, histogramas = dn_to_reflectance(arquivos, dir_saida, tipo_saida, n_workers)
+
+    # --------------------
+    # ESTATÍSTICAS (MESMA PASSAGEM)
+    # --------------------
+    estatisticas.to_csv(os.path.join(dir_saida, "estatisticas_reflectancia.csv"), index=False)
+    histogramas.to_csv(os.path.join(dir_saida, "histogramas_reflectancia.csv"), index=False)
+    print(f"✅ {len(arquivos)} arquivos convertidos. Estatísticas em: {dir_saida}")
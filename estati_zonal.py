@@ -3,19 +3,21 @@
 # Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
 # Descrição: Executa cálculo automatizado de estatísticas zonais (min, max,
 #            média e mediana) entre múltiplos shapefiles e rasters (.tif),
-#            salvando os resultados em planilha Excel.
+#            gravando os resultados de forma incremental em Parquet/CSV,
+#            com exportação opcional para Excel. Cada shapefile é
+#            rasterizado uma única vez por grade raster e os pares podem
+#            ser processados em paralelo (n_workers). Resultados por par
+#            ficam em cache: novas execuções calculam apenas pares novos
+#            ou alterados. Tempo e memória por etapa podem ser
+#            registrados (arquivo_trace). A lógica está em geoproc.zonal
+#            (também disponível como: geoproc zonal <shps> <tifs>).
 # Linguagem: Python
-# Dependências: geopandas, rasterio, rasterstats, numpy, pandas, tqdm
+# Dependências: geopandas, rasterio, numpy, pandas, tqdm, pyarrow, openpyxl
 # Data: 2025-10-25
 # ================================================================
 
-import os
-import numpy as np
-import pandas as pd
-import rasterio
-from rasterstats import zonal_stats
-import geopandas as gpd
-from tqdm import tqdm
+from geoproc.instrument import enable_tracing
+from geoproc.zonal import zonal_stats_folders
 
 # --------------------
 # CONFIGURAÇÃO DE DIRETÓRIOS
@@ -24,46 +26,64 @@ shp_folder = r"D:\shps"
 tif_folder = r"D:\camadas_raster"
 
 # --------------------
-# LISTAGEM DE ARQUIVOS
+# EXECUÇÃO
 # --------------------
-shp_files = [f for f in os.listdir(shp_folder) if f.endswith('.shp')]
-tif_files = [f for f in os.listdir(tif_folder) if f.endswith('.tif')]
+# número de processos: 1 = serial; None = todos os núcleos da máquina
+n_workers = 1
+
+# estatísticas calculadas: média, mediana, mínimo, máximo
+stats = ['mean', 'median', 'min', 'max']
 
 # --------------------
-# DATAFRAME PRINCIPAL
+# RESOLUÇÃO DE LEITURA (OVERVIEWS)
 # --------------------
-results_df = pd.DataFrame()
+# None = resolução original. Com um número N, cada par lê o overview mais
+# grosseiro em que o menor polígono ainda cobre N pixels (médias
+# aproximadas com muito menos leitura; útil em talhões grandes)
+min_pixels_poligono = None
+# gera overviews internos (average) nos rasters que ainda não os têm
+gerar_overviews = False
 
 # --------------------
-# LOOP PRINCIPAL: PROCESSA TODOS OS SHAPEFILES E RASTERS
+# CACHE DE RESULTADOS
 # --------------------
-for shp_file in tqdm(shp_files, desc="Processando Shapefiles"):
-    shp_path = os.path.join(shp_folder, shp_file)
-    gdf = gpd.read_file(shp_path)
-
-    for tif_file in tqdm(tif_files, desc=f"Processando Rasters para {shp_file}", leave=False):
-        tif_path = os.path.join(tif_folder, tif_file)
-
-        # Estatísticas zonais: média, mediana, mínimo, máximo
-        stats = zonal_stats(shp_path, tif_path, stats=['mean', 'median', 'min', 'max'])
+usar_cache = True
+# pasta do cache (None = '.cache_zonal' ao lado da saída)
+cache_dir = None
+# 'mtime' (tamanho + data de modificação) ou 'hash' (conteúdo, mais lento)
+cache_modo = 'mtime'
+# tamanho máximo do cache; as entradas menos usadas são removidas
+cache_max_gb = 2
 
-        # Cria DataFrame temporário
-        temp_df = pd.DataFrame(stats)
-        temp_df['shapefile'] = shp_file
-        temp_df['raster'] = tif_file
-        temp_df['polygon_id'] = range(1, len(temp_df) + 1)
-
-        # Concatena resultados
-        results_df = pd.concat([results_df, temp_df], ignore_index=True)
+# --------------------
+# SAÍDA
+# --------------------
+# formato do arquivo de resultados: 'parquet', 'feather' ou 'csv'
+formato_saida = 'parquet'
+# exporta também para Excel ao final (dividido em abas se necessário)
+exportar_excel = True
 
 # --------------------
-# ORGANIZAÇÃO E SAÍDA
+# INSTRUMENTAÇÃO
 # --------------------
-cols = ['shapefile', 'raster', 'polygon_id', 'min', 'max', 'mean', 'median']
-results_df = results_df[cols]
+# tempo, CPU, E/S e memória por etapa (leitura, rasterização, estatísticas,
+# gravação…) e arquivo: '.jsonl' ou trace do Chrome ('.json'); None = desativada
+arquivo_trace = None
 
-# Caminho de saída
-output_path = os.path.join(os.path.dirname(shp_folder), 'estatisticas_zonais.xlsx')
-results_df.to_excel(output_path, index=False)
 
-print(f"Processo concluído! Resultados salvos em: {output_path}")
+if __name__ == "__main__":
+    if arquivo_trace:
+        enable_tracing(arquivo_trace)  # arquivo concluído ao final da execução
+    zonal_stats_folders(
+        shp_folder, tif_folder,
+        stats=stats,
+        n_workers=n_workers,
+        formato_saida=formato_saida,
+        usar_cache=usar_cache,
+        cache_dir=cache_dir,
+        cache_modo=cache_modo,
+        cache_max_gb=cache_max_gb,
+        exportar_excel=exportar_excel,
+        min_pixels_poligono=min_pixels_poligono,
+        gerar_overviews=gerar_overviews,
+    )
@@ -3,69 +3,74 @@
 # Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
 # Descrição: Gera amostras compostas a partir de dados tabulares contendo
 #            classes e preditores, calculando médias por bloco e exportando
-#            o resultado em formato wide (.csv).
+#            o resultado em formato wide (.csv). No modo réplicas, gera
+#            várias versões (uma por semente) em paralelo e grava um
+#            dataset Parquet particionado pela coluna 'replicate'.
+#            A lógica está em geoproc.composites
+#            (também: geoproc composites <csv>).
 # Linguagem: Python
-# Dependências: pandas, numpy
+# Dependências: pandas, numpy, tqdm, pyarrow (modo réplicas)
 # Data: 2025-10-25
 # ================================================================
 
 import pandas as pd
-import numpy as np
 import os
+from geoproc.composites import amostras_compostas, composite_replicates
 
-# --------------------
-# 1. LEITURA DO ARQUIVO
-# --------------------
-file_path = input("Informe o caminho completo do arquivo CSV: ").strip()
-if not os.path.isfile(file_path):
-    raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-df = pd.read_csv(file_path, sep=';', decimal='.')
-df.columns = df.columns.str.strip()
+if __name__ == "__main__":
+    # --------------------
+    # 1. LEITURA DO ARQUIVO
+    # --------------------
+    file_path = input("Informe o caminho completo do arquivo CSV: ").strip()
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-print(f"Colunas detectadas: {df.columns.tolist()}")
-print(df.head())
+    df = pd.read_csv(file_path, sep=';', decimal='.')
+    df.columns = df.columns.str.strip()
 
-# --------------------
-# 2. PARÂMETROS
-# --------------------
-n_amostras = 15  # número de amostras compostas desejadas por classe
-amostras_por_preditor = {}
+    print(f"Colunas detectadas: {df.columns.tolist()}")
+    print(df.head())
 
-# --------------------
-# 3. GERAÇÃO DAS AMOSTRAS COMPOSTAS
-# --------------------
-for classe in df['classe'].unique():
-    for pred in df['preditoras'].unique():
-        df_pred = (
-            df[(df['classe'] == classe) & (df['preditoras'] == pred)]
-            .sample(frac=1, random_state=42)
-            .reset_index(drop=True)
-        )
-        splits = np.array_split(df_pred, n_amostras)
-        for i, bloco in enumerate(splits):
-            key = (classe, i + 1)
-            if key not in amostras_por_preditor:
-                amostras_por_preditor[key] = {'amostra_id': i + 1, 'classe': classe}
-            amostras_por_preditor[key][pred] = bloco['median'].mean()
+    # --------------------
+    # 2. PARÂMETROS
+    # --------------------
+    n_amostras = 15  # número de amostras compostas desejadas por classe
+    random_state = 42
 
-# --------------------
-# 4. ORGANIZAÇÃO E EXPORTAÇÃO
-# --------------------
-amostras = list(amostras_por_preditor.values())
-df_final = pd.DataFrame(amostras)
+    # modo réplicas: gera várias versões (uma por semente) em uma única execução
+    modo_replicas = False
+    n_replicas = 100
+    sementes = None                # padrão: random_state, random_state + 1, ...
+    n_amostras_replicas = None     # padrão: [n_amostras]; lista gera réplicas para cada valor
+    n_workers = os.cpu_count() or 4
 
-# organiza colunas
-cols = ['amostra_id', 'classe'] + sorted(
-    [c for c in df_final.columns if c not in ['amostra_id', 'classe']]
-)
-df_final = df_final[cols]
+    if not modo_replicas:
+        # --------------------
+        # 3. GERAÇÃO DAS AMOSTRAS COMPOSTAS
+        # --------------------
+        df_final = amostras_compostas(df, n_amostras, random_state)
 
-print("\nPrévia das amostras compostas:")
-print(df_final.head(20))
+        # --------------------
+        # 4. EXPORTAÇÃO
+        # --------------------
+        print("\nPrévia das amostras compostas:")
+        print(df_final.head(20))
 
-# salva arquivo final
-output_path = os.path.join(os.path.dirname(file_path), 'amostras_compostas_wide.csv')
-df_final.to_csv(output_path, index=False)
+        # salva arquivo final
+        output_path = os.path.join(os.path.dirname(file_path), 'amostras_compostas_wide.csv')
+        df_final.to_csv(output_path, index=False)
 
-print(f"\nProcesso concluído! Arquivo salvo em: {output_path}")
+        print(f"\nProcesso concluído! Arquivo salvo em: {output_path}")
+    else:
+        # --------------------
+        # 3. GERAÇÃO DAS RÉPLICAS EM PARALELO
+        # --------------------
+        # --------------------
+        # 4. EXPORTAÇÃO (DATASET PARQUET PARTICIONADO POR RÉPLICA)
+        # --------------------
+        sementes = sementes or list(range(random_state, random_state + n_replicas))
+        output_path = os.path.join(os.path.dirname(file_path), 'amostras_compostas_replicas')
+        n = composite_replicates(df, output_path, sementes, n_amostras_replicas or [n_amostras], n_workers)
+
+        print(f"\nProcesso concluído! {n} réplicas salvas em: {output_path}")
@@ -0,0 +1,83 @@
+# ================================================================
+# Script: __init__.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Pacote geoproc: rotinas de geoprocessamento importáveis.
+#            As funções públicas são expostas aqui com importação tardia
+#            (PEP 562): ``import geoproc`` não carrega geopandas,
+#            rasterio ou pyproj; cada dependência pesada só é importada
+#            quando a função correspondente é usada.
+# Linguagem: Python
+# Dependências: (nenhuma na importação)
+# Data: 2026-10-18
+# ================================================================
+
+import importlib
+
+__version__ = "0.1.0"
+
+# função pública → submódulo que a define
+_EXPORTS = {
+    # estatísticas zonais
+    'zonal_stats_batch': 'geoproc.zonal_engine',
+    'zonal_stats_layer': 'geoproc.zonal_engine',
+    'zonal_stats_folders': 'geoproc.zonal',
+    # coordenadas DMS
+    'dms_to_decimal': 'geoproc.dms',
+    'dms_to_utm': 'geoproc.dms',
+    'convert_dms_csv': 'geoproc.dms',
+    # camadas vetoriais
+    'merge_layers': 'geoproc.vector',
+    'filter_features': 'geoproc.vector',
+    'filter_export': 'geoproc.vector',
+    'reproject_layer': 'geoproc.vector',
+    'reproject_folder': 'geoproc.vector',
+    'merge_frames': 'geoproc.vector',
+    'read_layer': 'geoproc.spatial_reader',
+    'build_spatial_index': 'geoproc.spatial_reader',
+    'get_shapefile_crs': 'geoproc.spatial_reader',
+    # KML
+    'kml_to_shp': 'geoproc.kml',
+    'shp_to_kml': 'geoproc.kml',
+    'convert_folder': 'geoproc.kml',
+    'points_to_kml': 'geoproc.kml',
+    # rasters
+    'clip_raster': 'geoproc.raster',
+    'dn_to_reflectance': 'geoproc.raster',
+    'build_overviews': 'geoproc.raster',
+    'convert_to_cog': 'geoproc.raster',
+    'build_stack': 'geoproc.stack',
+    'RasterStack': 'geoproc.stack',
+    # áreas e amostras
+    'areas_por_classe': 'geoproc.areas',
+    'amostras_compostas': 'geoproc.composites',
+    'composite_replicates': 'geoproc.composites',
+    # fluxos de etapas
+    'run_pipeline': 'geoproc.pipeline',
+    'load_pipeline': 'geoproc.pipeline',
+    # catálogo de metadados
+    'CrsCatalog': 'geoproc.catalog',
+    'build_catalog': 'geoproc.catalog',
+    # instrumentação
+    'stage': 'geoproc.instrument',
+    'enable_tracing': 'geoproc.instrument',
+    'disable_tracing': 'geoproc.instrument',
+    'tracing': 'geoproc.instrument',
+    # resultados
+    'ResultSink': 'geoproc.result_sink',
+    'ResultCache': 'geoproc.result_cache',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(nome):
+    """Importa o submódulo apenas no primeiro acesso à função."""
+    if nome in _EXPORTS:
+        valor = getattr(importlib.import_module(_EXPORTS[nome]), nome)
+        globals()[nome] = valor
+        return valor
+    raise AttributeError(f"module 'geoproc' has no attribute '{nome}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
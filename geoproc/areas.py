@@ -0,0 +1,183 @@
+# ================================================================
+# Script: areas.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Área (m² e ha) e porcentagem do talhão por classe temática a
+#            partir de shapefiles rotulados por classe (arquivos com o
+#            mesmo rótulo formam uma só classe). A área de cada feição é
+#            obtida de forma vetorizada, sem dissolver a classe; apenas os
+#            grupos de polígonos que se sobrepõem (detectados por índice
+#            espacial) são unidos, em blocos.
+# Linguagem: Python
+# Dependências: pyogrio, shapely, numpy, pandas, pyproj
+# Data: 2026-10-18
+# ================================================================
+
+import numpy as np
+import pandas as pd
+import pyogrio
+import shapely
+from pyproj import CRS, Transformer
+from geoproc.instrument import traced
+
+# --------------------
+# PARÂMETROS
+# --------------------
+# geometrias unidas por vez ao dissolver um grupo de sobreposições
+TAMANHO_BLOCO_UNIAO = 10_000
+
+
+# --------------------
+# ÁREAS POR CLASSE
+# --------------------
+def validar(geoms: np.ndarray) -> np.ndarray:
+    """Aplica make_valid apenas às geometrias inválidas."""
+    invalidas = ~shapely.is_valid(geoms)
+    if invalidas.any():
+        geoms = geoms.copy()
+        geoms[invalidas] = shapely.make_valid(geoms[invalidas])
+    return geoms
+
+
+def crs_local_laea(geoms: np.ndarray, crs) -> CRS:
+    """LAEA centrada na área (ponderada) das feições, como no script em R."""
+    centroides = shapely.centroid(geoms)
+    pesos = shapely.area(geoms)
+    pesos = pesos if pesos.sum() > 0 else None
+    lon = np.average(shapely.get_x(centroides), weights=pesos)
+    lat = np.average(shapely.get_y(centroides), weights=pesos)
+    if not CRS.from_user_input(crs).equals(CRS.from_epsg(4326)):
+        lon, lat = Transformer.from_crs(crs, 4326, always_xy=True).transform(lon, lat)
+    return CRS.from_proj4(
+        f"+proj=laea +lat_0={lat} +lon_0={lon} +x_0=0 +y_0=0 +datum=WGS84 +units=m +no_defs"
+    )
+
+
+def reprojetar(geoms: np.ndarray, origem, destino) -> np.ndarray:
+    """Reprojeta um array de geometrias (sem passar por GeoDataFrame)."""
+    if CRS.from_user_input(origem) == CRS.from_user_input(destino):
+        return geoms
+    transformer = Transformer.from_crs(origem, destino, always_xy=True)
+    return shapely.transform(geoms, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+
+
+def grupos_sobrepostos(geoms: np.ndarray) -> np.ndarray:
+    """
+    Identifica os grupos de polígonos cujos interiores se sobrepõem.
+
+    Os pares candidatos vêm do STRtree (caixas envolventes) e são
+    confirmados pelo padrão DE-9IM de interiores em comum; polígonos
+    que apenas se tocam na borda não formam grupo.
+
+    Parâmetros:
+        geoms (numpy.ndarray): geometrias de uma classe
+
+    Retorna:
+        numpy.ndarray: rótulo do grupo de cada geometria (-1 = sem sobreposição)
+    """
+    n = len(geoms)
+    grupo = np.full(n, -1, dtype=np.int64)
+    if n < 2:
+        return grupo
+    i, j = shapely.STRtree(geoms).query(geoms)
+    par = i < j
+    i, j = i[par], j[par]
+    sobrepoe = shapely.relate_pattern(geoms[i], geoms[j], 'T********')
+    i, j = i[sobrepoe], j[sobrepoe]
+    if len(i) == 0:
+        return grupo
+
+    # componentes conexas do grafo de sobreposições (propagação do menor rótulo)
+    rotulo = np.arange(n)
+    while True:
+        menor = np.minimum(rotulo[i], rotulo[j])
+        anterior = rotulo.copy()
+        np.minimum.at(rotulo, i, menor)
+        np.minimum.at(rotulo, j, menor)
+        rotulo = rotulo[rotulo]
+        if np.array_equal(rotulo, anterior):
+            break
+    envolvidos = np.unique(np.concatenate([i, j]))
+    grupo[envolvidos] = rotulo[envolvidos]
+    return grupo
+
+
+def uniao_em_blocos(geoms: np.ndarray, tamanho: int = TAMANHO_BLOCO_UNIAO):
+    """unary_union em blocos de geometrias vizinhas (ordenadas por xmin), reduzidos em rodadas."""
+    while len(geoms) > 1:
+        geoms = geoms[np.argsort(shapely.bounds(geoms)[:, 0], kind='stable')]
+        geoms = np.array(
+            [shapely.union_all(geoms[k:k + tamanho]) for k in range(0, len(geoms), tamanho)],
+            dtype=object,
+        )
+    return geoms[0]
+
+
+def area_classe(geoms: np.ndarray) -> float:
+    """Área (m²) da classe dissolvida, unindo apenas os grupos sobrepostos."""
+    if len(geoms) == 0:
+        return 0.0
+    areas = shapely.area(geoms)
+    grupo = grupos_sobrepostos(geoms)
+    soltas = grupo < 0
+    total = areas[soltas].sum()
+    if not soltas.all():
+        ordem = np.argsort(grupo[~soltas], kind='stable')
+        sobrepostas, rotulos_grupo = geoms[~soltas][ordem], grupo[~soltas][ordem]
+        cortes = np.flatnonzero(np.diff(rotulos_grupo)) + 1
+        for bloco in np.split(sobrepostas, cortes):
+            total += shapely.area(shapely.make_valid(uniao_em_blocos(bloco)))
+    return float(total)
+
+
+@traced("areas_por_classe")
+def areas_por_classe(arquivos: list, rotulos: list, talhao_ha: float,
+                     classes_plantas: list = None) -> pd.DataFrame:
+    """
+    Área (m², ha) e porcentagem do talhão por classe, com as linhas de totais.
+    Como no script em R (group_by(classe) + st_union), arquivos com o mesmo
+    rótulo são dissolvidos juntos: uma linha por classe, na ordem dos rótulos.
+
+    Parâmetros:
+        arquivos (list): shapefiles de entrada
+        rotulos (list): nome da classe de cada shapefile (pode se repetir)
+        talhao_ha (float): área do talhão (hectares)
+        classes_plantas (list): classes somadas em TOTAL_PLANTAS (padrão: todas)
+
+    Retorna:
+        pandas.DataFrame: colunas classe, area_m2, area_ha, pct_talhao
+    """
+    if len(arquivos) != len(rotulos):
+        raise ValueError(f"{len(arquivos)} arquivos e {len(rotulos)} rótulos: informe um rótulo por arquivo.")
+
+    # lê apenas as geometrias
+    camadas = []
+    for f in arquivos:
+        info = pyogrio.read_info(f)
+        gdf = pyogrio.read_dataframe(f, columns=[])
+        camadas.append((validar(np.asarray(gdf.geometry.array, dtype=object)), info['crs']))
+
+    # se CRS estiver em graus, reprojeta para LAEA local (em metros)
+    geoms_ref, crs_ref = camadas[0]
+    if crs_ref and CRS.from_user_input(crs_ref).is_geographic:
+        crs_metrico = crs_local_laea(geoms_ref, crs_ref)
+    else:
+        crs_metrico = crs_ref
+
+    # garante mesmo CRS e junta os arquivos de cada classe
+    por_classe = {}
+    for rotulo, (geoms, crs) in zip(rotulos, camadas):
+        if crs and crs_metrico:
+            geoms = validar(reprojetar(geoms, crs, crs_metrico))
+        por_classe.setdefault(rotulo, []).append(geoms)
+    area_m2 = [area_classe(np.concatenate(partes)) for partes in por_classe.values()]
+
+    resumo = pd.DataFrame({'classe': list(por_classe), 'area_m2': area_m2})
+    plantas = classes_plantas if classes_plantas is not None else list(por_classe)
+    totais = pd.DataFrame({
+        'classe': ["TOTAL_CLASSIFICADO", "TOTAL_PLANTAS"],
+        'area_m2': [resumo['area_m2'].sum(), resumo.loc[resumo['classe'].isin(plantas), 'area_m2'].sum()],
+    })
+    tabela = pd.concat([resumo, totais], ignore_index=True)
+    tabela['area_ha'] = tabela['area_m2'] / 10000
+    tabela['pct_talhao'] = (tabela['area_ha'] / talhao_ha) * 100
+    return tabela
@@ -0,0 +1,273 @@
+# ================================================================
+# Script: catalog.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Catálogo de metadados (CRS, extensão, número de feições ou
+#            pixels, tipo de dado, tamanho de bloco, data de modificação)
+#            dos rasters e camadas vetoriais de uma árvore de pastas,
+#            guardado em um banco SQLite local. A varredura lê apenas os
+#            cabeçalhos, em paralelo, e na atualização relê somente os
+#            arquivos novos ou alterados (impressão digital de
+#            result_cache.py); arquivos apagados saem do catálogo.
+# Linguagem: Python
+# Dependências: rasterio, pyogrio, pyproj, pandas, sqlite3
+# Data: 2026-10-18
+# ================================================================
+
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from geoproc.result_cache import file_fingerprint
+
+# --------------------
+# PARÂMETROS
+# --------------------
+EXTENSOES_RASTER = ('.tif', '.tiff', '.vrt', '.img', '.jp2')
+EXTENSOES_VETOR = ('.shp', '.gpkg', '.fgb', '.geojson', '.kml')
+NOME_PADRAO = '.geoproc_catalogo.sqlite'
+
+# coluna → tipo SQLite (a ordem define a tabela)
+COLUNAS = {
+    'path': 'TEXT NOT NULL',
+    'camada': 'TEXT NOT NULL',       # '' para rasters
+    'tipo': 'TEXT',                  # 'raster' ou 'vetor'
+    'formato': 'TEXT',               # driver GDAL/OGR
+    'crs': 'TEXT',                   # código (EPSG:xxxx) ou WKT
+    'epsg': 'INTEGER',
+    'xmin': 'REAL', 'ymin': 'REAL', 'xmax': 'REAL', 'ymax': 'REAL',
+    'n_feicoes': 'INTEGER',
+    'geometria': 'TEXT',
+    'campos': 'TEXT',                # JSON {campo: tipo}
+    'largura': 'INTEGER', 'altura': 'INTEGER', 'n_bandas': 'INTEGER',
+    'dtype': 'TEXT',
+    'res_x': 'REAL', 'res_y': 'REAL',
+    'bloco_x': 'INTEGER', 'bloco_y': 'INTEGER',
+    'nodata': 'REAL',
+    'n_overviews': 'INTEGER',
+    'tamanho': 'INTEGER',            # bytes (com os auxiliares do shapefile)
+    'mtime': 'TEXT',
+    'impressao': 'TEXT',
+    'erro': 'TEXT',
+    'atualizado': 'TEXT',
+}
+
+
+# --------------------
+# LEITURA DOS CABEÇALHOS
+# --------------------
+def _epsg(crs):
+    """Código EPSG de um CRS (texto), sem abrir nenhum arquivo; None se não identificado."""
+    if not crs:
+        return None
+    if crs.upper().startswith('EPSG:') and crs[5:].isdigit():
+        return int(crs[5:])
+    from pyproj import CRS
+
+    try:
+        return CRS.from_user_input(crs).to_epsg(min_confidence=70)
+    except Exception:
+        return None
+
+
+def _ler_raster(path):
+    import rasterio
+
+    with rasterio.open(path) as src:
+        crs = None
+        if src.crs:
+            epsg = src.crs.to_epsg()
+            crs = f"EPSG:{epsg}" if epsg else src.crs.to_wkt()
+        bloco_y, bloco_x = src.block_shapes[0]
+        return [{
+            'camada': '', 'formato': src.driver, 'crs': crs,
+            'epsg': _epsg(crs), 'xmin': src.bounds.left, 'ymin': src.bounds.bottom,
+            'xmax': src.bounds.right, 'ymax': src.bounds.top,
+            'largura': src.width, 'altura': src.height, 'n_bandas': src.count,
+            'dtype': src.dtypes[0], 'res_x': src.res[0], 'res_y': src.res[1],
+            'bloco_x': bloco_x, 'bloco_y': bloco_y, 'nodata': src.nodata,
+            'n_overviews': len(src.overviews(1)),
+        }]
+
+
+def _ler_vetor(path):
+    import pyogrio
+
+    linhas = []
+    for camada, _ in pyogrio.list_layers(path):
+        info = pyogrio.read_info(path, layer=camada, force_feature_count=True, force_total_bounds=True)
+        limites = info['total_bounds'] if info['total_bounds'] is not None else [None] * 4
+        linhas.append({
+            'camada': camada, 'formato': info['driver'], 'crs': info['crs'],
+            'epsg': _epsg(info['crs']),
+            'xmin': limites[0], 'ymin': limites[1], 'xmax': limites[2], 'ymax': limites[3],
+            'n_feicoes': info['features'], 'geometria': info['geometry_type'],
+            'campos': json.dumps(dict(zip(info['fields'].tolist(), info['dtypes'].tolist()))),
+        })
+    return linhas
+
+
+def ler_metadados(path: str, impressao: str = None) -> list:
+    """
+    Lê os metadados de um arquivo apenas pelo cabeçalho (sem ler pixels
+    ou geometrias). Erros de leitura ficam registrados na coluna 'erro'.
+
+    Retorna:
+        list: uma linha (dict) por camada
+    """
+    st = os.stat(path)
+    raster = path.lower().endswith(EXTENSOES_RASTER)
+    comum = {
+        'path': path, 'tipo': 'raster' if raster else 'vetor', 'tamanho': st.st_size,
+        'mtime': datetime.fromtimestamp(st.st_mtime).isoformat(timespec='seconds'),
+        'impressao': impressao or file_fingerprint(path),
+        'atualizado': datetime.now().isoformat(timespec='seconds'),
+    }
+    if path.lower().endswith('.shp'):
+        base = os.path.splitext(path)[0]
+        comum['tamanho'] = sum(os.path.getsize(base + e) for e in ('.shp', '.shx', '.dbf', '.prj', '.cpg')
+                               if os.path.exists(base + e))
+    try:
+        linhas = _ler_raster(path) if raster else _ler_vetor(path)
+    except Exception as e:
+        linhas = [{'camada': '', 'erro': str(e)}]
+    return [{**comum, **linha} for linha in linhas]
+
+
+def listar_arquivos(raiz: str) -> list:
+    """Rasters e camadas vetoriais da árvore (ignora pastas e arquivos ocultos)."""
+    arquivos = []
+    for pasta, subpastas, nomes in os.walk(raiz):
+        subpastas[:] = sorted(s for s in subpastas if not s.startswith('.'))
+        for nome in sorted(nomes):
+            if not nome.startswith('.') and nome.lower().endswith(EXTENSOES_RASTER + EXTENSOES_VETOR):
+                arquivos.append(os.path.join(pasta, nome))
+    return arquivos
+
+
+# --------------------
+# CATÁLOGO (SQLITE)
+# --------------------
+class CrsCatalog:
+    """
+    Catálogo de metadados em SQLite, consultável sem abrir os arquivos.
+
+    Uso:
+        with CrsCatalog.for_folder("D:/dados") as catalogo:
+            catalogo.refresh("D:/dados")
+            rasters = catalogo.query(tipo='raster', epsg=32721)
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conexao = sqlite3.connect(db_path)
+        definicao = ", ".join(f"{nome} {tipo}" for nome, tipo in COLUNAS.items())
+        self.conexao.execute(f"CREATE TABLE IF NOT EXISTS arquivos ({definicao}, PRIMARY KEY (path, camada))")
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_epsg ON arquivos (epsg)")
+        self.conexao.commit()
+
+    @classmethod
+    def for_folder(cls, raiz, db_path=None):
+        """Abre (ou cria) o catálogo padrão da pasta (``.geoproc_catalogo.sqlite``)."""
+        return cls(db_path or os.path.join(raiz, NOME_PADRAO))
+
+    def refresh(self, raiz, n_workers=None) -> dict:
+        """
+        Atualiza o catálogo com os arquivos da árvore ``raiz``: lê em paralelo
+        apenas os novos ou alterados e remove os que não existem mais.
+
+        Retorna:
+            dict: contagens 'novos', 'alterados', 'removidos', 'inalterados' e 'erros'
+        """
+        raiz = os.path.abspath(raiz)
+        prefixo = os.path.join(raiz, '')
+        conhecidos = dict(self.conexao.execute(
+            "SELECT path, impressao FROM arquivos WHERE path = ? OR substr(path, 1, ?) = ?",
+            (raiz, len(prefixo), prefixo),
+        ).fetchall())
+
+        arquivos = listar_arquivos(raiz)
+        impressoes = {path: file_fingerprint(path) for path in arquivos}
+        ler = [p for p in arquivos if conhecidos.get(p) != impressoes[p]]
+        removidos = set(conhecidos) - set(arquivos)
+
+        with ThreadPoolExecutor(max_workers=n_workers or min(32, (os.cpu_count() or 1) * 4)) as executor:
+            lidos = list(executor.map(lambda p: ler_metadados(p, impressoes[p]), ler))
+
+        colunas = list(COLUNAS)
+        with self.conexao:
+            self.conexao.executemany("DELETE FROM arquivos WHERE path = ?",
+                                     [(p,) for p in list(removidos) + ler])
+            self.conexao.executemany(
+                f"INSERT INTO arquivos ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+                [tuple(linha.get(c) for c in colunas) for linhas in lidos for linha in linhas],
+            )
+        return {
+            'novos': sum(p not in conhecidos for p in ler),
+            'alterados': sum(p in conhecidos for p in ler),
+            'removidos': len(removidos),
+            'inalterados': len(arquivos) - len(ler),
+            'erros': sum(bool(linha.get('erro')) for linhas in lidos for linha in linhas),
+        }
+
+    def query(self, where: str = None, params=(), **iguais):
+        """
+        Consulta o catálogo.
+
+        Parâmetros:
+            where (str): condição SQL opcional (ex.: "res_x < ?")
+            params (tuple): valores da condição
+            **iguais: filtros de igualdade por coluna (ex.: tipo='raster', epsg=32721)
+
+        Retorna:
+            pandas.DataFrame: linhas selecionadas, ordenadas por path e camada
+        """
+        import pandas as pd
+
+        invalidas = set(iguais) - set(COLUNAS)
+        if invalidas:
+            raise ValueError(f"Colunas inexistentes no catálogo: {sorted(invalidas)}")
+        condicoes = [f"{coluna} IS ?" for coluna in iguais]
+        if where:
+            condicoes.append(f"({where})")
+        sql = "SELECT * FROM arquivos"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        return pd.read_sql_query(sql + " ORDER BY path, camada", self.conexao,
+                                 params=[*iguais.values(), *params])
+
+    def get(self, path, camada=None):
+        """Metadados de um arquivo (primeira camada, se não informada) ou None."""
+        sql, params = "SELECT * FROM arquivos WHERE path = ?", [os.path.abspath(path)]
+        if camada is not None:
+            sql, params = sql + " AND camada = ?", params + [camada]
+        cursor = self.conexao.execute(sql + " ORDER BY camada LIMIT 1", params)
+        linha = cursor.fetchone()
+        return None if linha is None else dict(zip([c[0] for c in cursor.description], linha))
+
+    def close(self):
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def build_catalog(raiz: str, db_path: str = None, n_workers: int = None) -> CrsCatalog:
+    """
+    Cria ou atualiza o catálogo de uma árvore de pastas.
+
+    Parâmetros:
+        raiz (str): pasta varrida (com subpastas)
+        db_path (str): banco SQLite (padrão: ``<raiz>/.geoproc_catalogo.sqlite``)
+        n_workers (int): arquivos lidos simultaneamente
+
+    Retorna:
+        CrsCatalog: catálogo aberto e atualizado
+    """
+    catalogo = CrsCatalog.for_folder(raiz, db_path)
+    contagem = catalogo.refresh(raiz, n_workers)
+    print("Catálogo atualizado: " + ", ".join(f"{n} {nome}" for nome, n in contagem.items()))
+    return catalogo
@@ -0,0 +1,399 @@
+# ================================================================
+# Script: cli.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Interface de linha de comando única (geoproc) com um
+#            subcomando por rotina. Apenas argparse é importado na
+#            partida; cada subcomando importa suas dependências pesadas
+#            somente quando é executado, para que `geoproc --help` e os
+#            comandos leves iniciem rapidamente.
+# Linguagem: Python
+# Dependências: (importadas por subcomando)
+# Data: 2026-10-18
+# ================================================================
+
+import argparse
+import os
+import sys
+from geoproc import __version__
+
+
+# --------------------
+# SUBCOMANDOS
+# --------------------
+def _zonal(args):
+    from geoproc.zonal import zonal_stats_folders
+
+    zonal_stats_folders(
+        args.shp_folder, args.tif_folder, output_path=args.saida, stats=args.stats,
+        n_workers=args.workers, formato_saida=args.formato, usar_cache=not args.sem_cache,
+        cache_dir=args.cache_dir, cache_modo=args.cache_modo, exportar_excel=args.excel,
+        min_pixels_poligono=args.min_pixels, gerar_overviews=args.overviews,
+    )
+
+
+def _dms(args):
+    from geoproc.dms import convert_dms_csv
+
+    saida = convert_dms_csv(args.csv, output_dir=args.saida, chunksize=args.chunksize or None)
+    print(f"→ Arquivo KML salvo em: {saida['kml']}")
+    print(f"→ Arquivo UTM salvo em: {saida['utm']}")
+    if saida['invalidas']:
+        print(f"→ Linhas inválidas ({saida['invalidas']}) listadas em: {saida['erros']}")
+
+
+def _merge(args):
+    import glob
+    from geoproc.vector import EXTENSOES, merge_layers
+
+    shapefiles = sorted(glob.glob(os.path.join(args.pasta, "*.shp")))
+    if not shapefiles:
+        raise FileNotFoundError("Nenhum arquivo .shp encontrado na pasta informada.")
+    # padrão em subpasta, como merge_shapefiles.py: a saída não entra na próxima execução
+    saida = args.saida or os.path.join(args.pasta, "shapefile_unificado",
+                                       f"shapefile_unificado{EXTENSOES[args.driver]}")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    gravadas = merge_layers(shapefiles, saida, driver=args.driver,
+                            lote_feicoes=args.lote, n_workers=args.workers)
+    print(f"✅ Arquivo unificado salvo em: {saida} ({gravadas} feições)")
+
+
+def _filter(args):
+    from geoproc.vector import filter_export
+
+    saida = args.saida or os.path.join(os.path.dirname(args.shapefile), "filtrados")
+    filter_export(args.shapefile, args.campo, args.valores, saida,
+                  modo_individual=args.modo, n_workers=args.workers)
+    print(f"🚀 Exportação concluída. Arquivos salvos em: {saida}")
+
+
+def _reproject(args):
+    from geoproc.vector import reproject_folder, reproject_layer
+
+    if os.path.isdir(args.camada):
+        saida = reproject_folder(args.camada, args.crs, args.saida, n_workers=args.workers,
+                                 lote_feicoes=args.lote)
+        print(f"Reprojeção concluída: {len(saida['camadas'])} camada(s), {len(saida['falhas'])} falha(s)")
+    else:
+        saida, crs = reproject_layer(args.camada, args.crs, args.saida, lote_feicoes=args.lote,
+                                     n_workers=args.workers, layer=args.layer)
+        print(f"Reprojeção concluída: {saida} → {crs}")
+
+
+def _kml_shp(args):
+    from geoproc.kml import convert_folder
+
+    saida = convert_folder(args.pasta, n_workers=args.workers)
+    for nome, erro in saida['falhas']:
+        print(f"   - {nome}: {erro}")
+
+
+def _kml_points(args):
+    from geoproc.kml import points_to_kml
+
+    resultado = points_to_kml(args.csv, args.modo, output_dir=args.saida)
+    print(f"📦 {resultado['sucesso']} pontos gravados em: {resultado['saida']}")
+
+
+def _clip(args):
+    import glob
+    import geopandas as gpd
+    from geoproc.raster import clip_raster
+
+    os.makedirs(args.saida, exist_ok=True)
+    shape = gpd.read_file(args.shapefile)
+    for arquivo in sorted(glob.glob(os.path.join(args.pasta, "*.tif"))):
+        nome = os.path.splitext(os.path.basename(arquivo))[0]
+        destino = os.path.join(args.saida, f"{nome}_recorte.tif")
+        if clip_raster(arquivo, shape, destino, args.reprojetar_para_shape,
+                       'COG' if args.cog else 'GTiff', args.workers):
+            print(f"✅ Raster recortado salvo em: {destino}")
+
+
+def _reflectance(args):
+    import glob
+    from geoproc.raster import dn_to_reflectance
+
+    # saídas (_ref.tif) de execuções anteriores não são convertidas de novo
+    arquivos = sorted(f for f in glob.glob(os.path.join(args.pasta, "*.tif")) if not f.endswith("_ref.tif"))
+    saida = args.saida or os.path.join(args.pasta, "reflectancia")
+    estatisticas, histogramas = dn_to_reflectance(
+        arquivos, saida, 'uint16' if args.uint16 else 'float32', args.workers
+    )
+    estatisticas.to_csv(os.path.join(saida, "estatisticas_reflectancia.csv"), index=False)
+    histogramas.to_csv(os.path.join(saida, "histogramas_reflectancia.csv"), index=False)
+
+
+def _cog(args):
+    import glob
+    from geoproc.raster import build_overviews, convert_to_cog
+
+    arquivos = [args.entrada] if os.path.isfile(args.entrada) else \
+        sorted(glob.glob(os.path.join(args.entrada, "*.tif")))
+    for arquivo in arquivos:
+        if args.somente_overviews:
+            fatores = build_overviews(arquivo, reamostragem=args.reamostragem)
+            print(f"✅ {os.path.basename(arquivo)}: overviews {fatores}")
+        else:
+            pasta = args.saida or os.path.join(os.path.dirname(os.path.abspath(arquivo)), "cog")
+            destino = convert_to_cog(arquivo, os.path.join(pasta, os.path.basename(arquivo)),
+                                     reamostragem=args.reamostragem)
+            print(f"✅ {os.path.basename(arquivo)} → {destino}")
+
+
+def _areas(args):
+    from geoproc.areas import areas_por_classe
+
+    if len(args.arquivos) != len(args.rotulos):
+        raise SystemExit("Informe um rótulo para cada shapefile.")
+    tabela = areas_por_classe(args.arquivos, args.rotulos, args.talhao_ha)
+    print(tabela.to_string(index=False))
+    if args.saida:
+        tabela.to_csv(args.saida, index=False)
+
+
+def _composites(args):
+    import pandas as pd
+    from geoproc.composites import amostras_compostas, composite_replicates
+
+    df = pd.read_csv(args.csv, sep=';', decimal='.')
+    df.columns = df.columns.str.strip()
+    base = os.path.dirname(args.csv)
+    if args.replicas:
+        saida = args.saida or os.path.join(base, 'amostras_compostas_replicas')
+        sementes = list(range(args.seed, args.seed + args.replicas))
+        composite_replicates(df, saida, sementes, args.n_amostras, args.workers)
+        print(f"Arquivo salvo em: {saida}")
+    else:
+        saida = args.saida or os.path.join(base, 'amostras_compostas_wide.csv')
+        for n in args.n_amostras:
+            # com vários valores, um arquivo por número de amostras (<saida>_n<N>.csv)
+            destino = saida if len(args.n_amostras) == 1 else f"{os.path.splitext(saida)[0]}_n{n}.csv"
+            amostras_compostas(df, n, args.seed).to_csv(destino, index=False)
+            print(f"Arquivo salvo em: {destino}")
+
+
+def _pipeline(args):
+    from geoproc.pipeline import run_pipeline
+
+    run_pipeline(args.definicao, n_workers=args.workers)
+
+
+def _crs(args):
+    for path in args.arquivos:
+        if path.lower().endswith(('.tif', '.tiff')):
+            import rasterio
+
+            with rasterio.open(path) as src:
+                crs = src.crs.to_string() if src.crs else None
+        else:
+            import pyogrio
+
+            crs = pyogrio.read_info(path)['crs']
+        print(f"{path}: {crs}")
+
+
+def _catalog(args):
+    from geoproc.catalog import build_catalog
+
+    with build_catalog(args.pasta, db_path=args.banco, n_workers=args.workers) as catalogo:
+        resumo = catalogo.query().fillna({'crs': '(sem CRS)'}).groupby(['crs', 'tipo']).size()
+        for (crs, tipo), n in resumo.items():
+            print(f"{crs} [{tipo}]: {n}")
+
+
+def _stack(args):
+    from geoproc.stack import build_stack
+
+    build_stack(args.entrada, args.destino, reconstruir=args.reconstruir)
+
+
+def _stack_zonal(args):
+    import geopandas as gpd
+    from geoproc.stack import RasterStack
+
+    pilha = RasterStack(args.pilha)
+    desatualizados = pilha.desatualizados()
+    if desatualizados:
+        print(f"⚠️ Rasters alterados desde a montagem da pilha: {desatualizados}")
+    tabela = pilha.zonal_stats(gpd.read_file(args.camada), stats=args.stats, all_touched=args.all_touched)
+    tabela.to_csv(args.saida, index=False)
+    print(f"✅ {len(tabela)} linhas salvas em: {args.saida}")
+
+
+def _stack_sample(args):
+    from geoproc.stack import RasterStack
+
+    tabela = RasterStack(args.pilha).sample_csv(args.csv, x=args.x, y=args.y, crs=args.crs)
+    saida = args.saida or os.path.splitext(args.csv)[0] + "_amostras.csv"
+    tabela.to_csv(saida, index=False)
+    print(f"✅ {len(tabela)} pontos amostrados salvos em: {saida}")
+
+
+# --------------------
+# ARGUMENTOS
+# --------------------
+def criar_parser() -> argparse.ArgumentParser:
+    """Monta o parser com todos os subcomandos (sem importar dependências pesadas)."""
+    parser = argparse.ArgumentParser(prog="geoproc", description="Rotinas de geoprocessamento.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="grava tempo, CPU, E/S e memória de cada etapa (.jsonl ou trace do Chrome .json)")
+    sub = parser.add_subparsers(dest="comando", metavar="<comando>", required=True)
+
+    p = sub.add_parser("zonal", help="estatísticas zonais shapefiles × rasters")
+    p.add_argument("shp_folder")
+    p.add_argument("tif_folder")
+    p.add_argument("-o", "--saida", help="arquivo de resultados (.parquet/.feather/.csv)")
+    p.add_argument("--stats", nargs="+", default=['mean', 'median', 'min', 'max'])
+    p.add_argument("--formato", default="parquet", choices=["parquet", "feather", "csv"])
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--sem-cache", action="store_true")
+    p.add_argument("--cache-dir")
+    p.add_argument("--cache-modo", default="mtime", choices=["mtime", "hash"])
+    p.add_argument("--excel", action="store_true", help="exporta também para .xlsx")
+    p.add_argument("--min-pixels", type=float,
+                   help="lê o overview mais grosseiro em que o menor polígono cobre N pixels (aproximado)")
+    p.add_argument("--overviews", action="store_true", help="gera overviews nos rasters que não os têm")
+    p.set_defaults(func=_zonal)
+
+    p = sub.add_parser("dms", help="converte coordenadas DMS de um CSV para graus decimais e UTM")
+    p.add_argument("csv")
+    p.add_argument("-o", "--saida", help="pasta de saída (padrão: a do CSV)")
+    p.add_argument("--chunksize", type=int, default=200_000, help="linhas por bloco (0 = arquivo inteiro)")
+    p.set_defaults(func=_dms)
+
+    p = sub.add_parser("merge", help="une os shapefiles de uma pasta")
+    p.add_argument("pasta")
+    p.add_argument("-o", "--saida", help="arquivo de saída (padrão: <pasta>/shapefile_unificado/)")
+    p.add_argument("--driver", default="GPKG", choices=["GPKG", "FlatGeobuf", "ESRI Shapefile"])
+    p.add_argument("--lote", type=int, default=100_000, help="feições por lote")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_merge)
+
+    p = sub.add_parser("filter", help="filtra feições por valores de um campo e exporta")
+    p.add_argument("shapefile")
+    p.add_argument("--campo", required=True)
+    p.add_argument("--valores", nargs="+", required=True)
+    p.add_argument("-o", "--saida", help="pasta de saída (padrão: filtrados/ ao lado do shapefile)")
+    p.add_argument("--modo", default="shapefile", choices=["shapefile", "gpkg"])
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_filter)
+
+    p = sub.add_parser("reproject", help="reprojeta uma camada (ou todas as camadas de uma pasta)")
+    p.add_argument("camada", help="arquivo ou pasta (.shp/.gpkg/.fgb)")
+    p.add_argument("--crs", default="utm", help="CRS de destino; 'utm' = zona pela extensão da camada")
+    p.add_argument("-o", "--saida", help="arquivo/pasta de saída (padrão: substitui a entrada)")
+    p.add_argument("--layer", help="só esta camada do arquivo (padrão: todas)")
+    p.add_argument("--lote", type=int, default=100_000, help="feições por lote")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_reproject)
+
+    p = sub.add_parser("kml-shp", help="converte KML → SHP e SHP → KML de uma pasta")
+    p.add_argument("pasta")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_kml_shp)
+
+    p = sub.add_parser("kml-points", help="gera KML/KMZ de pontos a partir de um CSV")
+    p.add_argument("csv")
+    p.add_argument("--modo", default="individual", choices=["individual", "kml", "kmz"])
+    p.add_argument("-o", "--saida", help="pasta de saída (padrão: a do CSV)")
+    p.set_defaults(func=_kml_points)
+
+    p = sub.add_parser("clip", help="recorta os rasters de uma pasta por um shapefile")
+    p.add_argument("shapefile")
+    p.add_argument("pasta")
+    p.add_argument("-o", "--saida", default="results/recortes")
+    p.add_argument("--cog", action="store_true", help="grava Cloud-Optimized GeoTIFF")
+    p.add_argument("--reprojetar-para-shape", action="store_true")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_clip)
+
+    p = sub.add_parser("reflectance", help="converte DN em reflectância (DN / 65535)")
+    p.add_argument("pasta")
+    p.add_argument("-o", "--saida", help="pasta de saída (padrão: <pasta>/reflectancia)")
+    p.add_argument("--uint16", action="store_true", help="grava uint16 escalonado (× 10000)")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_reflectance)
+
+    p = sub.add_parser("cog", help="converte rasters em COG (ou só gera overviews internos)")
+    p.add_argument("entrada", help="arquivo .tif ou pasta")
+    p.add_argument("-o", "--saida", help="pasta dos COGs (padrão: <pasta>/cog)")
+    p.add_argument("--somente-overviews", action="store_true",
+                   help="gera overviews internos no próprio arquivo, sem converter")
+    p.add_argument("--reamostragem", default="average", choices=["average", "nearest", "bilinear", "mode"])
+    p.set_defaults(func=_cog)
+
+    p = sub.add_parser("areas", help="área e porcentagem do talhão por classe")
+    p.add_argument("--arquivos", nargs="+", required=True, help="shapefiles; os de mesmo rótulo formam uma classe")
+    p.add_argument("--rotulos", nargs="+", required=True, help="classe de cada shapefile")
+    p.add_argument("--talhao-ha", type=float, required=True)
+    p.add_argument("-o", "--saida", help="CSV de saída")
+    p.set_defaults(func=_areas)
+
+    p = sub.add_parser("composites", help="amostras compostas (e réplicas) a partir de um CSV")
+    p.add_argument("csv")
+    p.add_argument("--n-amostras", type=int, nargs="+", default=[15],
+                   help="amostras compostas por classe; vários valores geram um arquivo (ou réplicas) para cada")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--replicas", type=int, default=0, help="número de réplicas (0 = execução única)")
+    p.add_argument("-o", "--saida")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_composites)
+
+    p = sub.add_parser("pipeline", help="executa um fluxo de etapas (YAML/JSON) em memória")
+    p.add_argument("definicao", help="arquivo .yaml/.yml ou .json com as etapas")
+    p.add_argument("--workers", type=int, help="etapas executadas ao mesmo tempo")
+    p.set_defaults(func=_pipeline)
+
+    p = sub.add_parser("crs", help="mostra o CRS de arquivos vetoriais e raster")
+    p.add_argument("arquivos", nargs="+")
+    p.set_defaults(func=_crs)
+
+    p = sub.add_parser("catalog", help="cria/atualiza o catálogo de metadados (CRS, extensão…) de uma pasta")
+    p.add_argument("pasta")
+    p.add_argument("--banco", help="arquivo SQLite (padrão: <pasta>/.geoproc_catalogo.sqlite)")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=_catalog)
+
+    p = sub.add_parser("stack", help="monta a pilha multibanda (memmap) de uma pasta de rasters alinhados")
+    p.add_argument("entrada", help="pasta com os .tif (mesma grade)")
+    p.add_argument("destino", help="pasta da pilha")
+    p.add_argument("--reconstruir", action="store_true", help="monta de novo mesmo se estiver atualizada")
+    p.set_defaults(func=_stack)
+
+    p = sub.add_parser("stack-zonal", help="estatísticas zonais de uma camada em todas as bandas da pilha")
+    p.add_argument("pilha")
+    p.add_argument("camada", help="shapefile/GeoPackage de polígonos")
+    p.add_argument("-o", "--saida", required=True, help="CSV de saída")
+    p.add_argument("--stats", nargs="+", default=['mean', 'median', 'min', 'max'])
+    p.add_argument("--all-touched", action="store_true")
+    p.set_defaults(func=_stack_zonal)
+
+    p = sub.add_parser("stack-sample", help="valores de todas as bandas da pilha nos pontos de um CSV")
+    p.add_argument("pilha")
+    p.add_argument("csv", help="CSV de pontos (padrão: latitude/longitude em graus decimais)")
+    p.add_argument("-o", "--saida", help="CSV de saída (padrão: <csv>_amostras.csv)")
+    p.add_argument("--x", default="longitude")
+    p.add_argument("--y", default="latitude")
+    p.add_argument("--crs", default="EPSG:4326", help="CRS das coordenadas do CSV")
+    p.set_defaults(func=_stack_sample)
+
+    return parser
+
+
+def main(argv=None):
+    """Ponto de entrada do comando ``geoproc``."""
+    args = criar_parser().parse_args(argv)
+    if args.trace:
+        from geoproc.instrument import tracing
+
+        with tracing(args.trace):
+            args.func(args)
+        print(f"Trace gravado em: {args.trace}")
+        return 0
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
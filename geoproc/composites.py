@@ -0,0 +1,171 @@
+# ================================================================
+# Script: composites.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Amostras compostas (média de 'median' por bloco embaralhado
+#            de cada combinação classe × preditora) em uma única passagem
+#            vetorizada, e réplicas com várias sementes em paralelo,
+#            gravadas em um dataset Parquet particionado.
+# Linguagem: Python
+# Dependências: pandas, numpy, tqdm, pyarrow (réplicas)
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from geoproc.result_sink import write_partition
+from geoproc.instrument import traced
+
+
+# --------------------
+# AMOSTRAS COMPOSTAS
+# --------------------
+def _blocos_array_split(posicao, tamanho, n_blocos):
+    """Bloco de cada posição, com a mesma divisão de np.array_split (primeiros blocos maiores)."""
+    q, resto = np.divmod(tamanho, n_blocos)
+    limite = resto * (q + 1)
+    # posições além do limite só existem quando q > 0
+    return np.where(posicao < limite, posicao // (q + 1), resto + (posicao - limite) // np.maximum(q, 1))
+
+
+@traced("amostras_compostas")
+def amostras_compostas(df, n_amostras, random_state=42):
+    """
+    Gera as amostras compostas (média de 'median' por bloco) em formato wide.
+
+    Equivale a embaralhar cada combinação classe × preditora com
+    ``sample(frac=1, random_state=...)``, dividi-la com ``np.array_split``
+    em ``n_amostras`` blocos e tirar a média de cada bloco — mas em uma
+    única passagem vetorizada, com resultado idêntico bit a bit.
+
+    Parâmetros:
+        df (pandas.DataFrame): dados com colunas 'classe', 'preditoras' e 'median'
+        n_amostras (int): número de amostras compostas por classe
+        random_state (int): semente do embaralhamento
+
+    Retorna:
+        pandas.DataFrame: colunas amostra_id, classe e uma coluna por preditora
+    """
+    cod_classe, classes = pd.factorize(df['classe'], use_na_sentinel=False)
+    cod_pred, preditoras = pd.factorize(df['preditoras'], use_na_sentinel=False)
+    n_pred = len(preditoras)
+    grupo = cod_classe.astype(np.int64) * n_pred + cod_pred
+
+    # posição de cada linha dentro do seu grupo (ordem original)
+    ordem = np.argsort(grupo, kind='stable')
+    contagem = np.bincount(grupo, minlength=len(classes) * n_pred)
+    inicio = np.concatenate([[0], np.cumsum(contagem)[:-1]])
+    tamanho = contagem[grupo]
+    indice = np.empty(len(df), dtype=np.int64)
+    indice[ordem] = np.arange(len(df)) - inicio[grupo[ordem]]
+
+    # posição após o embaralhamento: a permutação de sample() depende só do tamanho do grupo
+    posicao = np.empty(len(df), dtype=np.int64)
+    for m in np.unique(tamanho):
+        linhas = tamanho == m
+        perm = np.random.RandomState(random_state).choice(m, size=m, replace=False)
+        posicao[linhas] = np.argsort(perm)[indice[linhas]]
+
+    bloco = _blocos_array_split(posicao, tamanho, n_amostras)
+
+    # valores contíguos por bloco, na ordem embaralhada
+    chave = grupo * n_amostras + bloco
+    ordem = np.lexsort((posicao, chave))
+    valores = df['median'].to_numpy(dtype=np.float64)[ordem]
+    validos = ~np.isnan(valores)
+    valores = np.where(validos, valores, 0.0)
+
+    n_chaves = len(classes) * n_pred * n_amostras
+    comprimento = np.bincount(chave, minlength=n_chaves)
+    inicio = np.concatenate([[0], np.cumsum(comprimento)[:-1]])
+    medias = np.full(n_chaves, np.nan)
+    # blocos de mesmo comprimento somados juntos (mesma soma par a par de Series.mean)
+    for L in np.unique(comprimento[comprimento > 0]):
+        chaves = np.flatnonzero(comprimento == L)
+        idx = inicio[chaves][:, None] + np.arange(L)
+        n_validos = validos[idx].sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            medias[chaves] = np.where(n_validos > 0, valores[idx].sum(axis=1) / n_validos, np.nan)
+
+    # classe × amostra nas linhas, preditoras nas colunas
+    medias = medias.reshape(len(classes), n_pred, n_amostras).transpose(0, 2, 1).reshape(-1, n_pred)
+    df_final = pd.DataFrame(medias, columns=preditoras)
+    # mantém o tipo da coluna original (ex.: classes inteiras continuam int64)
+    df_final.insert(0, 'classe', classes.repeat(n_amostras).to_numpy())
+    df_final.insert(0, 'amostra_id', np.tile(np.arange(1, n_amostras + 1), len(classes)))
+
+    # organiza colunas
+    cols = ['amostra_id', 'classe'] + sorted(
+        [c for c in df_final.columns if c not in ['amostra_id', 'classe']]
+    )
+    return df_final[cols]
+
+
+# --------------------
+# RÉPLICAS (BOOTSTRAP)
+# --------------------
+_dados = None
+
+
+def _iniciar_worker(dados):
+    """Recebe o DataFrame uma única vez por processo (não a cada réplica)."""
+    global _dados
+    _dados = dados
+
+
+def gerar_replica(tarefa):
+    """
+    Gera uma réplica das amostras compostas.
+
+    Parâmetros:
+        tarefa (tuple): (número da réplica, semente, n_amostras)
+
+    Retorna:
+        pandas.DataFrame: amostras compostas com colunas replicate, random_state e n_amostras
+    """
+    replica, semente, n = tarefa
+    df_rep = amostras_compostas(_dados, n, semente)
+    df_rep.columns = [str(c) for c in df_rep.columns]
+    df_rep.insert(0, 'n_amostras', n)
+    df_rep.insert(0, 'random_state', semente)
+    df_rep.insert(0, 'replicate', replica)
+    return df_rep
+
+
+@traced("composite_replicates")
+def composite_replicates(df, output_path, sementes, n_amostras_lista, n_workers=None, progresso=True):
+    """
+    Gera réplicas das amostras compostas em paralelo e grava um dataset
+    Parquet particionado pela coluna 'replicate'.
+
+    O DataFrame é enviado uma única vez a cada processo; cada réplica é
+    gravada assim que fica pronta (``result_sink.write_partition``).
+
+    Parâmetros:
+        df (pandas.DataFrame): dados com colunas 'classe', 'preditoras' e 'median'
+        output_path (str): pasta do dataset (substituída se existir)
+        sementes (list): sementes do embaralhamento
+        n_amostras_lista (list): valores de n_amostras; uma réplica por (n_amostras, semente)
+        n_workers (int): processos simultâneos
+        progresso (bool): exibe a barra de progresso
+
+    Retorna:
+        int: número de réplicas gravadas
+    """
+    from tqdm import tqdm
+
+    combinacoes = [(n, semente) for n in n_amostras_lista for semente in sementes]
+    tarefas = [(k + 1, semente, n) for k, (n, semente) in enumerate(combinacoes)]
+    colunas = [c for c in ('classe', 'preditoras', 'median') if c in df.columns]
+
+    if os.path.isdir(output_path):
+        shutil.rmtree(output_path)
+
+    with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count() or 4,
+                             initializer=_iniciar_worker, initargs=(df[colunas],)) as executor:
+        for df_rep in tqdm(executor.map(gerar_replica, tarefas), total=len(tarefas),
+                           desc="Réplicas", disable=not progresso):
+            write_partition(df_rep, output_path, 'replicate')
+    return len(tarefas)
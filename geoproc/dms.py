@@ -0,0 +1,206 @@
+# ================================================================
+# Script: dms.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Conversão de coordenadas em graus, minutos e segundos (DMS)
+#            para graus decimais e UTM, em blocos vetorizados. Inclui a
+#            detecção de encoding/separador de CSV usada pelos scripts
+#            de pontos.
+# Linguagem: Python
+# Dependências: pandas, numpy, pyproj, chardet
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from pyproj import Transformer, CRS
+from geoproc.instrument import stage, traced
+
+# --------------------
+# PARÂMETROS
+# --------------------
+COLUNAS = ['ponto', 'lat', 'long', 'alt', 'sigmaLat', 'sigmaLong', 'sigmaAlt']
+DMS_REGEX = r"^(?P<sinal>-?)(?P<graus>\d+)°(?P<min>\d+)'(?P<seg>[\d\.]+)\""
+
+
+# --------------------
+# LEITURA ROBUSTA DE CSV
+# --------------------
+def detectar_csv(file_path: str):
+    """
+    Detecta encoding (chardet) e separador provável (';' ou ',') de um CSV.
+
+    Retorna:
+        tuple: (encoding, separador)
+    """
+    import chardet
+
+    with open(file_path, 'rb') as f:
+        raw_data = f.read(4096)
+    encoding_detected = chardet.detect(raw_data)['encoding'] or 'utf-8-sig'
+
+    with open(file_path, 'r', encoding=encoding_detected, errors='ignore') as f:
+        first_line = f.readline()
+    sep = ';' if first_line.count(';') > first_line.count(',') else ','
+    return encoding_detected, sep
+
+
+def colunas_csv(file_path: str, sep: str, encoding: str) -> dict:
+    """
+    Seleciona as colunas de COLUNAS pelo cabeçalho do CSV (em qualquer ordem,
+    ignorando colunas extras). Sem esses nomes, aceita apenas o leiaute
+    original de 7 colunas, atribuídas pela posição.
+
+    Retorna:
+        dict: argumentos de ``pd.read_csv`` (``usecols`` ou ``header``/``names``)
+    """
+    cabecalho = pd.read_csv(file_path, sep=sep, encoding=encoding, quotechar='"', nrows=0)
+    nomes = [str(c).strip().lstrip('\ufeff') for c in cabecalho.columns]
+    if set(COLUNAS) <= set(nomes):
+        return {'header': 0, 'names': nomes, 'usecols': COLUNAS}
+    if len(nomes) == len(COLUNAS):
+        return {'header': 0, 'names': COLUNAS}
+    raise ValueError(
+        f"Colunas do CSV incompatíveis: esperadas {COLUNAS} (por nome ou nessa ordem), "
+        f"encontradas {nomes}"
+    )
+
+
+# --------------------
+# NORMALIZAÇÃO E CONVERSÃO DMS → GRAUS DECIMAIS
+# --------------------
+def normalizar_dms(serie: pd.Series) -> pd.Series:
+    """Normaliza símbolos de coordenadas DMS (vetorizado sobre a coluna)."""
+    serie = serie.astype(str).str.replace('º', '°').str.replace("''", '"').str.strip()
+    sem_segundos = serie.str.endswith("'")
+    return serie.where(~sem_segundos, serie.str[:-1] + '"')
+
+
+def dms_to_decimal(serie: pd.Series) -> pd.Series:
+    """Converte strings DMS (graus°min'seg") em graus decimais; NaN onde o formato é inválido."""
+    partes = serie.str.extract(DMS_REGEX)
+    graus = pd.to_numeric(partes['graus'], errors='coerce')
+    minutos = pd.to_numeric(partes['min'], errors='coerce')
+    segundos = pd.to_numeric(partes['seg'], errors='coerce')
+    sinal = np.where(partes['sinal'] == '-', -1.0, 1.0)
+    return sinal * (graus + minutos / 60 + segundos / 3600)
+
+
+# --------------------
+# CONVERSÃO PARA UTM
+# --------------------
+@lru_cache(maxsize=None)
+def transformer_utm(utm_zone: int, hemisphere: str) -> Transformer:
+    """Transformer WGS84 → UTM criado uma única vez por (zona, hemisfério)."""
+    crs_utm = CRS.from_proj4(
+        f"+proj=utm +zone={utm_zone} +{hemisphere} +datum=WGS84 +units=m +no_defs"
+    )
+    return Transformer.from_crs("EPSG:4326", crs_utm, always_xy=True)
+
+
+def dms_to_utm(df: pd.DataFrame):
+    """
+    Converte um bloco de pontos (colunas 'ponto', 'lat', 'long' em DMS)
+    para graus decimais e UTM.
+
+    Parâmetros:
+        df (pandas.DataFrame): bloco do CSV (o índice define o número da linha)
+
+    Retorna:
+        tuple: (DataFrame convertido, DataFrame com as linhas inválidas)
+    """
+    df['lat'] = normalizar_dms(df['lat'])
+    df['long'] = normalizar_dms(df['long'])
+    df['latitude'] = dms_to_decimal(df['lat'])
+    df['longitude'] = dms_to_decimal(df['long'])
+
+    # Registra as linhas inválidas em vez de interromper o arquivo inteiro
+    invalidas = df['latitude'].isna() | df['longitude'].isna()
+    erros = df.loc[invalidas, ['ponto', 'lat', 'long']]
+    erros.insert(0, 'linha', erros.index + 2)  # linha no CSV (cabeçalho = 1)
+    df = df.loc[~invalidas].reset_index(drop=True)
+
+    df['utm_zone'] = ((df['longitude'] + 180) // 6).astype(int) + 1
+    df['utm_hemisphere'] = np.where(df['latitude'] >= 0, 'north', 'south')
+    df['utm_easting'] = np.nan
+    df['utm_northing'] = np.nan
+
+    # Transforma cada grupo (zona, hemisfério) em uma única chamada vetorizada
+    for (utm_zone, hemisphere), idx in df.groupby(['utm_zone', 'utm_hemisphere']).indices.items():
+        transformer = transformer_utm(int(utm_zone), hemisphere)
+        easting, northing = transformer.transform(
+            df['longitude'].to_numpy()[idx], df['latitude'].to_numpy()[idx]
+        )
+        df.loc[idx, 'utm_easting'] = easting
+        df.loc[idx, 'utm_northing'] = northing
+
+    return df, erros
+
+
+# --------------------
+# CONVERSÃO DE ARQUIVO EM BLOCOS
+# --------------------
+@traced("convert_dms_csv", arquivo="file_path")
+def convert_dms_csv(file_path: str, output_dir: str = None, chunksize: int = 200_000) -> dict:
+    """
+    Converte um CSV de pontos em DMS, em blocos, com gravação incremental de
+    coordenadas_para_kml.csv, coordenadas_utm.csv e coordenadas_erros.csv.
+
+    Parâmetros:
+        file_path (str): CSV de entrada
+        output_dir (str): pasta de saída (padrão: a do CSV)
+        chunksize (int): linhas por bloco; None = arquivo inteiro
+
+    Retorna:
+        dict: caminhos gravados ('kml', 'utm', 'erros'), 'linhas' e 'invalidas'
+    """
+    encoding_detected, sep = detectar_csv(file_path)
+    print(f"→ Encoding detectado: {encoding_detected}")
+    print(f"→ Separador detectado: '{sep}'")
+
+    output_dir = output_dir or os.path.dirname(file_path)
+    os.makedirs(output_dir, exist_ok=True)
+    csv_kml = os.path.join(output_dir, "coordenadas_para_kml.csv")
+    csv_utm = os.path.join(output_dir, "coordenadas_utm.csv")
+    csv_erros = os.path.join(output_dir, "coordenadas_erros.csv")
+    for path in (csv_kml, csv_utm, csv_erros):
+        if os.path.exists(path):
+            os.remove(path)
+
+    leitor = pd.read_csv(
+        file_path, sep=sep, encoding=encoding_detected, quotechar='"', chunksize=chunksize,
+        **colunas_csv(file_path, sep, encoding_detected),
+    )
+    if chunksize is None:
+        leitor = [leitor]
+
+    total, n_erros = 0, 0
+    inicio = time.perf_counter()
+    for i, bloco in enumerate(leitor):
+        with stage("conversao", bloco=i, linhas=len(bloco)):
+            convertido, erros = dms_to_utm(bloco)
+        primeiro = i == 0
+
+        with stage("gravacao", bloco=i, linhas=len(convertido)):
+            convertido[['ponto', 'latitude', 'longitude', 'alt']].to_csv(
+                csv_kml, mode='a', header=primeiro, index=False
+            )
+            convertido[['ponto', 'utm_zone', 'utm_hemisphere', 'utm_easting', 'utm_northing', 'alt']].to_csv(
+                csv_utm, mode='a', header=primeiro, index=False
+            )
+        if not erros.empty:
+            if n_erros < 20:
+                print("⚠️ Formato DMS inválido (linhas ignoradas):")
+                for linha, ponto, lat, lon in erros.head(20 - n_erros).itertuples(index=False, name=None):
+                    print(f"   linha {linha}: ponto={ponto} lat={lat} long={lon}")
+            erros.to_csv(csv_erros, mode='a', header=n_erros == 0, index=False)
+            n_erros += len(erros)
+
+        total += len(bloco)
+        decorrido = time.perf_counter() - inicio
+        print(f"→ {total:,} linhas processadas ({total / max(decorrido, 1e-9):,.0f} linhas/s)")
+
+    return {'kml': csv_kml, 'utm': csv_utm, 'erros': csv_erros if n_erros else None,
+            'linhas': total, 'invalidas': n_erros}
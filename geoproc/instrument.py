@@ -0,0 +1,408 @@
+# ================================================================
+# Script: instrument.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Instrumentação leve das rotinas em lote: cada etapa
+#            (leitura, reprojeção, rasterização, estatísticas,
+#            gravação…) registra tempo de parede, tempo de CPU, bytes
+#            lidos/gravados e pico de memória (RSS), por arquivo. Os
+#            registros são exportados em JSON lines (.jsonl) ou no
+#            formato de trace do Chrome (.json, aberto em
+#            chrome://tracing ou ui.perfetto.dev). Desativada, cada
+#            etapa custa apenas uma verificação de variável global.
+#            Ativação: variável de ambiente GEOPROC_TRACE=<arquivo>,
+#            geoproc --trace <arquivo> ... ou enable_tracing().
+# Linguagem: Python
+# Dependências: psutil (opcional, memória e E/S fora do Linux)
+# Data: 2026-10-18
+# ================================================================
+
+import atexit
+import contextlib
+import functools
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+# --------------------
+# PARÂMETROS
+# --------------------
+VARIAVEL_AMBIENTE = "GEOPROC_TRACE"
+FORMATOS = ('jsonl', 'chrome')
+
+_gravador = None       # None = instrumentação desativada
+_pico_guardado = None  # maior VmHWM zerado pela instrumentação desde o último reiniciar_pico()
+
+
+class _EtapaNula:
+    """Etapa sem medição: aceita atributos (dicionário descartável) e nada registra."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _EtapaNula()
+
+
+# --------------------
+# MEMÓRIA E E/S DO PROCESSO
+# --------------------
+def _status_linux(chave):
+    """Valor (MB) de uma linha de /proc/self/status (VmHWM, VmRSS); None fora do Linux."""
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith(chave + ":"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _zerar_hwm():
+    """Escreve '5' em /proc/self/clear_refs (Linux ≥ 4.0): VmHWM volta ao RSS atual."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def reiniciar_pico():
+    """
+    Inicia uma nova medição do pico de RSS do processo (Linux ≥ 4.0);
+    retorna se foi possível. A partir daqui, ``pico_rss_mb`` considera só
+    a memória usada depois desta chamada.
+
+    Efeito colateral: zera o VmHWM do processo inteiro (todas as threads e
+    qualquer outro código que o leia diretamente de /proc/self/status).
+    """
+    global _pico_guardado
+    _pico_guardado = None
+    return _zerar_hwm()
+
+
+def _zerar_pico_etapas():
+    """
+    Zera o VmHWM entre etapas (pico exato de cada uma), guardando o valor
+    anterior em ``_pico_guardado``: ``pico_rss_mb`` continua informando o
+    pico do processo desde o último ``reiniciar_pico``, como se não houvesse
+    instrumentação. Retorna se foi possível zerar.
+    """
+    global _pico_guardado
+    hwm = _status_linux("VmHWM")
+    if hwm is not None and (_pico_guardado is None or hwm > _pico_guardado):
+        _pico_guardado = hwm
+    return _zerar_hwm()
+
+
+def rss_atual_mb():
+    """Memória residente atual do processo (MB); None se indisponível."""
+    atual = _status_linux("VmRSS")
+    if atual is None:
+        try:
+            import psutil
+
+            atual = psutil.Process().memory_info().rss / 1024 ** 2
+        except ImportError:
+            pass
+    return atual
+
+
+def pico_rss_mb():
+    """
+    Pico de memória residente do processo (MB) desde o início ou o último
+    ``reiniciar_pico``, inclusive o que a instrumentação já zerou; None se indisponível.
+    """
+    pico = _status_linux("VmHWM")
+    if pico is not None:
+        return pico if _pico_guardado is None else max(pico, _pico_guardado)
+    try:
+        import resource
+
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS informa em bytes; os demais em KB
+        return pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2
+    except (ImportError, AttributeError):
+        return None
+
+
+def bytes_es():
+    """
+    Bytes lidos e gravados pelo processo até agora (chamadas read/write,
+    incluindo as atendidas pelo cache do sistema); (None, None) se indisponível.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            campos = dict(linha.split(":") for linha in f)
+        return int(campos["rchar"]), int(campos["wchar"])
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+
+        io = psutil.Process().io_counters()
+        return getattr(io, "read_chars", io.read_bytes), getattr(io, "write_chars", io.write_bytes)
+    except (ImportError, AttributeError):
+        return None, None
+
+
+# --------------------
+# GRAVADOR DOS REGISTROS
+# --------------------
+class _Gravador:
+    """Recebe os registros das etapas (de qualquer thread) e os grava no arquivo."""
+
+    def __init__(self, path, formato):
+        self.path = path
+        self.formato = formato
+        self.pid = os.getpid()
+        self.trava = threading.Lock()
+        self.abertas = []          # etapas em andamento (todas as threads), para o pico de RSS
+        self.reinicia_pico = _zerar_pico_etapas()
+        self.eventos = []          # formato 'chrome': gravados no fechamento
+        self.threads = {}
+        self.fechado = False
+        self.origem = time.perf_counter()
+        self.origem_epoca = time.time()
+        pasta = os.path.dirname(os.path.abspath(path))
+        os.makedirs(pasta, exist_ok=True)
+        # 'jsonl': uma linha por etapa, gravada ao final de cada uma
+        self.arquivo = open(path, "w", encoding="utf-8") if formato == 'jsonl' else None
+
+    def _marcar_pico(self):
+        """
+        Leva o pico de RSS desde a última marcação a todas as etapas abertas
+        (inclusive as que envolvem a atual) e o zera, se possível. O VmHWM
+        do processo é zerado a cada início/fim de etapa; o pico anterior é
+        preservado para ``pico_rss_mb`` (ver ``_zerar_pico_etapas``).
+        """
+        pico = _status_linux("VmHWM") if self.reinicia_pico else pico_rss_mb()
+        for registro in self.abertas:
+            if pico is not None and (registro['pico'] is None or pico > registro['pico']):
+                registro['pico'] = pico
+        if self.reinicia_pico:
+            _zerar_pico_etapas()
+
+    def abrir(self, registro):
+        with self.trava:
+            self._marcar_pico()
+            self.abertas.append(registro)
+
+    def fechar_etapa(self, registro):
+        with self.trava:
+            self._marcar_pico()
+            self.abertas.remove(registro)
+            if self.fechado:  # etapa concluída depois de desativar a instrumentação
+                return
+            self.threads.setdefault(registro['tid'], threading.current_thread().name)
+            if self.arquivo is not None:
+                self.arquivo.write(json.dumps(self._linha(registro), ensure_ascii=False, default=str) + "\n")
+                self.arquivo.flush()
+            else:
+                self.eventos.append(self._evento_chrome(registro))
+
+    def _linha(self, registro):
+        linha = {
+            'etapa': registro['etapa'],
+            'inicio': round(self.origem_epoca + registro['t0'] - self.origem, 6),
+            'parede_s': round(registro['parede'], 6),
+            'cpu_s': round(registro['cpu'], 6),
+            'bytes_lidos': registro['lidos'],
+            'bytes_gravados': registro['gravados'],
+            'rss_pico_mb': None if registro['pico'] is None else round(registro['pico'], 1),
+            'rss_fim_mb': None if registro['rss'] is None else round(registro['rss'], 1),
+            'pid': os.getpid(),
+            'thread': registro['tid'],
+            'pai': registro['pai'],
+        }
+        if registro['erro']:
+            linha['erro'] = registro['erro']
+        linha.update(registro['atributos'])
+        return linha
+
+    def _evento_chrome(self, registro):
+        args = {k: v for k, v in self._linha(registro).items()
+                if k not in ('etapa', 'inicio', 'parede_s', 'pid', 'thread', 'pai')}
+        nome = registro['etapa']
+        arquivo = registro['atributos'].get('arquivo')
+        if arquivo:
+            nome = f"{nome} {os.path.basename(str(arquivo))}"
+        return {
+            'name': nome, 'cat': registro['etapa'], 'ph': 'X', 'pid': os.getpid(),
+            'tid': registro['tid'], 'ts': round((registro['t0'] - self.origem) * 1e6, 1),
+            'dur': round(registro['parede'] * 1e6, 1), 'args': args,
+        }
+
+    def fechar(self):
+        with self.trava:
+            self.fechado = True
+            if self.arquivo is not None:
+                self.arquivo.close()
+                return
+            nomes = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': nome}}
+                for tid, nome in self.threads.items()
+            ]
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({'traceEvents': nomes + self.eventos, 'displayTimeUnit': 'ms'},
+                          f, ensure_ascii=False, default=str)
+
+
+# --------------------
+# ETAPAS
+# --------------------
+_pilhas = threading.local()
+
+
+def _pilha():
+    pilha = getattr(_pilhas, "etapas", None)
+    if pilha is None:
+        pilha = _pilhas.etapas = []
+    return pilha
+
+
+@contextlib.contextmanager
+def _medir(gravador, nome, atributos):
+    pilha = _pilha()
+    registro = {
+        'etapa': nome, 'atributos': atributos, 'tid': threading.get_ident(),
+        'pai': pilha[-1]['etapa'] if pilha else None, 'pico': None, 'erro': None,
+    }
+    gravador.abrir(registro)
+    pilha.append(registro)
+    lidos0, gravados0 = bytes_es()  # depois de abrir: a leitura do pico não entra na conta
+    registro['t0'] = time.perf_counter()
+    cpu0 = time.process_time()
+    try:
+        yield registro['atributos']
+    except BaseException as e:
+        registro['erro'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        registro['parede'] = time.perf_counter() - registro['t0']
+        registro['cpu'] = time.process_time() - cpu0
+        lidos1, gravados1 = bytes_es()
+        registro['lidos'] = None if lidos0 is None else lidos1 - lidos0
+        registro['gravados'] = None if gravados0 is None else gravados1 - gravados0
+        registro['rss'] = rss_atual_mb()
+        pilha.pop()
+        gravador.fechar_etapa(registro)
+
+
+def stage(nome: str, **atributos):
+    """
+    Mede uma etapa (bloco ``with``). Os atributos (ex.: arquivo=...,
+    raster=...) acompanham o registro; o dicionário devolvido pelo
+    ``with`` aceita novos atributos durante a etapa (ex.: feições lidas).
+
+    Tempo de CPU, bytes de E/S e memória são do processo: com etapas
+    simultâneas (threads), incluem o trabalho das demais. O pico de RSS
+    de cada etapa é exato no Linux (o VmHWM do processo é zerado a cada
+    início/fim de etapa; ``pico_rss_mb`` preserva o pico do processo);
+    nos outros sistemas, é o pico do processo até o fim da etapa. Trabalho
+    feito em processos filhos (n_workers > 1 nas rotinas com
+    ProcessPoolExecutor) não entra na CPU.
+
+    Uso:
+        with stage("leitura", arquivo=path) as info:
+            gdf = gpd.read_file(path)
+            info["feicoes"] = len(gdf)
+
+    Retorna:
+        context manager (nulo e sem custo se a instrumentação estiver desativada)
+    """
+    gravador = _gravador
+    if gravador is None or gravador.pid != os.getpid():  # processos filhos (fork) não registram
+        return _NULO
+    return _medir(gravador, nome, atributos)
+
+
+def traced(nome: str, arquivo: str = None):
+    """
+    Decorador que mede cada chamada da função como uma etapa.
+
+    Parâmetros:
+        nome (str): nome da etapa
+        arquivo (str): parâmetro da função registrado como atributo 'arquivo'
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao) if arquivo else None
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            if _gravador is None:
+                return funcao(*args, **kwargs)
+            atributos = {}
+            if assinatura is not None:
+                atributos['arquivo'] = assinatura.bind_partial(*args, **kwargs).arguments.get(arquivo)
+            with stage(nome, **atributos):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorador
+
+
+def tracing_enabled() -> bool:
+    """Indica se a instrumentação está ativa."""
+    return _gravador is not None
+
+
+# --------------------
+# ATIVAÇÃO
+# --------------------
+def enable_tracing(path: str, formato: str = None):
+    """
+    Ativa a instrumentação, gravando os registros em ``path``.
+
+    Parâmetros:
+        path (str): arquivo de saída
+        formato (str): 'jsonl' (uma linha por etapa, gravada ao término de cada uma)
+            ou 'chrome' (trace gravado ao desativar); padrão: 'jsonl' para .jsonl,
+            'chrome' para os demais
+    """
+    global _gravador
+    if formato is None:
+        formato = 'jsonl' if path.lower().endswith('.jsonl') else 'chrome'
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: '{formato}'. Use um de {FORMATOS}.")
+    disable_tracing()
+    _gravador = _Gravador(path, formato)
+
+
+def disable_tracing():
+    """Desativa a instrumentação e conclui a gravação do arquivo."""
+    global _gravador
+    gravador, _gravador = _gravador, None
+    if gravador is not None:
+        gravador.fechar()
+
+
+@contextlib.contextmanager
+def tracing(path: str, formato: str = None):
+    """Ativa a instrumentação apenas dentro do bloco ``with``."""
+    enable_tracing(path, formato)
+    try:
+        yield
+    finally:
+        disable_tracing()
+
+
+# instrumentação sem alterar os scripts: GEOPROC_TRACE=trace.json python estati_zonal.py
+# (apenas no processo principal; os workers herdam a variável de ambiente)
+if os.environ.get(VARIAVEL_AMBIENTE) and multiprocessing.parent_process() is None:
+    enable_tracing(os.environ[VARIAVEL_AMBIENTE])
+atexit.register(disable_tracing)
@@ -0,0 +1,234 @@
+# ================================================================
+# Script: kml.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Conversões KML ↔ SHP em memória, em lote e em paralelo,
+#            gravadas diretamente em .zip, e geração de KML/KMZ de pontos
+#            a partir de um CSV (placemarks montados por template sobre
+#            colunas vetorizadas), com registro em log.
+# Linguagem: Python
+# Dependências: pyogrio, geopandas, pandas, chardet
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import io
+import glob
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pandas as pd
+import pyogrio
+from geoproc.instrument import traced
+
+# --------------------
+# CONVERSÕES (EM MEMÓRIA)
+# --------------------
+@traced("kml_to_shp", arquivo="kml_path")
+def kml_to_shp(kml_path: str) -> dict:
+    """Converte um KML em shapefile; retorna {nome do arquivo: bytes}."""
+    base_name = os.path.splitext(os.path.basename(kml_path))[0]
+    gdf = pyogrio.read_dataframe(kml_path)
+    gdf["Name"] = base_name
+    # o driver de shapefile não grava em memória: usa uma pasta temporária
+    with tempfile.TemporaryDirectory() as tmp:
+        pyogrio.write_dataframe(gdf, os.path.join(tmp, f"{base_name}.shp"), driver="ESRI Shapefile")
+        saida = {}
+        for nome in sorted(os.listdir(tmp)):
+            with open(os.path.join(tmp, nome), "rb") as f:
+                saida[nome] = f.read()
+    return saida
+
+
+@traced("shp_to_kml", arquivo="shp_path")
+def shp_to_kml(shp_path: str) -> dict:
+    """Converte um shapefile em KML (WGS84); retorna {nome do arquivo: bytes}."""
+    base_name = os.path.splitext(os.path.basename(shp_path))[0]
+    gdf = pyogrio.read_dataframe(shp_path)
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    buffer = io.BytesIO()
+    pyogrio.write_dataframe(gdf, buffer, driver="KML", layer=base_name)
+    return {f"{base_name}.kml": buffer.getvalue()}
+
+
+def converter_lote(arquivos: list, conversor, zip_path: str, ext_saida: str, n_workers: int = None) -> list:
+    """
+    Converte os arquivos em paralelo e grava cada resultado no .zip assim
+    que fica pronto (na ordem da lista). Retorna a lista de falhas.
+    """
+    falhas = []
+    with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count() or 4) as executor, \
+            zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        futuros = [(path, executor.submit(conversor, path)) for path in arquivos]
+        for path, futuro in futuros:
+            nome = os.path.basename(path)
+            try:
+                saida = futuro.result()
+            except Exception as e:
+                falhas.append((nome, str(e)))
+                print(f"❌ {nome}: {e}")
+                continue
+            for nome_saida, conteudo in saida.items():
+                zf.writestr(nome_saida, conteudo)
+            print(f"✅ {nome} → {os.path.splitext(nome)[0]}{ext_saida}")
+    print(f"📦 {len(arquivos) - len(falhas)} arquivo(s) compactado(s) em: {zip_path}")
+    return falhas
+
+
+@traced("convert_folder")
+def convert_folder(base_folder: str, n_workers: int = None) -> dict:
+    """
+    Converte todos os KML → SHP (shapefiles_convertidos.zip) e todos os
+    SHP → KML (kml_convertidos.zip) de uma pasta.
+
+    Retorna:
+        dict: zips gravados ('shp', 'kml'; None se não havia arquivos) e 'falhas'
+    """
+    falhas = []
+    saida = {'shp': None, 'kml': None}
+
+    kml_files = sorted(glob.glob(os.path.join(base_folder, "*.kml")))
+    if kml_files:
+        print(f"\n📁 Encontrados {len(kml_files)} arquivos KML. Convertendo para SHP...\n")
+        saida['shp'] = os.path.join(base_folder, "shapefiles_convertidos.zip")
+        falhas += converter_lote(kml_files, kml_to_shp, saida['shp'], ".shp", n_workers)
+    else:
+        print("Nenhum arquivo .kml encontrado para conversão.")
+
+    shp_files = sorted(glob.glob(os.path.join(base_folder, "*.shp")))
+    if shp_files:
+        print(f"\n📁 Encontrados {len(shp_files)} arquivos SHP. Convertendo para KML...\n")
+        saida['kml'] = os.path.join(base_folder, "kml_convertidos.zip")
+        falhas += converter_lote(shp_files, shp_to_kml, saida['kml'], ".kml", n_workers)
+    else:
+        print("Nenhum arquivo .shp encontrado para conversão.")
+
+    saida['falhas'] = falhas
+    return saida
+
+
+# --------------------
+# PONTOS → KML
+# --------------------
+KML_CABECALHO = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+    '    <Document>\n'
+)
+KML_RODAPE = '    </Document>\n</kml>\n'
+
+
+def log_message(log, message):
+    """Escreve mensagem no log (handle único com buffer) com timestamp."""
+    log.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+
+
+def escapar_xml(serie: pd.Series) -> pd.Series:
+    """Escapa &, < e > de uma coluna de texto (vetorizado)."""
+    return serie.str.replace('&', '&amp;').str.replace('<', '&lt;').str.replace('>', '&gt;')
+
+
+def montar_placemarks(nome: pd.Series, lon: pd.Series, lat: pd.Series, desc: pd.Series) -> pd.Series:
+    """Monta o trecho <Placemark> de cada ponto por concatenação de colunas."""
+    return (
+        '        <Placemark>\n'
+        '            <name>' + escapar_xml(nome) + '</name>\n'
+        '            <description>' + escapar_xml(desc) + '</description>\n'
+        '            <Point>\n'
+        '                <coordinates>' + lon.astype(str) + ',' + lat.astype(str) + ',0.0</coordinates>\n'
+        '            </Point>\n'
+        '        </Placemark>\n'
+    )
+
+
+@traced("points_to_kml", arquivo="file_path")
+def points_to_kml(file_path: str, modo_saida: str = 'individual', output_dir: str = None) -> dict:
+    """
+    Gera KML dos pontos de um CSV (colunas ponto, latitude, longitude, alt).
+
+    Parâmetros:
+        file_path (str): CSV de entrada (encoding e separador detectados)
+        modo_saida (str): 'individual' (um .kml por ponto em kml_individuais.zip)
+            ou 'kml'/'kmz' (um único pontos.kml / pontos.kmz)
+        output_dir (str): pasta de saída e do log (padrão: a do CSV)
+
+    Retorna:
+        dict: 'saida', 'log', 'sucesso' e 'falhas'
+    """
+    from geoproc.dms import detectar_csv
+
+    if modo_saida not in ('individual', 'kml', 'kmz'):
+        raise ValueError(f"modo_saida inválido: '{modo_saida}'. Use 'individual', 'kml' ou 'kmz'.")
+
+    # Caminhos de saída e log
+    base_dir = output_dir or os.path.dirname(file_path)
+    os.makedirs(base_dir, exist_ok=True)
+    log_file = os.path.join(base_dir, "generate_kml_points.log")
+    with open(log_file, "a", encoding="utf-8", buffering=1 << 16) as log:
+        log_message(log, "=== Início do processamento ===")
+        log_message(log, f"Arquivo de entrada: {file_path}")
+
+        encoding_detected, sep = detectar_csv(file_path)
+        log_message(log, f"Encoding detectado: {encoding_detected}")
+        log_message(log, f"Separador detectado: '{sep}'")
+
+        # Lê o CSV
+        df = pd.read_csv(file_path, sep=sep, encoding=encoding_detected)
+        colunas_esperadas = {'ponto', 'latitude', 'longitude', 'alt'}
+        if not colunas_esperadas.issubset(set(df.columns)):
+            raise ValueError(f"O arquivo deve conter as colunas: {colunas_esperadas}")
+        log_message(log, f"Colunas detectadas: {list(df.columns)}")
+
+        # Preparação vetorizada dos pontos
+        ponto = df['ponto'].astype(str).str.strip()
+        lat = pd.to_numeric(df['latitude'], errors='coerce')
+        lon = pd.to_numeric(df['longitude'], errors='coerce')
+        desc = ('Altitude: ' + df['alt'].astype(str) + ' m').where(df['alt'].notna(), 'Sem altitude informada')
+
+        # Linhas com coordenadas inválidas são registradas e ignoradas
+        invalidas = lat.isna() | lon.isna()
+        for nome, la, lo in zip(df.loc[invalidas, 'ponto'], df.loc[invalidas, 'latitude'],
+                                df.loc[invalidas, 'longitude']):
+            msg = f"ERRO em {nome}: coordenadas inválidas (latitude={la}, longitude={lo})"
+            print(f"❌ {msg}")
+            log_message(log, msg)
+        falhas = int(invalidas.sum())
+
+        validos = ~invalidas
+        placemarks = montar_placemarks(ponto[validos], lon[validos], lat[validos], desc[validos])
+        nomes = ponto[validos]
+
+        # Gravação direta no arquivo de saída
+        if modo_saida == 'individual':
+            # Pontos com o mesmo nome: prevalece o último (como ao sobrescrever o .kml)
+            duplicados = nomes.duplicated(keep='last')
+            for nome in nomes[duplicados].unique():
+                log_message(log, f"AVISO: ponto '{nome}' repetido; mantida a última ocorrência")
+            placemarks, nomes = placemarks[~duplicados], nomes[~duplicados]
+
+            saida = os.path.join(base_dir, "kml_individuais.zip")
+            log_message(log, f"Gerando KMLs em: {saida}")
+            with zipfile.ZipFile(saida, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for nome, placemark in zip(nomes, placemarks):
+                    zf.writestr(f"{nome}.kml", KML_CABECALHO + placemark + KML_RODAPE)
+            log.writelines(
+                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] SUCESSO: {nome}.kml\n" for nome in nomes
+            )
+        else:
+            documento = KML_CABECALHO + ''.join(placemarks) + KML_RODAPE
+            saida = os.path.join(base_dir, f"pontos.{modo_saida}")
+            if modo_saida == 'kml':
+                with open(saida, "w", encoding="utf-8") as f:
+                    f.write(documento)
+            else:
+                with zipfile.ZipFile(saida, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                    zf.writestr("doc.kml", documento)
+            log_message(log, f"SUCESSO: {len(nomes)} pontos gravados em {saida}")
+
+        sucesso = len(nomes)
+        log_message(log, f"Arquivo gerado: {saida}")
+        log_message(log, f"KMLs gerados: {sucesso} | Falhas: {falhas}")
+        log_message(log, "=== Fim do processamento ===\n")
+
+    return {'saida': saida, 'log': log_file, 'sucesso': sucesso, 'falhas': falhas}
@@ -0,0 +1,347 @@
+# ================================================================
+# Script: pipeline.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Executa um fluxo declarativo (YAML, JSON ou dict Python) de
+#            etapas encadeadas — leitura, união, reprojeção, filtro e
+#            estatísticas zonais — em um único processo. Os resultados
+#            passam de uma etapa para a seguinte em memória
+#            (GeoDataFrames/DataFrames); somente as etapas com "saida"
+#            são gravadas em disco. Etapas independentes rodam ao mesmo
+#            tempo e cada resultado intermediário é liberado assim que
+#            todas as etapas que dependem dele terminam.
+# Linguagem: Python
+# Dependências: geopandas, pyogrio, pyproj, rasterio, pandas, pyyaml (YAML)
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import glob
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from geoproc.instrument import stage, traced
+
+# --------------------
+# PARÂMETROS
+# --------------------
+# parâmetros aceitos por operação (além de "nome", "op" e "saida")
+OPERACOES = {
+    'read': {'entrada', 'colunas', 'bbox', 'crs'},
+    'merge': {'entradas'},
+    'reproject': {'entrada', 'crs'},
+    'filter': {'entrada', 'campo', 'valores'},
+    'zonal': {'entrada', 'rasters', 'stats', 'campos', 'n_workers', 'min_pixels'},
+}
+OBRIGATORIOS = {
+    'read': {'entrada'},
+    'merge': {'entradas'},
+    'reproject': {'entrada', 'crs'},
+    'filter': {'entrada', 'campo', 'valores'},
+    'zonal': {'entrada', 'rasters'},
+}
+CURINGAS = ('*', '?', '[')
+
+
+# --------------------
+# LEITURA E VALIDAÇÃO DA DEFINIÇÃO
+# --------------------
+def load_pipeline(path: str) -> dict:
+    """
+    Lê a definição de um fluxo de um arquivo YAML (.yaml/.yml) ou JSON.
+    Caminhos relativos passam a ser relativos à pasta do arquivo.
+
+    Retorna:
+        dict: definição com a chave "etapas" (e "base_dir")
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("Definições em YAML exigem o pacote pyyaml.") from e
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if isinstance(spec, list):
+        spec = {'etapas': spec}
+    spec.setdefault('base_dir', os.path.dirname(os.path.abspath(path)))
+    return spec
+
+
+def _caminho(valor, base_dir):
+    return valor if os.path.isabs(valor) else os.path.join(base_dir, valor)
+
+
+def _expandir(valor, base_dir, extensao):
+    """Arquivo, pasta (todos os arquivos com a extensão) ou padrão glob → lista de arquivos."""
+    path = _caminho(valor, base_dir)
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, f"*{extensao}")))
+    if any(c in path for c in CURINGAS):
+        return sorted(glob.glob(path))
+    return [path]
+
+
+def validar_etapas(spec) -> dict:
+    """
+    Confere a definição e resolve as dependências entre etapas.
+
+    Cada valor de "entrada"/"entradas" que é o nome de outra etapa vira uma
+    dependência; os demais são tratados como arquivos (ou pastas/padrões glob).
+
+    Retorna:
+        dict: {nome: etapa}, na ordem da definição, com as chaves "deps" e "fontes"
+    """
+    if isinstance(spec, list):
+        spec = {'etapas': spec}
+    base_dir = spec.get('base_dir') or os.getcwd()
+
+    etapas = {}
+    for i, etapa in enumerate(spec.get('etapas') or []):
+        etapa = dict(etapa)
+        nome = etapa.get('nome') or f"etapa_{i + 1}"
+        op = etapa.get('op')
+        if op not in OPERACOES:
+            raise ValueError(f"Etapa '{nome}': operação inválida '{op}'. Use uma de {sorted(OPERACOES)}.")
+        if nome in etapas:
+            raise ValueError(f"Nome de etapa repetido: '{nome}'.")
+        extras = set(etapa) - OPERACOES[op] - {'nome', 'op', 'saida'}
+        if extras:
+            raise ValueError(f"Etapa '{nome}' ({op}): parâmetros desconhecidos {sorted(extras)}.")
+        faltando = OBRIGATORIOS[op] - set(etapa)
+        if faltando:
+            raise ValueError(f"Etapa '{nome}' ({op}): parâmetros obrigatórios ausentes {sorted(faltando)}.")
+        etapa['nome'] = nome
+        if etapa.get('saida'):
+            etapa['saida'] = _caminho(etapa['saida'], base_dir)
+        if op == 'zonal':
+            rasters = etapa['rasters']
+            rasters = [rasters] if isinstance(rasters, str) else rasters
+            etapa['rasters'] = [p for r in rasters for p in _expandir(r, base_dir, '.tif')]
+            if not etapa['rasters']:
+                raise ValueError(f"Etapa '{nome}': nenhum raster encontrado em {rasters}.")
+        etapas[nome] = etapa
+    if not etapas:
+        raise ValueError("A definição não contém etapas.")
+
+    # entradas: nomes de etapas (dependências) ou arquivos
+    for etapa in etapas.values():
+        entradas = etapa['entradas'] if etapa['op'] == 'merge' else [etapa['entrada']]
+        entradas = [entradas] if isinstance(entradas, str) else entradas
+        etapa['deps'], etapa['fontes'] = [], []
+        for entrada in entradas:
+            if entrada in etapas:
+                etapa['deps'].append(entrada)
+                etapa['fontes'].append(('etapa', entrada))
+                continue
+            arquivos = _expandir(entrada, base_dir, '.shp')
+            if not arquivos or not all(os.path.exists(a) for a in arquivos):
+                raise ValueError(
+                    f"Etapa '{etapa['nome']}': entrada '{entrada}' não é uma etapa nem um arquivo existente."
+                )
+            etapa['fontes'] += [('arquivo', a) for a in arquivos]
+        if etapa['op'] == 'read' and etapa['deps']:
+            raise ValueError(f"Etapa '{etapa['nome']}' (read): a entrada deve ser um arquivo.")
+        if etapa['op'] != 'merge' and len(etapa['fontes']) != 1:
+            raise ValueError(f"Etapa '{etapa['nome']}' ({etapa['op']}): informe exatamente uma entrada.")
+
+    # ciclos (ordenação topológica)
+    pendentes = {nome: set(etapa['deps']) for nome, etapa in etapas.items()}
+    while pendentes:
+        livres = [nome for nome, deps in pendentes.items() if not deps & set(pendentes)]
+        if not livres:
+            raise ValueError(f"Dependência circular entre as etapas: {sorted(pendentes)}.")
+        for nome in livres:
+            del pendentes[nome]
+    return etapas
+
+
+# --------------------
+# OPERAÇÕES
+# --------------------
+def _ler(path, **kwargs):
+    from geoproc.spatial_reader import read_layer
+
+    return read_layer(path, **kwargs)
+
+
+def _op_read(etapa, entradas):
+    (tipo, path), = etapa['fontes']
+    bbox = etapa.get('bbox')
+    return _ler(path, bbox=tuple(bbox) if bbox else None, crs=etapa.get('crs'), columns=etapa.get('colunas'))
+
+
+def _op_merge(etapa, entradas):
+    from geoproc.vector import merge_frames
+
+    camadas = []
+    for tipo, valor in etapa['fontes']:
+        if tipo == 'etapa':
+            camadas.append((valor, entradas[valor]))
+        else:
+            camadas.append((os.path.basename(valor), _ler(valor)))
+    return merge_frames(camadas)
+
+
+def _op_reproject(etapa, entradas):
+    (tipo, valor), = etapa['fontes']
+    gdf = entradas[valor] if tipo == 'etapa' else _ler(valor)
+    crs = etapa['crs']
+    if isinstance(crs, str) and crs.lower() == 'utm':
+        from geoproc.vector import utm_da_extensao
+
+        crs = utm_da_extensao(gdf.total_bounds, gdf.crs, etapa['nome'])
+    return gdf.to_crs(crs)
+
+
+def _op_filter(etapa, entradas):
+    from geoproc.vector import converter_valor, filter_features
+
+    (tipo, valor), = etapa['fontes']
+    campo, valores = etapa['campo'], list(etapa['valores'])
+    if tipo == 'arquivo':
+        # lendo de arquivo, o filtro é aplicado na leitura (cláusula WHERE)
+        return filter_features(valor, campo, valores)
+    gdf = entradas[valor]
+    if campo not in gdf.columns:
+        raise ValueError(f"O campo '{campo}' não existe na etapa '{valor}'. Colunas disponíveis: {list(gdf.columns)}")
+    # mesma conversão da leitura filtrada de arquivo ('11' → 11 em campos inteiros)
+    tipo_campo = str(gdf[campo].dtype)
+    valores = [converter_valor(v, campo, tipo_campo) for v in valores]
+    return gdf[gdf[campo].isin(valores)].reset_index(drop=True)
+
+
+def _op_zonal(etapa, entradas):
+    import pandas as pd
+    from geoproc.zonal import STATS_PADRAO
+    from geoproc.zonal_engine import zonal_stats_batch
+
+    (tipo, valor), = etapa['fontes']
+    gdf = entradas[valor] if tipo == 'etapa' else _ler(valor)
+    stats = list(etapa.get('stats') or STATS_PADRAO)
+    campos = list(etapa.get('campos') or [])
+    nome_camada = valor if tipo == 'etapa' else os.path.basename(valor)
+
+    tabelas = []
+    for _, tif_path, df in zonal_stats_batch([(nome_camada, gdf)], etapa['rasters'], stats=stats,
+                                             n_workers=etapa.get('n_workers', 1),
+                                             min_pixels=etapa.get('min_pixels')):
+        df.insert(0, 'camada', nome_camada)
+        df.insert(1, 'raster', os.path.basename(tif_path))
+        df.insert(2, 'polygon_id', range(1, len(df) + 1))
+        for i, campo in enumerate(campos):
+            df.insert(3 + i, campo, gdf[campo].to_numpy())
+        tabelas.append(df)
+    return pd.concat(tabelas, ignore_index=True)
+
+
+EXECUTORES = {
+    'read': _op_read,
+    'merge': _op_merge,
+    'reproject': _op_reproject,
+    'filter': _op_filter,
+    'zonal': _op_zonal,
+}
+
+
+# --------------------
+# GRAVAÇÃO DAS SAÍDAS PEDIDAS
+# --------------------
+def gravar_resultado(resultado, path):
+    """Grava uma camada (pyogrio, driver pela extensão) ou uma tabela (Parquet/Feather/CSV)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if hasattr(resultado, 'geometry'):
+        import pyogrio
+
+        pyogrio.write_dataframe(resultado, path)
+    else:
+        from geoproc.result_sink import ResultSink
+
+        with ResultSink(path) as sink:
+            sink.write(resultado)
+    return path
+
+
+def _executar_etapa(etapa, entradas):
+    """Roda uma etapa (em uma thread) e grava sua saída, se pedida."""
+    inicio = time.perf_counter()
+    with stage(etapa['op'], etapa=etapa['nome']) as info:
+        resultado = EXECUTORES[etapa['op']](etapa, entradas)
+        info['linhas'] = len(resultado)
+    if etapa.get('saida'):
+        with stage("gravacao", etapa=etapa['nome'], arquivo=etapa['saida']):
+            gravar_resultado(resultado, etapa['saida'])
+    destino = f" → {etapa['saida']}" if etapa.get('saida') else ""
+    print(f"✅ {etapa['nome']} ({etapa['op']}): {len(resultado)} linhas em "
+          f"{time.perf_counter() - inicio:.2f} s{destino}")
+    return resultado
+
+
+# --------------------
+# EXECUÇÃO DO FLUXO
+# --------------------
+@traced("run_pipeline")
+def run_pipeline(spec, n_workers: int = None) -> dict:
+    """
+    Executa um fluxo de etapas, mantendo os resultados intermediários em memória.
+
+    Exemplo (YAML):
+        etapas:
+          - {nome: unido, op: merge, entradas: [shps/]}
+          - {nome: utm, op: reproject, entrada: unido, crs: "EPSG:32721"}
+          - {nome: talhoes, op: filter, entrada: utm, campo: CD_TALHAO,
+             valores: [001M, 002M], saida: results/talhoes.gpkg}
+          - {nome: estat, op: zonal, entrada: talhoes, rasters: camadas_raster/,
+             campos: [CD_TALHAO], saida: results/estatisticas_zonais.parquet}
+
+    Parâmetros:
+        spec: caminho de um arquivo YAML/JSON, dict com a chave "etapas" ou lista de etapas
+        n_workers (int): etapas executadas ao mesmo tempo (padrão: "n_workers"
+            da definição ou o número de núcleos)
+
+    Retorna:
+        dict: {nome: resultado} das etapas finais (das quais nenhuma outra depende)
+    """
+    if isinstance(spec, (str, os.PathLike)):
+        spec = load_pipeline(os.fspath(spec))
+    etapas = validar_etapas(spec)
+    if n_workers is None and isinstance(spec, dict):
+        n_workers = spec.get('n_workers')
+    n_workers = n_workers or min(len(etapas), os.cpu_count() or 4)
+
+    consumidores = {nome: 0 for nome in etapas}
+    for etapa in etapas.values():
+        for dep in etapa['deps']:
+            consumidores[dep] += 1
+    restantes = dict(consumidores)
+    resultados, concluidas, em_execucao = {}, set(), {}
+
+    def iniciar_prontas():
+        for nome, etapa in etapas.items():
+            if nome in concluidas or nome in em_execucao.values():
+                continue
+            if all(dep in concluidas for dep in etapa['deps']):
+                entradas = {dep: resultados[dep] for dep in etapa['deps']}
+                em_execucao[executor.submit(_executar_etapa, etapa, entradas)] = nome
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        iniciar_prontas()
+        while em_execucao:
+            feitos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in feitos:
+                nome = em_execucao.pop(futuro)
+                try:
+                    resultados[nome] = futuro.result()
+                except Exception as e:
+                    for pendente in em_execucao:
+                        pendente.cancel()
+                    raise RuntimeError(f"Etapa '{nome}' falhou: {e}") from e
+                concluidas.add(nome)
+                # libera os intermediários que nenhuma etapa pendente usa mais
+                for dep in etapas[nome]['deps']:
+                    restantes[dep] -= 1
+                    if restantes[dep] == 0:
+                        del resultados[dep]
+            iniciar_prontas()
+
+    return {nome: resultados[nome] for nome in etapas if consumidores[nome] == 0}
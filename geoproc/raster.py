@@ -0,0 +1,407 @@
+# ================================================================
+# Script: raster.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Operações em rasters processadas por blocos/faixas:
+#            recorte (crop + mask) por polígonos lendo apenas a janela de
+#            interesse (clip_raster), conversão de DN para reflectância
+#            com estatísticas na mesma passagem (dn_to_reflectance) e
+#            preparo para leitura por resolução: overviews internos
+#            (build_overviews) e conversão para COG (convert_to_cog).
+# Linguagem: Python
+# Dependências: rasterio, shapely, numpy, pandas
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import rasterio
+import rasterio.shutil
+import shapely
+from rasterio.enums import Resampling
+from rasterio.features import geometry_mask, geometry_window
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
+from rasterio.windows import transform as window_transform
+from geoproc.instrument import traced
+
+# --------------------
+# PARÂMETROS
+# --------------------
+TAMANHO_BLOCO = 512
+MAX_PIXELS_FAIXA = 4_194_304
+OPCOES_GTIFF = dict(tiled=True, blockxsize=TAMANHO_BLOCO, blockysize=TAMANHO_BLOCO,
+                    compress='deflate', bigtiff='IF_SAFER', sparse_ok=True)
+
+ESCALA_DN = 65535
+FATOR_UINT16 = 10000
+NODATA_UINT16 = 65535
+N_CLASSES_HIST = 100        # classes do histograma no intervalo [0, 1]
+
+
+# --------------------
+# RECORTE POR POLÍGONOS
+# --------------------
+def abrir_fonte(arquivo, crs_destino, fontes):
+    """
+    Abre o raster (e o VRT reprojetado, se for o caso) uma vez por thread.
+    ``fontes`` é o registro da chamada de clip_raster: (threading.local, lista
+    de handles abertos), fechados por ela ao final.
+    """
+    local, abertos = fontes
+    src = getattr(local, "src", None)
+    if src is None:
+        src = rasterio.open(arquivo)
+        abertos.append(src)
+        if crs_destino is not None:
+            src = WarpedVRT(src, crs=crs_destino, resampling=Resampling.bilinear)
+            abertos.append(src)
+        local.src = src
+    return src
+
+
+def valor_nodata(src):
+    """Nodata da saída: o do raster ou, se ausente, NaN (float) / menor valor do tipo."""
+    if src.nodata is not None:
+        return src.nodata
+    dtype = np.dtype(src.dtypes[0])
+    if np.issubdtype(dtype, np.floating):
+        return np.nan
+    return 0 if np.issubdtype(dtype, np.unsignedinteger) else np.iinfo(dtype).min
+
+
+def recortar_bloco(arquivo, crs_destino, fontes, janela, bloco, geoms, arvore, nodata):
+    """Lê um bloco da janela recortada e aplica a máscara do polígono."""
+    ds = abrir_fonte(arquivo, crs_destino, fontes)
+    absoluta = Window(janela.col_off + bloco.col_off, janela.row_off + bloco.row_off,
+                      bloco.width, bloco.height)
+    transf = window_transform(absoluta, ds.transform)
+
+    # apenas os polígonos que alcançam o bloco são rasterizados
+    x0, y0 = transf * (0, bloco.height)
+    x1, y1 = transf * (bloco.width, 0)
+    candidatos = geoms[arvore.query(shapely.box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))]
+    if len(candidatos) == 0:
+        return None
+    dentro = geometry_mask(candidatos, out_shape=(bloco.height, bloco.width),
+                           transform=transf, invert=True)
+    if not dentro.any():
+        return None
+
+    dados = ds.read(window=absoluta)
+    dados[:, ~dentro] = nodata
+    return dados
+
+
+@traced("clip_raster", arquivo="arquivo")
+def clip_raster(arquivo, shape, nome_saida, reprojetar_para_shape=False,
+                formato_saida='GTiff', n_workers=None):
+    """
+    Recorta um raster pelos polígonos de ``shape``, bloco a bloco, e grava GeoTIFF/COG.
+
+    Parâmetros:
+        arquivo (str): raster de entrada
+        shape (geopandas.GeoDataFrame): polígonos da área de interesse
+        nome_saida (str): raster de saída
+        reprojetar_para_shape (bool): False reprojeta o polígono para o CRS do
+            raster (sem reamostragem); True entrega no CRS do shapefile,
+            reprojetando apenas a janela recortada
+        formato_saida (str): 'GTiff' (em blocos, comprimido) ou 'COG'
+        n_workers (int): blocos processados simultaneamente
+
+    Retorna:
+        str: ``nome_saida``, ou None se o raster não intersecta o shapefile
+    """
+    with rasterio.open(arquivo) as src:
+        mesmo_crs = shape.crs is None or src.crs is None or shape.crs == src.crs
+        if mesmo_crs or not reprojetar_para_shape:
+            crs_destino = None
+            geoms = shape.to_crs(src.crs) if not mesmo_crs else shape
+            if not mesmo_crs:
+                print(f"Reprojetando polígono para o CRS de: {os.path.basename(arquivo)}")
+        else:
+            crs_destino = shape.crs
+            geoms = shape
+            print(f"Reprojetando apenas a janela recortada de: {os.path.basename(arquivo)}")
+        geoms = np.asarray(geoms.geometry.array, dtype=object)
+        nodata = valor_nodata(src)
+
+    fontes = (threading.local(), [])
+    try:
+        return _recortar(arquivo, crs_destino, fontes, geoms, nodata, nome_saida, formato_saida, n_workers)
+    finally:
+        # handles de todas as threads desta chamada (VRTs antes dos rasters de base)
+        for handle in reversed(fontes[1]):
+            handle.close()
+
+
+def _recortar(arquivo, crs_destino, fontes, geoms, nodata, nome_saida, formato_saida, n_workers):
+    """Corpo de clip_raster: janela, perfil de saída e gravação bloco a bloco."""
+    ds = abrir_fonte(arquivo, crs_destino, fontes)
+    try:
+        janela = geometry_window(ds, geoms).intersection(Window(0, 0, ds.width, ds.height))
+    except rasterio.errors.WindowError:
+        print(f"⚠️ {os.path.basename(arquivo)} não intersecta o shapefile.")
+        return None
+    janela = Window(int(janela.col_off), int(janela.row_off), int(janela.width), int(janela.height))
+
+    perfil = ds.profile.copy()
+    perfil.update(driver='GTiff', width=janela.width, height=janela.height,
+                  transform=window_transform(janela, ds.transform), crs=ds.crs,
+                  nodata=nodata, **OPCOES_GTIFF)
+    perfil['predictor'] = 3 if np.issubdtype(np.dtype(ds.dtypes[0]), np.floating) else 2
+
+    arvore = shapely.STRtree(geoms)
+    blocos = [
+        Window(c, r, min(TAMANHO_BLOCO, janela.width - c), min(TAMANHO_BLOCO, janela.height - r))
+        for r in range(0, janela.height, TAMANHO_BLOCO)
+        for c in range(0, janela.width, TAMANHO_BLOCO)
+    ]
+
+    destino = nome_saida if formato_saida == 'GTiff' else nome_saida + ".tmp.tif"
+    with rasterio.open(destino, 'w', **perfil) as dst, \
+            ThreadPoolExecutor(max_workers=n_workers or os.cpu_count() or 4) as executor:
+        resultados = executor.map(
+            lambda b: recortar_bloco(arquivo, crs_destino, fontes, janela, b, geoms, arvore, nodata), blocos
+        )
+        # gravação na thread principal; blocos fora do polígono ficam vazios (sparse)
+        for bloco, dados in zip(blocos, resultados):
+            if dados is not None:
+                dst.write(dados, window=bloco)
+
+    if formato_saida == 'COG':
+        rasterio.shutil.copy(destino, nome_saida, driver='COG', compress='DEFLATE',
+                             predictor=perfil['predictor'], bigtiff='IF_SAFER')
+        os.remove(destino)
+    return nome_saida
+
+
+# --------------------
+# DN → REFLECTÂNCIA
+# --------------------
+def faixas(arquivo):
+    """Faixas de linhas (múltiplas do bloco de saída) que cobrem o raster."""
+    with rasterio.open(arquivo) as src:
+        largura, altura, bandas = src.width, src.height, src.count
+    linhas = max(TAMANHO_BLOCO, MAX_PIXELS_FAIXA // (largura * bandas) // TAMANHO_BLOCO * TAMANHO_BLOCO)
+    return [Window(0, r, largura, min(linhas, altura - r)) for r in range(0, altura, linhas)]
+
+
+def converter_faixa(tarefa):
+    """
+    Converte uma faixa de DN para reflectância e calcula suas estatísticas parciais.
+
+    Parâmetros:
+        tarefa (tuple): (arquivo, janela, tipo_saida)
+
+    Retorna:
+        tuple: (dados convertidos, mínimo por banda, máximo por banda, histograma por banda)
+    """
+    arquivo, janela, tipo = tarefa
+    # aberto e fechado a cada faixa: nenhum handle fica preso no worker
+    # (a abertura é desprezível diante da leitura de uma faixa inteira)
+    with rasterio.open(arquivo) as src:
+        dn = src.read(window=janela)
+        nodata = src.nodata
+    ref = dn.astype(np.float32) / np.float32(ESCALA_DN)
+
+    bandas = ref.shape[0]
+    if nodata is None:
+        validos = np.ones(ref.shape, dtype=bool)
+    elif np.isnan(nodata):
+        validos = ~np.isnan(dn)
+    else:
+        validos = dn != nodata
+
+    minimo = np.where(validos, ref, np.inf).min(axis=(1, 2))
+    maximo = np.where(validos, ref, -np.inf).max(axis=(1, 2))
+    classe = np.clip((ref * N_CLASSES_HIST).astype(np.int64), 0, N_CLASSES_HIST - 1)
+    classe += (np.arange(bandas) * N_CLASSES_HIST)[:, None, None]
+    hist = np.bincount(classe[validos], minlength=bandas * N_CLASSES_HIST).reshape(bandas, -1)
+
+    if tipo == 'uint16':
+        saida = np.round(np.clip(ref, 0, 1) * FATOR_UINT16).astype(np.uint16)
+        saida[~validos] = NODATA_UINT16
+    else:
+        saida = ref
+        saida[~validos] = np.nan
+    return saida, minimo, maximo, hist
+
+
+def perfil_saida(arquivo, tipo):
+    """Perfil GeoTIFF de saída: em blocos, comprimido e com compressão multi-thread."""
+    with rasterio.open(arquivo) as src:
+        perfil = src.profile.copy()
+    perfil.update(
+        driver='GTiff', dtype=tipo, tiled=True, blockxsize=TAMANHO_BLOCO, blockysize=TAMANHO_BLOCO,
+        compress='deflate', predictor=3 if tipo == 'float32' else 2, bigtiff='IF_SAFER',
+        num_threads='all_cpus', nodata=np.nan if tipo == 'float32' else NODATA_UINT16,
+    )
+    return perfil
+
+
+def nomes_saida(arquivos):
+    """
+    Nome ``<nome>_ref.tif`` de cada raster; arquivos de mesmo nome em pastas
+    diferentes recebem o nome da pasta como prefixo (``<pasta>_<nome>_ref.tif``)
+    e, se ainda coincidirem, um número sequencial.
+    """
+    nomes = [os.path.splitext(os.path.basename(f))[0] for f in arquivos]
+    repetidos = {n for n in nomes if nomes.count(n) > 1}
+    nomes = [f"{os.path.basename(os.path.dirname(os.path.abspath(f)))}_{n}" if n in repetidos else n
+             for f, n in zip(arquivos, nomes)]
+    usados, saida = set(), []
+    for nome in nomes:
+        candidato, k = nome, 1
+        while candidato.lower() in usados:
+            k += 1
+            candidato = f"{nome}_{k}"
+        usados.add(candidato.lower())
+        saida.append(f"{candidato}_ref.tif")
+    return saida
+
+
+@traced("dn_to_reflectance")
+def dn_to_reflectance(arquivos, dir_saida, tipo_saida='float32', n_workers=None):
+    """
+    Converte rasters de DN para reflectância (DN / 65535), gravando ``<nome>_ref.tif``
+    (nomes únicos por ``nomes_saida``; arquivos repetidos são convertidos uma vez).
+
+    Cada arquivo é lido e gravado uma única vez, em faixas processadas por
+    um pool de processos; mínimo, máximo e histograma de cada banda são
+    acumulados na mesma passagem.
+
+    Parâmetros:
+        arquivos (list): rasters de entrada
+        dir_saida (str): pasta de saída
+        tipo_saida (str): 'float32' (0–1) ou 'uint16' (× FATOR_UINT16, com escala nos metadados)
+        n_workers (int): processos simultâneos
+
+    Retorna:
+        tuple: (DataFrame de mínimo/máximo por banda, DataFrame de histogramas)
+    """
+    if not arquivos:
+        raise ValueError("Nenhum raster informado para conversão.")
+    unicos = list(dict.fromkeys(os.path.abspath(f) for f in arquivos))
+    if len(unicos) < len(arquivos):
+        print(f"⚠️ {len(arquivos) - len(unicos)} arquivo(s) repetido(s) ignorado(s).")
+    arquivos = unicos
+    saidas = dict(zip(arquivos, nomes_saida(arquivos)))
+    n_workers = n_workers or os.cpu_count() or 4
+    os.makedirs(dir_saida, exist_ok=True)
+
+    # faixas na ordem arquivo → linha; a gravação segue sempre essa ordem
+    tarefas = [(f, janela, tipo_saida) for f in arquivos for janela in faixas(f)]
+    ultima = {f: janela for f, janela, _ in tarefas}
+
+    estatisticas, histogramas = [], []
+    dst, acumulado = None, None
+    from geoproc.zonal_engine import _contexto_processos
+
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=_contexto_processos()) as executor:
+        # no máximo 2 faixas por worker em memória
+        pendentes = deque()
+        fila = iter(tarefas)
+        for tarefa in fila:
+            pendentes.append((tarefa, executor.submit(converter_faixa, tarefa)))
+            if len(pendentes) >= 2 * n_workers:
+                break
+        while pendentes:
+            (f, janela, _), futuro = pendentes.popleft()
+            proxima = next(fila, None)
+            if proxima is not None:
+                pendentes.append((proxima, executor.submit(converter_faixa, proxima)))
+
+            saida, minimo, maximo, hist = futuro.result()
+            if dst is None:
+                out = os.path.join(dir_saida, saidas[f])
+                dst = rasterio.open(out, 'w', **perfil_saida(f, tipo_saida))
+                if tipo_saida == 'uint16':
+                    dst.scales = (1 / FATOR_UINT16,) * dst.count
+                acumulado = [minimo, maximo, hist]
+            else:
+                acumulado = [np.minimum(acumulado[0], minimo), np.maximum(acumulado[1], maximo),
+                             acumulado[2] + hist]
+            dst.write(saida, window=janela)
+
+            if janela == ultima[f]:
+                dst.close()
+                dst = None
+                minimo, maximo, hist = acumulado
+                for b in range(len(minimo)):
+                    estatisticas.append({'arquivo': os.path.basename(out), 'banda': b + 1,
+                                         'min': minimo[b] if hist[b].any() else np.nan,
+                                         'max': maximo[b] if hist[b].any() else np.nan})
+                    histogramas.append(pd.DataFrame({
+                        'arquivo': os.path.basename(out), 'banda': b + 1,
+                        'classe_inicio': np.arange(N_CLASSES_HIST) / N_CLASSES_HIST,
+                        'classe_fim': np.arange(1, N_CLASSES_HIST + 1) / N_CLASSES_HIST,
+                        'contagem': hist[b],
+                    }))
+                # imprime valores mínimo e máximo das bandas convertidas
+                print(f"{os.path.basename(out)}: min={minimo.min():.4f}, max={maximo.max():.4f}")
+
+    return pd.DataFrame(estatisticas), pd.concat(histogramas, ignore_index=True)
+
+
+# --------------------
+# OVERVIEWS E COG
+# --------------------
+def fatores_overview(largura, altura, tamanho_minimo=256):
+    """Fatores 2, 4, 8… até o lado maior do overview ficar abaixo de ``tamanho_minimo`` pixels."""
+    fatores, f = [], 2
+    while max(largura, altura) / f >= tamanho_minimo:
+        fatores.append(f)
+        f *= 2
+    return fatores or [2]
+
+
+@traced("build_overviews", arquivo="arquivo")
+def build_overviews(arquivo, fatores=None, reamostragem='average', substituir=False):
+    """
+    Gera overviews internos no próprio GeoTIFF (usados pelas estatísticas
+    zonais com min_pixels). Rasters que já têm overviews são mantidos.
+
+    Parâmetros:
+        arquivo (str): raster (.tif)
+        fatores (list): fatores de redução (padrão: 2, 4, 8… até ~256 pixels)
+        reamostragem (str): método do GDAL ('average' preserva a média)
+        substituir (bool): regera os overviews mesmo se já existirem
+
+    Retorna:
+        list: fatores dos overviews disponíveis
+    """
+    with rasterio.open(arquivo) as src:
+        existentes = src.overviews(1)
+        largura, altura = src.width, src.height
+    if existentes and not substituir:
+        return existentes
+    fatores = list(fatores or fatores_overview(largura, altura))
+    with rasterio.Env(COMPRESS_OVERVIEW='DEFLATE', GDAL_NUM_THREADS='ALL_CPUS'), \
+            rasterio.open(arquivo, 'r+') as dst:
+        dst.build_overviews(fatores, Resampling[reamostragem])
+    return fatores
+
+
+@traced("convert_to_cog", arquivo="arquivo")
+def convert_to_cog(arquivo, destino, reamostragem='average'):
+    """
+    Converte um raster em Cloud-Optimized GeoTIFF (blocos 512 × 512,
+    DEFLATE e overviews internos), lido depois por janelas e por nível.
+
+    Parâmetros:
+        arquivo (str): raster de entrada
+        destino (str): COG de saída
+        reamostragem (str): método dos overviews ('average' preserva a média)
+
+    Retorna:
+        str: ``destino``
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+    rasterio.shutil.copy(arquivo, destino, driver='COG', compress='DEFLATE', predictor='YES',
+                         blocksize=TAMANHO_BLOCO, overview_resampling=reamostragem.upper(),
+                         num_threads='ALL_CPUS', bigtiff='IF_SAFER')
+    return destino
@@ -0,0 +1,154 @@
+# ================================================================
+# Script: result_cache.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Cache em disco de resultados por par de arquivos (ex.:
+#            shapefile × raster). A chave combina a impressão digital
+#            dos arquivos de entrada (tamanho + data de modificação ou
+#            hash do conteúdo) com os parâmetros do cálculo, permitindo
+#            reprocessar apenas pares novos ou alterados e retomar
+#            execuções interrompidas. Remove as entradas menos usadas
+#            quando o cache excede o tamanho máximo.
+# Linguagem: Python
+# Dependências: pandas, pyarrow
+# Data: 2026-10-18
+# ================================================================
+
+import hashlib
+import json
+import os
+import pandas as pd
+
+# --------------------
+# PARÂMETROS
+# --------------------
+EXTENSOES_SHAPEFILE = ('.shp', '.shx', '.dbf', '.prj', '.cpg')
+MODOS_IMPRESSAO = ('mtime', 'hash')
+TAMANHO_LEITURA = 1 << 20  # 1 MB por leitura no cálculo do hash
+
+
+# --------------------
+# IMPRESSÃO DIGITAL DOS ARQUIVOS
+# --------------------
+def _arquivos_relacionados(path):
+    """Lista o arquivo e, no caso de shapefile, seus arquivos auxiliares."""
+    base, ext = os.path.splitext(path)
+    if ext.lower() != '.shp':
+        return [path]
+    return [base + e for e in EXTENSOES_SHAPEFILE if os.path.exists(base + e)]
+
+
+def _hash_arquivo(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_LEITURA), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def file_fingerprint(path, modo='mtime'):
+    """
+    Calcula a impressão digital de um arquivo (e dos auxiliares do shapefile).
+
+    Parâmetros:
+        path (str): caminho do arquivo
+        modo (str): 'mtime' (tamanho + data de modificação) ou 'hash' (SHA-256 do conteúdo)
+
+    Retorna:
+        str: impressão digital em hexadecimal
+    """
+    if modo not in MODOS_IMPRESSAO:
+        raise ValueError(f"Modo inválido: '{modo}'. Use um de {MODOS_IMPRESSAO}.")
+    partes = []
+    for arq in _arquivos_relacionados(path):
+        ext = os.path.splitext(arq)[1].lower()
+        if modo == 'hash':
+            partes.append((ext, _hash_arquivo(arq)))
+        else:
+            st = os.stat(arq)
+            partes.append((ext, st.st_size, st.st_mtime_ns))
+    return hashlib.sha256(json.dumps(partes).encode()).hexdigest()
+
+
+def cache_key(*impressoes, **parametros):
+    """
+    Monta a chave do cache a partir das impressões digitais dos arquivos
+    e dos parâmetros do cálculo (ex.: estatísticas, banda).
+
+    Retorna:
+        str: chave em hexadecimal
+    """
+    conteudo = json.dumps([impressoes, sorted(parametros.items())], default=str)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+# --------------------
+# CACHE EM DISCO
+# --------------------
+class ResultCache:
+    """
+    Armazena um DataFrame por chave em ``cache_dir`` (um arquivo Parquet por
+    entrada). Cada gravação é atômica, de modo que uma execução interrompida
+    mantém todos os pares concluídos. A data de modificação das entradas é
+    atualizada a cada acesso e usada na remoção das menos recentes.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, chave):
+        return os.path.join(self.cache_dir, chave[:2], f"{chave}.parquet")
+
+    def __contains__(self, chave):
+        return os.path.exists(self._path(chave))
+
+    def get(self, chave):
+        """Retorna o DataFrame armazenado ou None se a chave não existir."""
+        path = self._path(chave)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # marca como usado recentemente
+        return df
+
+    def put(self, chave, df):
+        """Grava o DataFrame de forma atômica (arquivo temporário + rename)."""
+        path = self._path(chave)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def size(self):
+        """Tamanho total do cache em bytes."""
+        return sum(st.st_size for _, st in self._entradas())
+
+    def _entradas(self):
+        for raiz, _, arquivos in os.walk(self.cache_dir):
+            for nome in arquivos:
+                if nome.endswith('.parquet'):
+                    path = os.path.join(raiz, nome)
+                    yield path, os.stat(path)
+
+    def evict(self, max_bytes=None):
+        """
+        Remove as entradas menos recentemente usadas até o cache caber em ``max_bytes``.
+
+        Retorna:
+            int: número de entradas removidas
+        """
+        limite = max_bytes if max_bytes is not None else self.max_bytes
+        if limite is None:
+            return 0
+        entradas = sorted(self._entradas(), key=lambda e: e[1].st_mtime_ns)
+        total = sum(st.st_size for _, st in entradas)
+        removidas = 0
+        for path, st in entradas:
+            if total <= limite:
+                break
+            os.remove(path)
+            total -= st.st_size
+            removidas += 1
+        return removidas
@@ -0,0 +1,235 @@
+# ================================================================
+# Script: result_sink.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Gravação incremental de resultados tabulares. Os lotes são
+#            acrescentados a um arquivo Parquet, Feather ou CSV à medida
+#            que são produzidos, com memória limitada ao buffer. Inclui a
+#            exportação opcional para Excel, dividida em várias abas
+#            quando o número de linhas excede o limite da planilha e a
+#            gravação de datasets Parquet particionados.
+# Linguagem: Python
+# Dependências: pandas, pyarrow (Parquet/Feather), openpyxl (Excel)
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import pandas as pd
+
+# --------------------
+# PARÂMETROS
+# --------------------
+FORMATOS = ('parquet', 'feather', 'csv')
+LINHAS_POR_GRUPO = 100_000          # linhas acumuladas antes de cada gravação
+MAX_LINHAS_EXCEL = 1_048_576 - 1    # limite de linhas por aba (menos o cabeçalho)
+
+
+def _importar_pyarrow():
+    """Importa o pyarrow apenas quando o formato colunar é usado."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Os formatos 'parquet' e 'feather' exigem o pacote pyarrow.") from e
+    return pa
+
+
+def formato_por_extensao(path):
+    """Deduz o formato ('parquet', 'feather' ou 'csv') pela extensão do arquivo."""
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    formato = {'parq': 'parquet', 'arrow': 'feather', 'ipc': 'feather'}.get(ext, ext)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de saída não suportado: '{ext}'. Use um de {FORMATOS}.")
+    return formato
+
+
+# --------------------
+# GRAVAÇÃO INCREMENTAL
+# --------------------
+class ResultSink:
+    """
+    Acrescenta DataFrames a um arquivo de saída sem manter a tabela inteira
+    em memória. O esquema (colunas e tipos) é fixado pelo primeiro lote.
+
+    Uso:
+        with ResultSink("saida.parquet") as sink:
+            for df in lotes:
+                sink.write(df)
+    """
+
+    def __init__(self, path, formato=None, linhas_por_grupo=LINHAS_POR_GRUPO):
+        self.path = path
+        self.formato = formato or formato_por_extensao(path)
+        self.linhas_por_grupo = linhas_por_grupo
+        self.linhas = 0
+        self._buffer = []
+        self._linhas_buffer = 0
+        self._writer = None
+        self._schema = None
+        self._colunas = None
+        if self.formato != 'csv':
+            _importar_pyarrow()
+        # grava em arquivo temporário; o destino só é substituído no close()
+        self._tmp_path = f"{path}.tmp"
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def write(self, df):
+        """Acrescenta um lote de linhas ao arquivo."""
+        if df.empty:
+            return
+        if self._colunas is None:
+            self._colunas = list(df.columns)
+        self._buffer.append(df[self._colunas])
+        self._linhas_buffer += len(df)
+        self.linhas += len(df)
+        if self._linhas_buffer >= self.linhas_por_grupo:
+            self._descarregar()
+
+    def _descarregar(self):
+        """Grava o buffer como um grupo de linhas (row group / lote)."""
+        if not self._buffer:
+            return
+        bloco = pd.concat(self._buffer, ignore_index=True)
+        self._buffer, self._linhas_buffer = [], 0
+
+        if self.formato == 'csv':
+            bloco.to_csv(self._tmp_path, mode='a', index=False, header=self._writer is None)
+            self._writer = True
+            return
+
+        pa = _importar_pyarrow()
+        if self._writer is None:
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            self._schema = tabela.schema
+            if self.formato == 'parquet':
+                self._writer = pa.parquet.ParquetWriter(self._tmp_path, self._schema, compression='zstd')
+            else:
+                self._writer = pa.ipc.new_file(self._tmp_path, self._schema)
+        else:
+            tabela = pa.Table.from_pandas(bloco, schema=self._schema, preserve_index=False)
+        self._writer.write_table(tabela)
+
+    def close(self):
+        """Grava o restante do buffer, fecha o arquivo e o move para o destino final."""
+        self._descarregar()
+        if self._writer not in (None, True):
+            self._writer.close()
+        if self._writer is not None:
+            os.replace(self._tmp_path, self.path)
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._writer not in (None, True):
+            self._writer.close()
+
+
+# --------------------
+# DATASET PARTICIONADO
+# --------------------
+def write_partition(df, root, coluna):
+    """
+    Grava ``df`` em um dataset Parquet particionado (layout hive), um
+    arquivo por valor de ``coluna``: ``<root>/<coluna>=<valor>/part-0.parquet``.
+    Cada partição é gravada em arquivo temporário e substituída de uma vez;
+    a coluna de partição é reconstruída na leitura (``pd.read_parquet(root)``).
+
+    Parâmetros:
+        df (pandas.DataFrame): linhas a gravar
+        root (str): pasta raiz do dataset
+        coluna (str): coluna de partição
+
+    Retorna:
+        list: caminhos dos arquivos gravados
+    """
+    pa = _importar_pyarrow()
+    caminhos = []
+    for valor, parte in df.groupby(coluna, sort=False):
+        pasta = os.path.join(root, f"{coluna}={valor}")
+        os.makedirs(pasta, exist_ok=True)
+        destino = os.path.join(pasta, "part-0.parquet")
+        tabela = pa.Table.from_pandas(parte.drop(columns=coluna), preserve_index=False)
+        pa.parquet.write_table(tabela, f"{destino}.tmp", compression='zstd')
+        os.replace(f"{destino}.tmp", destino)
+        caminhos.append(destino)
+    return caminhos
+
+
+# --------------------
+# LEITURA EM LOTES
+# --------------------
+def iter_batches(path, formato=None, linhas=LINHAS_POR_GRUPO):
+    """
+    Lê um arquivo gravado por ``ResultSink`` em lotes de DataFrame.
+
+    Parâmetros:
+        path (str): caminho do arquivo
+        formato (str): 'parquet', 'feather' ou 'csv' (padrão: pela extensão)
+        linhas (int): linhas aproximadas por lote
+
+    Retorna:
+        generator: DataFrames sucessivos
+    """
+    formato = formato or formato_por_extensao(path)
+    if formato == 'csv':
+        yield from pd.read_csv(path, chunksize=linhas)
+        return
+
+    pa = _importar_pyarrow()
+    if formato == 'parquet':
+        for lote in pa.parquet.ParquetFile(path).iter_batches(batch_size=linhas):
+            yield lote.to_pandas()
+    else:
+        with pa.memory_map(path) as fonte:
+            leitor = pa.ipc.open_file(fonte)
+            for i in range(leitor.num_record_batches):
+                yield leitor.get_batch(i).to_pandas()
+
+
+# --------------------
+# EXPORTAÇÃO PARA EXCEL
+# --------------------
+def export_excel(path, xlsx_path, formato=None, max_linhas=MAX_LINHAS_EXCEL, nome_aba='resultados'):
+    """
+    Exporta um arquivo de resultados para Excel em modo de escrita contínua,
+    abrindo uma nova aba sempre que ``max_linhas`` é atingido.
+
+    Parâmetros:
+        path (str): arquivo de resultados (Parquet, Feather ou CSV)
+        xlsx_path (str): planilha de saída (.xlsx)
+        formato (str): formato do arquivo de entrada (padrão: pela extensão)
+        max_linhas (int): linhas de dados por aba
+        nome_aba (str): prefixo do nome das abas
+
+    Retorna:
+        int: número de abas gravadas
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    aba, linhas_aba, n_abas, cabecalho = None, 0, 0, None
+    for lote in iter_batches(path, formato):
+        if cabecalho is None:
+            cabecalho = list(lote.columns)
+        lote = lote.astype(object).where(lote.notna(), None)
+        for linha in lote.itertuples(index=False, name=None):
+            if aba is None or linhas_aba >= max_linhas:
+                n_abas += 1
+                aba = wb.create_sheet(nome_aba if n_abas == 1 else f"{nome_aba}_{n_abas}")
+                aba.append(cabecalho)
+                linhas_aba = 0
+            aba.append(linha)
+            linhas_aba += 1
+
+    if aba is None:
+        aba = wb.create_sheet(nome_aba)
+        n_abas = 1
+        if cabecalho:
+            aba.append(cabecalho)
+    wb.save(xlsx_path)
+    return n_abas
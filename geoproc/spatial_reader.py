@@ -0,0 +1,186 @@
+# ================================================================
+# Script: spatial_reader.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Leitura espacialmente filtrada de camadas vetoriais.
+#            Constrói e persiste um índice espacial por camada (arquivo
+#            auxiliar .sidx.npz com as caixas envolventes das feições,
+#            consultadas por uma R-tree shapely.STRtree) e lê apenas as
+#            feições que intersectam um retângulo (bbox) ou uma geometria
+#            (mask). Formatos com índice nativo (GeoPackage, FlatGeobuf)
+#            usam o filtro do próprio GDAL.
+# Linguagem: Python
+# Dependências: pyogrio, geopandas, shapely, numpy, pyproj
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pyogrio
+import shapely
+from pyproj import CRS, Transformer
+from geoproc.result_cache import file_fingerprint
+
+# --------------------
+# PARÂMETROS
+# --------------------
+SUFIXO_INDICE = ".sidx.npz"
+MAX_ARVORES = 8  # R-trees mantidas em memória (camadas consultadas por último)
+
+
+# --------------------
+# CRS DA CAMADA
+# --------------------
+def get_shapefile_crs(path: str, layer: str = None):
+    """
+    Obtém o CRS de uma camada vetorial (.shp ou outro formato OGR), lido
+    apenas dos metadados.
+
+    Parâmetros:
+        path (str): caminho da camada
+        layer (str): camada (arquivos com várias camadas; padrão: a primeira)
+
+    Retorna:
+        pyproj.CRS: CRS da camada (None se não definido)
+    """
+    crs = pyogrio.read_info(path, layer=layer)['crs']
+    return CRS.from_user_input(crs) if crs else None
+
+
+# --------------------
+# ÍNDICE ESPACIAL
+# --------------------
+def index_path(path: str) -> str:
+    """Caminho do arquivo de índice associado à camada."""
+    return os.path.splitext(path)[0] + SUFIXO_INDICE
+
+
+def build_spatial_index(path: str, force: bool = False) -> str:
+    """
+    Constrói (ou atualiza) o índice espacial de uma camada.
+
+    As caixas envolventes são lidas com ``pyogrio.read_bounds`` (sem
+    decodificar atributos) e gravadas junto com a impressão digital da
+    camada; o índice é refeito quando a camada muda. A R-tree (STRtree) é
+    montada a partir delas na primeira consulta e mantida em memória.
+
+    Parâmetros:
+        path (str): caminho da camada (.shp ou outro formato OGR)
+        force (bool): reconstrói mesmo se o índice estiver atualizado
+
+    Retorna:
+        str: caminho do arquivo de índice
+    """
+    destino = index_path(path)
+    impressao = file_fingerprint(path)
+    if not force and os.path.exists(destino):
+        with np.load(destino) as idx:
+            if str(idx['impressao']) == impressao:
+                return destino
+
+    fids, bounds = pyogrio.read_bounds(path)
+    tmp = destino + ".tmp.npz"
+    np.savez(
+        tmp,
+        impressao=np.array(impressao),
+        fids=fids,
+        xmin=bounds[0], ymin=bounds[1], xmax=bounds[2], ymax=bounds[3],
+    )
+    os.replace(tmp, destino)
+    return destino
+
+
+_arvores = OrderedDict()  # arquivo de índice → (impressão, STRtree, fids)
+_trava_arvores = threading.Lock()
+
+
+def _arvore(path: str):
+    """R-tree das caixas envolventes da camada (montada uma vez por versão do índice)."""
+    destino = build_spatial_index(path)
+    with np.load(destino) as idx:
+        impressao = str(idx['impressao'])
+        with _trava_arvores:
+            atual = _arvores.get(destino)
+            if atual is not None and atual[0] == impressao:
+                _arvores.move_to_end(destino)
+                return atual[1], atual[2]
+        caixas = shapely.box(idx['xmin'], idx['ymin'], idx['xmax'], idx['ymax'])
+        fids = idx['fids']
+    arvore = shapely.STRtree(caixas)
+    with _trava_arvores:
+        _arvores[destino] = (impressao, arvore, fids)
+        if len(_arvores) > MAX_ARVORES:
+            _arvores.popitem(last=False)
+    return arvore, fids
+
+
+def query_index(path: str, bbox) -> np.ndarray:
+    """
+    Retorna os FIDs das feições cuja caixa envolvente intersecta ``bbox``.
+
+    Parâmetros:
+        path (str): caminho da camada
+        bbox (tuple): (xmin, ymin, xmax, ymax) no CRS da camada
+
+    Retorna:
+        numpy.ndarray: FIDs em ordem crescente
+    """
+    arvore, fids = _arvore(path)
+    # sem predicado, a consulta compara apenas as caixas envolventes (O(log n + k))
+    return np.sort(fids[arvore.query(shapely.box(*bbox))])
+
+
+# --------------------
+# LEITURA FILTRADA
+# --------------------
+def _para_crs_da_camada(path, geom, crs):
+    """Reprojeta a geometria de consulta para o CRS da camada (se informado e diferente)."""
+    if crs is None:
+        return geom
+    destino = get_shapefile_crs(path)
+    if destino is None:
+        return geom
+    origem = CRS.from_user_input(crs)
+    if origem == destino:
+        return geom
+    transformer = Transformer.from_crs(origem, destino, always_xy=True)
+    return shapely.transform(geom, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+
+
+def read_layer(path: str, bbox=None, mask=None, crs=None, columns=None, usar_indice=True):
+    """
+    Lê uma camada vetorial, opcionalmente apenas as feições que intersectam
+    um retângulo ou uma geometria.
+
+    Parâmetros:
+        path (str): caminho da camada
+        bbox (tuple): (xmin, ymin, xmax, ymax) de interesse
+        mask (shapely.Geometry): geometria de interesse (alternativa ao bbox)
+        crs: CRS de ``bbox``/``mask`` (padrão: o da camada)
+        columns (list): atributos a ler (padrão: todos)
+        usar_indice (bool): usa o índice .sidx.npz em formatos sem índice nativo
+
+    Retorna:
+        geopandas.GeoDataFrame: feições selecionadas, na ordem do arquivo
+    """
+    if bbox is not None and mask is not None:
+        raise ValueError("Informe apenas bbox ou mask, não ambos.")
+    if bbox is None and mask is None:
+        return pyogrio.read_dataframe(path, columns=columns)
+
+    geom = shapely.box(*bbox) if bbox is not None else mask
+    geom = _para_crs_da_camada(path, geom, crs)
+
+    nativo = pyogrio.read_info(path)['capabilities'].get('fast_spatial_filter', False)
+    if nativo or not usar_indice:
+        if mask is None:
+            return pyogrio.read_dataframe(path, columns=columns, bbox=tuple(shapely.bounds(geom)))
+        return pyogrio.read_dataframe(path, columns=columns, mask=geom)
+
+    fids = query_index(path, shapely.bounds(geom))
+    gdf = pyogrio.read_dataframe(path, columns=columns, fids=fids)
+    if len(gdf):
+        # refinamento exato (o índice só compara caixas envolventes)
+        gdf = gdf[shapely.intersects(gdf.geometry.values, geom)]
+    return gdf
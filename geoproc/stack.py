@@ -0,0 +1,294 @@
+# ================================================================
+# Script: stack.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Pilha multibanda em disco (NumPy memmap) montada uma única
+#            vez a partir de uma pasta de rasters alinhados (mesma
+#            grade). Os valores ficam intercalados por pixel
+#            (linha, coluna, banda): a janela de uma zona ou um ponto
+#            traz todas as bandas em um único acesso contíguo, sem
+#            reabrir dezenas de GeoTIFFs. Atende estatísticas zonais
+#            (mesmo resultado do zonal_engine) e amostragem de pontos
+#            (ex.: CSVs de generate_kml_points.py).
+# Linguagem: Python
+# Dependências: numpy, rasterio, geopandas, shapely, pandas, pyproj
+# Data: 2026-10-18
+# ================================================================
+
+import glob
+import json
+import os
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import rasterio
+from rasterio.windows import Window
+from geoproc.instrument import stage, traced
+from geoproc.result_cache import file_fingerprint
+from geoproc.zonal_engine import (
+    MAX_PIXELS_FAIXA, _acumulador, _combinar, _finalizar, _reduzir_faixa, _validar_stats,
+    build_labels, grid_key,
+)
+
+# --------------------
+# PARÂMETROS
+# --------------------
+ARQUIVO_DADOS = "stack.npy"
+ARQUIVO_META = "stack.json"
+STATS_PADRAO = ['mean', 'median', 'min', 'max']
+
+
+# --------------------
+# MONTAGEM DA PILHA
+# --------------------
+def _listar_rasters(entrada):
+    if isinstance(entrada, (list, tuple)):
+        return list(entrada)
+    return sorted(glob.glob(os.path.join(entrada, "*.tif")))
+
+
+def _nomes_bandas(path, n):
+    nome = os.path.splitext(os.path.basename(path))[0]
+    return [nome] if n == 1 else [f"{nome}_b{i}" for i in range(1, n + 1)]
+
+
+def _ler_meta(destino):
+    try:
+        with open(os.path.join(destino, ARQUIVO_META), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@traced("build_stack", arquivo="entrada")
+def build_stack(entrada, destino: str, dtype=None, reconstruir: bool = False) -> str:
+    """
+    Monta a pilha (stack.npy + stack.json) a partir de rasters alinhados.
+    Se a pilha existente foi feita com os mesmos arquivos, na mesma ordem e
+    sem alterações (impressão digital de result_cache.py), ela é reaproveitada.
+
+    Parâmetros:
+        entrada: pasta com os .tif ou lista de rasters (na ordem das bandas)
+        destino (str): pasta da pilha
+        dtype: tipo dos valores (padrão: o tipo comum dos rasters)
+        reconstruir (bool): monta novamente mesmo se a pilha estiver atualizada
+
+    Retorna:
+        str: pasta da pilha
+    """
+    rasters = _listar_rasters(entrada)
+    if not rasters:
+        raise FileNotFoundError(f"Nenhum raster (.tif) encontrado em: {entrada}")
+    # lista ordenada: a ordem dos arquivos define a ordem das bandas
+    impressoes = [[os.path.abspath(p), file_fingerprint(p)] for p in rasters]
+
+    meta = _ler_meta(destino)
+    if not reconstruir and meta is not None and meta['fontes'] == impressoes \
+            and os.path.exists(os.path.join(destino, ARQUIVO_DADOS)):
+        print(f"Pilha atualizada, reaproveitada: {destino}")
+        return destino
+
+    # todos os rasters na grade do primeiro
+    bandas, nodata, tipos, fora = [], [], [], []
+    with rasterio.open(rasters[0]) as ref:
+        grade = grid_key(ref)
+        crs = ref.crs.to_wkt() if ref.crs else None
+        transform = tuple(ref.transform)[:6]
+        largura, altura = ref.width, ref.height
+    for path in rasters:
+        with rasterio.open(path) as src:
+            if grid_key(src) != grade:
+                fora.append(os.path.basename(path))
+                continue
+            bandas += _nomes_bandas(path, src.count)
+            nodata += list(src.nodatavals)
+            tipos += list(src.dtypes)
+    if fora:
+        raise ValueError(f"Rasters fora da grade de {os.path.basename(rasters[0])}: {fora}")
+    dtype = np.dtype(dtype) if dtype is not None else np.result_type(*tipos)
+
+    os.makedirs(destino, exist_ok=True)
+    final = os.path.join(destino, ARQUIVO_DADOS)
+    tmp = os.path.join(destino, f".{ARQUIVO_DADOS}.tmp-{os.getpid()}.npy")
+    try:
+        # intercalado por pixel: (linha, coluna, banda)
+        dados = np.lib.format.open_memmap(tmp, mode='w+', dtype=dtype, shape=(altura, largura, len(bandas)))
+        linhas = max(1, MAX_PIXELS_FAIXA // largura)
+        inicio = 0
+        for path in rasters:
+            with rasterio.open(path) as src, stage("empilhamento", arquivo=path, bandas=src.count):
+                for lin in range(0, altura, linhas):
+                    h = min(linhas, altura - lin)
+                    bloco = src.read(window=Window(0, lin, largura, h))
+                    dados[lin:lin + h, :, inicio:inicio + src.count] = np.moveaxis(bloco, 0, -1)
+                inicio += src.count
+        dados.flush()
+        del dados
+        os.replace(tmp, final)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    meta = {
+        'bandas': bandas, 'nodata': nodata, 'dtype': dtype.str, 'largura': largura, 'altura': altura,
+        'crs': crs, 'transform': transform, 'fontes': impressoes,
+    }
+    with open(os.path.join(destino, ARQUIVO_META), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    print(f"Pilha montada: {len(bandas)} bandas, {altura} × {largura} pixels ({dtype}) → {destino}")
+    return destino
+
+
+# --------------------
+# CONSULTAS
+# --------------------
+class RasterStack:
+    """
+    Pilha multibanda aberta em modo somente leitura (memmap): apenas as
+    janelas consultadas são lidas do disco.
+
+    Uso:
+        pilha = RasterStack("D:/camadas_raster/stack")
+        zonal = pilha.zonal_stats(gdf)
+        amostras = pilha.sample_points(df_pontos)
+    """
+
+    def __init__(self, destino: str):
+        meta = _ler_meta(destino)
+        if meta is None:
+            raise FileNotFoundError(f"Pilha não encontrada em: {destino} (use build_stack)")
+        self.destino = destino
+        self.meta = meta
+        self.dados = np.load(os.path.join(destino, ARQUIVO_DADOS), mmap_mode='r')
+        self.bandas = meta['bandas']
+        self.nodata = meta['nodata']
+        self.transform = rasterio.Affine(*meta['transform'])
+        self.crs = rasterio.crs.CRS.from_wkt(meta['crs']) if meta['crs'] else None
+
+    def desatualizados(self) -> list:
+        """Rasters de origem alterados ou removidos desde a montagem da pilha."""
+        return [os.path.basename(p) for p, impressao in self.meta['fontes']
+                if not os.path.exists(p) or file_fingerprint(p) != impressao]
+
+    def _grade(self):
+        """Objeto com os atributos de grade usados por build_labels."""
+        return SimpleNamespace(crs=self.crs, transform=self.transform,
+                               width=self.meta['largura'], height=self.meta['altura'])
+
+    def _mascarado(self, valores, b):
+        """Banda ``b`` de um bloco como array mascarado (nodata); NaN é tratado na redução."""
+        nodata = self.nodata[b]
+        if nodata is None or (isinstance(nodata, float) and np.isnan(nodata)):
+            return np.ma.MaskedArray(valores)
+        return np.ma.masked_equal(valores, nodata, copy=False)
+
+    def zonal_stats(self, gdf, stats=None, all_touched: bool = False, bandas=None):
+        """
+        Estatísticas zonais de todas as feições em todas as bandas, lendo a
+        janela da camada em faixas que trazem todas as bandas de uma vez.
+
+        Parâmetros:
+            gdf (geopandas.GeoDataFrame): camada de polígonos
+            stats (list): estatísticas entre 'min', 'max', 'mean', 'median', 'count'
+            all_touched (bool): inclui todos os pixels tocados pelo polígono
+            bandas (list): nomes das bandas (padrão: todas)
+
+        Retorna:
+            pandas.DataFrame: colunas raster (banda), polygon_id e ``stats``,
+                na ordem banda × feição
+        """
+        stats = _validar_stats(stats or STATS_PADRAO)
+        mediana = 'median' in stats
+        indices = [self.bandas.index(b) for b in bandas] if bandas else list(range(len(self.bandas)))
+        n = len(gdf)
+        accs = [_acumulador(n, mediana) for _ in indices]
+
+        with stage("rasterizacao", arquivo=self.destino, feicoes=n):
+            janela, rotulos = build_labels(gdf, self._grade(), all_touched=all_touched)
+        if janela is not None:
+            c0, l0 = janela.col_off, janela.row_off
+            linhas = max(1, MAX_PIXELS_FAIXA // (janela.width * len(self.bandas)))
+            with stage("estatisticas", arquivo=self.destino, bandas=len(indices)):
+                for ini in range(0, janela.height, linhas):
+                    fim = min(janela.height, ini + linhas)
+                    rot_faixa = [r[ini:fim] for r in rotulos]
+                    if not any(r.any() for r in rot_faixa):
+                        continue
+                    # um acesso contíguo por linha da janela, com todas as bandas
+                    bloco = np.asarray(self.dados[l0 + ini:l0 + fim, c0:c0 + janela.width, :])
+                    for acc, b in zip(accs, indices):
+                        dados = self._mascarado(bloco[:, :, b], b)
+                        _combinar(acc, _reduzir_faixa(dados, rot_faixa, n, mediana))
+
+        tabelas = []
+        for acc, b in zip(accs, indices):
+            df = pd.DataFrame(_finalizar(acc, stats), columns=stats)
+            df.insert(0, 'raster', self.bandas[b])
+            df.insert(1, 'polygon_id', range(1, n + 1))
+            tabelas.append(df)
+        return pd.concat(tabelas, ignore_index=True)
+
+    def sample(self, xs, ys) -> pd.DataFrame:
+        """
+        Valores de todas as bandas nos pontos (coordenadas no CRS da pilha).
+        Pontos fora da grade ou em nodata recebem NaN.
+
+        Retorna:
+            pandas.DataFrame: uma coluna por banda, uma linha por ponto
+        """
+        xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+        cols, lins = ~self.transform * (xs, ys)
+        cols, lins = np.floor(cols), np.floor(lins)
+        dentro = np.isfinite(cols) & np.isfinite(lins) & (cols >= 0) & (lins >= 0) \
+            & (cols < self.meta['largura']) & (lins < self.meta['altura'])
+        valores = np.full((len(xs), len(self.bandas)), np.nan)
+        # todas as bandas de cada ponto em um único acesso (pixel intercalado)
+        valores[dentro] = self.dados[lins[dentro].astype(np.int64), cols[dentro].astype(np.int64), :]
+        for b, nodata in enumerate(self.nodata):
+            if nodata is not None:
+                valores[valores[:, b] == nodata, b] = np.nan
+        return pd.DataFrame(valores, columns=self.bandas)
+
+    def sample_points(self, pontos, x: str = 'longitude', y: str = 'latitude', crs="EPSG:4326"):
+        """
+        Amostra todas as bandas nos pontos de uma tabela (ex.: o CSV de
+        generate_kml_points.py, em graus decimais) ou de um GeoDataFrame.
+
+        Parâmetros:
+            pontos: pandas.DataFrame com colunas ``x``/``y`` ou GeoDataFrame de pontos
+            x, y (str): colunas de coordenadas (DataFrame)
+            crs: CRS das colunas ``x``/``y`` (DataFrame)
+
+        Retorna:
+            pandas.DataFrame: ``pontos`` (sem geometria) seguido de uma coluna por banda
+        """
+        from pyproj import Transformer
+
+        if hasattr(pontos, 'geometry') and hasattr(pontos, 'crs'):
+            geo = pontos.to_crs(self.crs) if pontos.crs and self.crs and pontos.crs != self.crs else pontos
+            xs, ys = geo.geometry.x.to_numpy(), geo.geometry.y.to_numpy()
+            tabela = pd.DataFrame(pontos.drop(columns=pontos.geometry.name))
+        else:
+            xs = pd.to_numeric(pontos[x], errors='coerce').to_numpy(dtype=np.float64)
+            ys = pd.to_numeric(pontos[y], errors='coerce').to_numpy(dtype=np.float64)
+            if crs is not None and self.crs is not None:
+                xs, ys = Transformer.from_crs(crs, self.crs.to_wkt(), always_xy=True).transform(xs, ys)
+            tabela = pd.DataFrame(pontos)
+        with stage("amostragem", arquivo=self.destino, pontos=len(tabela)):
+            valores = self.sample(xs, ys)
+        return pd.concat([tabela.reset_index(drop=True), valores], axis=1)
+
+    def sample_csv(self, csv_path: str, x: str = 'longitude', y: str = 'latitude', crs="EPSG:4326"):
+        """
+        Amostra a pilha nos pontos de um CSV (encoding e separador detectados
+        como em dms.py; padrão: colunas latitude/longitude de generate_kml_points.py).
+
+        Retorna:
+            pandas.DataFrame: colunas do CSV seguidas de uma coluna por banda
+        """
+        from geoproc.dms import detectar_csv
+
+        encoding, sep = detectar_csv(csv_path)
+        pontos = pd.read_csv(csv_path, sep=sep, encoding=encoding)
+        pontos.columns = pontos.columns.str.strip()
+        return self.sample_points(pontos, x=x, y=y, crs=crs)
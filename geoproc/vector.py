@@ -0,0 +1,564 @@
+# ================================================================
+# Script: vector.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Operações sobre camadas vetoriais: união em fluxo de várias
+#            camadas com esquema comum (merge_layers; merge_frames para
+#            camadas já em memória), filtro por valores de um campo com
+#            exportação única e individual (filter_export) e reprojeção
+#            em lotes com gravação atômica e zona UTM automática
+#            (reproject_layer, reproject_folder).
+# Linguagem: Python
+# Dependências: pyogrio, geopandas, pyproj, pyarrow (opcional)
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import glob
+import math
+import importlib.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import pyogrio
+from pyproj import CRS
+from geoproc.instrument import stage, traced
+
+# --------------------
+# PARÂMETROS
+# --------------------
+EXTENSOES = {'GPKG': '.gpkg', 'FlatGeobuf': '.fgb', 'ESRI Shapefile': '.shp'}
+# arquivos que acompanham o .shp (removidos com ele ao substituir a saída)
+AUXILIARES_SHP = ('.shx', '.dbf', '.prj', '.cpg', '.qix', '.sbn', '.sbx', '.sidx.npz')
+TIPOS_NUMERICOS = {'bool', 'int8', 'int16', 'int32', 'int64', 'float32', 'float64'}
+
+
+# --------------------
+# ESQUEMA COMUM
+# --------------------
+def promover_tipo(a: str, b: str) -> str:
+    """Tipo comum a dois campos: numéricos viram float64; conflitos viram texto (object)."""
+    if a == b:
+        return a
+    if a in TIPOS_NUMERICOS and b in TIPOS_NUMERICOS:
+        return 'float64'
+    return 'object'
+
+
+def unir_esquemas(infos: list) -> dict:
+    """União dos campos (na ordem de aparição) a partir dos metadados das camadas."""
+    esquema = {}
+    for info in infos:
+        for campo, tipo in zip(info['fields'], info['dtypes']):
+            esquema[campo] = promover_tipo(esquema[campo], tipo) if campo in esquema else tipo
+    # campos ausentes em alguma camada precisam aceitar nulos
+    for campo, tipo in esquema.items():
+        if any(campo not in info['fields'] for info in infos):
+            if tipo.startswith(('int', 'bool')):
+                esquema[campo] = 'float64'
+    esquema['source_file'] = 'object'
+    return esquema
+
+
+def tipo_geometria(infos: list):
+    """Tipo de geometria comum e se é necessário promover para Multi*."""
+    tipos = {info['geometry_type'] for info in infos}
+    z = any(t.endswith(' Z') for t in tipos)
+    bases = {t.replace(' Z', '').replace('Multi', '') for t in tipos}
+    if len(bases) != 1:
+        return 'Unknown', False
+    base = bases.pop()
+    multi = any(t.startswith('Multi') for t in tipos) or base in ('Polygon', 'LineString')
+    nome = f"Multi{base}" if multi else base
+    return nome + (' Z' if z else ''), multi
+
+
+@lru_cache(maxsize=None)
+def mesmo_crs(crs_a: str, crs_b: str) -> bool:
+    """Compara dois CRS (texto dos metadados) uma única vez por par distinto."""
+    if crs_a is None or crs_b is None:
+        return True
+    return CRS.from_user_input(crs_a) == CRS.from_user_input(crs_b)
+
+
+def ajustar_lote(gdf, esquema: dict, nome_arquivo: str):
+    """Reordena/completa as colunas do lote conforme o esquema comum."""
+    gdf["source_file"] = nome_arquivo
+    for campo, tipo in esquema.items():
+        if campo not in gdf.columns:
+            gdf[campo] = None
+        if str(gdf[campo].dtype) != tipo:
+            gdf[campo] = gdf[campo].astype(tipo)
+    return gdf[list(esquema) + [gdf.geometry.name]]
+
+
+# --------------------
+# UNIÃO EM FLUXO
+# --------------------
+@traced("merge_layers")
+def merge_layers(paths: list, out_path: str, driver: str = 'GPKG', lote_feicoes: int = 100_000,
+                 n_workers: int = None, usar_arrow: bool = None,
+                 layer: str = "shapefile_unificado") -> int:
+    """
+    Une várias camadas em um único arquivo vetorial, camada a camada e em
+    lotes reprojetados para o CRS da primeira, com a coluna "source_file".
+
+    O esquema comum é calculado apenas pelos metadados; a leitura e a
+    reprojeção dos lotes rodam em paralelo, e a gravação segue sempre a
+    ordem da execução serial.
+
+    Parâmetros:
+        paths (list): camadas de entrada, na ordem de gravação
+        out_path (str): arquivo de saída (substituído se existir)
+        driver (str): 'GPKG', 'FlatGeobuf' ou 'ESRI Shapefile'
+        lote_feicoes (int): feições lidas, reprojetadas e gravadas por vez
+        n_workers (int): lotes lidos/reprojetados simultaneamente (1 = serial)
+        usar_arrow (bool): leitura via Arrow (padrão: se o pyarrow estiver instalado)
+        layer (str): nome da camada de saída (no shapefile, sempre o nome do arquivo)
+
+    Retorna:
+        int: número de feições gravadas
+    """
+    n_workers = n_workers or os.cpu_count() or 4
+    if driver == 'ESRI Shapefile':
+        # a camada de um shapefile é o próprio arquivo: outro nome criaria um .shp paralelo
+        layer = os.path.splitext(os.path.basename(out_path))[0]
+    if usar_arrow is None:
+        usar_arrow = importlib.util.find_spec("pyarrow") is not None
+
+    with stage("esquema", camadas=len(paths)):
+        infos = [pyogrio.read_info(path) for path in paths]
+        esquema = unir_esquemas(infos)
+        geometry_type, promover_multi = tipo_geometria(infos)
+
+    # Garante mesmo CRS (o da primeira camada)
+    crs_ref = infos[0]['crs']
+    total = sum(info['features'] for info in infos)
+    print(f"→ {total} feições | {len(esquema)} campos | geometria: {geometry_type} | CRS: {crs_ref}")
+
+    # apenas a saída anterior (e, no shapefile, seus arquivos auxiliares), nunca outros arquivos de mesmo nome
+    anteriores = [out_path]
+    if driver == 'ESRI Shapefile':
+        anteriores += [os.path.splitext(out_path)[0] + sufixo for sufixo in AUXILIARES_SHP]
+    for arquivo in anteriores:
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+
+    def ler_lote(tarefa):
+        """Lê, reprojeta (se necessário) e ajusta um lote de feições de uma camada."""
+        path, inicio, reprojetar = tarefa
+        with stage("leitura", arquivo=path, inicio=inicio):
+            gdf = pyogrio.read_dataframe(
+                path, skip_features=inicio, max_features=lote_feicoes, use_arrow=usar_arrow
+            )
+        if reprojetar:
+            with stage("reprojecao", arquivo=path, inicio=inicio):
+                gdf = gdf.to_crs(crs_ref)
+        return ajustar_lote(gdf, esquema, os.path.basename(path))
+
+    # Lotes na ordem camada → posição; cada camada compara seu CRS uma única vez
+    tarefas = [
+        (path, inicio, not mesmo_crs(info['crs'], crs_ref))
+        for path, info in zip(paths, infos)
+        for inicio in range(0, info['features'], lote_feicoes)
+    ]
+    ultimo_lote = {path: inicio for path, inicio, _ in tarefas}
+    n_feicoes = {path: info['features'] for path, info in zip(paths, infos)}
+
+    gravadas = 0
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        # no máximo 2 lotes por worker em memória; gravação sempre na ordem das tarefas
+        pendentes = deque()
+        fila = iter(tarefas)
+        for tarefa in fila:
+            pendentes.append((tarefa, executor.submit(ler_lote, tarefa)))
+            if len(pendentes) >= 2 * n_workers:
+                break
+        while pendentes:
+            (path, inicio, _), futuro = pendentes.popleft()
+            proxima = next(fila, None)
+            if proxima is not None:
+                pendentes.append((proxima, executor.submit(ler_lote, proxima)))
+
+            gdf = futuro.result()
+            with stage("gravacao", arquivo=path, inicio=inicio, feicoes=len(gdf)):
+                pyogrio.write_dataframe(
+                    gdf, out_path, driver=driver, layer=layer,
+                    geometry_type=geometry_type, promote_to_multi=promover_multi,
+                    append=gravadas > 0,
+                )
+            gravadas += len(gdf)
+            if inicio == ultimo_lote[path]:
+                print(f"✅ {os.path.basename(path)}: {n_feicoes[path]} feições")
+
+    if gravadas:
+        no_arquivo = pyogrio.read_info(out_path, layer=layer)['features']
+        if no_arquivo != gravadas:
+            raise RuntimeError(f"{out_path} tem {no_arquivo} feições na camada '{layer}'; "
+                               f"esperadas {gravadas}.")
+    return gravadas
+
+
+def merge_frames(camadas: list):
+    """
+    Une camadas já carregadas em memória, com o mesmo esquema comum e a
+    coluna "source_file" de ``merge_layers``, no CRS da primeira camada.
+
+    Parâmetros:
+        camadas (list): pares (nome, GeoDataFrame); os GeoDataFrames não são alterados
+
+    Retorna:
+        geopandas.GeoDataFrame: feições de todas as camadas, na ordem da lista
+    """
+    import geopandas as gpd
+    import pandas as pd
+
+    infos = [
+        {'fields': [c for c in gdf.columns if c != gdf.geometry.name],
+         'dtypes': [str(gdf[c].dtype) for c in gdf.columns if c != gdf.geometry.name]}
+        for _, gdf in camadas
+    ]
+    esquema = unir_esquemas(infos)
+    crs_ref = camadas[0][1].crs
+    partes = []
+    for nome, gdf in camadas:
+        if crs_ref is not None and gdf.crs is not None and gdf.crs != crs_ref:
+            gdf = gdf.to_crs(crs_ref)
+        parte = ajustar_lote(gdf.copy(deep=False), esquema, nome)
+        if parte.geometry.name != 'geometry':
+            parte = parte.rename_geometry('geometry')
+        partes.append(parte)
+    return gpd.GeoDataFrame(pd.concat(partes, ignore_index=True), geometry='geometry', crs=crs_ref)
+
+
+# --------------------
+# FILTRO E EXPORTAÇÃO
+# --------------------
+def converter_valor(valor, campo: str, tipo: str):
+    """
+    Converte um valor informado (p. ex. texto da linha de comando) para o tipo
+    do campo ('int…', 'float…', 'bool' ou texto), como em ``pyogrio.read_info``
+    ou ``str(gdf[campo].dtype)``. Levanta ValueError se for incompatível.
+    """
+    if tipo == 'bool':
+        if str(valor).strip().lower() not in ('true', 'false', '1', '0'):
+            raise ValueError(f"Valor '{valor}' inválido para o campo lógico '{campo}'.")
+        return str(valor).strip().lower() in ('true', '1')
+    if tipo.startswith(('int', 'uint', 'float')):
+        try:
+            numero = float(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"Valor '{valor}' inválido para o campo numérico '{campo}' ({tipo}).") from None
+        if not math.isfinite(numero) or (not tipo.startswith('float') and not numero.is_integer()):
+            raise ValueError(f"Valor '{valor}' inválido para o campo numérico '{campo}' ({tipo}).")
+        return numero if tipo.startswith('float') else int(numero)
+    return str(valor)
+
+
+def _literal_sql(valor, campo: str, tipo: str) -> str:
+    """Valor como literal SQL do tipo do campo (números validados, texto entre aspas)."""
+    valor = converter_valor(valor, campo, tipo)
+    if isinstance(valor, bool):
+        return '1' if valor else '0'
+    if isinstance(valor, (int, float)):
+        return repr(valor)
+    return "'" + valor.replace("'", "''") + "'"
+
+
+def montar_where(campo: str, valores: list, tipo: str) -> str:
+    """
+    Monta a cláusula WHERE (SQL do OGR) para 'campo IN (valores)', com os
+    valores convertidos para o tipo do campo (ValueError se incompatíveis).
+    """
+    if not valores:
+        raise ValueError("A lista de valores está vazia.")
+    lista = ", ".join(_literal_sql(v, campo, tipo) for v in valores)
+    return f'"{campo}" IN ({lista})'
+
+
+def filter_features(path: str, campo: str, valores: list):
+    """
+    Lê apenas as feições cujo ``campo`` está em ``valores`` (filtro aplicado na leitura).
+
+    Retorna:
+        geopandas.GeoDataFrame: feições filtradas
+    """
+    info = pyogrio.read_info(path)
+    campos = list(info['fields'])
+    if campo not in campos:
+        raise ValueError(f"O campo '{campo}' não existe no shapefile. Colunas disponíveis: {campos}")
+    if not valores:
+        # 'IN ()' é SQL inválido: nenhuma feição, com o esquema da camada
+        print("→ Nenhum valor informado: 0 feições selecionadas")
+        return pyogrio.read_dataframe(path, max_features=1).iloc[:0]
+
+    where = montar_where(campo, valores, info['dtypes'][campos.index(campo)])
+    filtro = pyogrio.read_dataframe(path, where=where)
+    print(f"→ {len(filtro)} de {info['features']} feições atendem ao filtro ({where})")
+    return filtro
+
+
+@traced("filter_export", arquivo="path")
+def filter_export(path: str, campo: str, valores: list, output_folder: str,
+                  modo_individual: str = 'shapefile', n_workers: int = None) -> dict:
+    """
+    Filtra as feições pelos valores de um campo e exporta um shapefile único
+    (feicoes_filtradas.shp) e uma saída individual por valor.
+
+    Parâmetros:
+        path (str): camada de entrada
+        campo (str): campo de identificação
+        valores (list): valores desejados (a ordem é mantida na exportação)
+        output_folder (str): pasta de saída
+        modo_individual (str): 'shapefile' (um .shp por valor) ou 'gpkg'
+            (uma camada por valor em feicoes_individuais.gpkg)
+        n_workers (int): gravações simultâneas de shapefiles individuais
+
+    Retorna:
+        dict: {valor: caminho (ou camada) exportado}
+    """
+    if modo_individual not in ('shapefile', 'gpkg'):
+        raise ValueError(f"modo_individual inválido: '{modo_individual}'. Use 'shapefile' ou 'gpkg'.")
+    os.makedirs(output_folder, exist_ok=True)
+
+    filtro = filter_features(path, campo, valores)
+    if filtro.empty:
+        raise ValueError("Nenhuma feição encontrada com os valores informados.")
+
+    output_path = os.path.join(output_folder, "feicoes_filtradas.shp")
+    pyogrio.write_dataframe(filtro, output_path)
+    print(f"✅ Shapefile com feições filtradas salvo em: {output_path}")
+
+    # uma passagem groupby, mantendo a ordem de valores
+    particoes = dict(tuple(filtro.groupby(campo, sort=False)))
+    tipo = str(filtro[campo].dtype)
+    grupos = {}
+    for valor in valores:
+        # mesma conversão da cláusula WHERE ('11' → 11 em campos inteiros)
+        chave = converter_valor(valor, campo, tipo)
+        if chave in particoes:
+            grupos[valor] = particoes[chave]
+        else:
+            print(f"⚠️ Valor '{valor}' não encontrado no campo '{campo}'.")
+
+    exportados = {}
+    if modo_individual == 'gpkg':
+        # um único arquivo; as camadas são gravadas em sequência (SQLite não aceita escrita concorrente)
+        gpkg_path = os.path.join(output_folder, "feicoes_individuais.gpkg")
+        if os.path.exists(gpkg_path):
+            os.remove(gpkg_path)
+        for valor, filtro_valor in grupos.items():
+            pyogrio.write_dataframe(filtro_valor, gpkg_path, layer=str(valor), driver="GPKG")
+            exportados[valor] = f"{gpkg_path}|{valor}"
+        print(f"✅ {len(grupos)} camadas exportadas em: {gpkg_path}")
+    else:
+        def exportar(item):
+            valor, filtro_valor = item
+            destino = os.path.join(output_folder, f"{valor}.shp")
+            pyogrio.write_dataframe(filtro_valor, destino)
+            return valor, destino
+
+        with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count() or 4) as executor:
+            for valor, destino in executor.map(exportar, grupos.items()):
+                exportados[valor] = destino
+                print(f"✅ {os.path.basename(destino)} exportado")
+    return exportados
+
+
+# --------------------
+# REPROJEÇÃO
+# --------------------
+@lru_cache(maxsize=None)
+def transformer_para(crs_origem: str, crs_destino: str):
+    """Transformer criado uma única vez por par de CRS (texto WKT/código)."""
+    from pyproj import Transformer
+
+    return Transformer.from_crs(CRS.from_user_input(crs_origem), CRS.from_user_input(crs_destino),
+                                always_xy=True)
+
+
+def utm_da_extensao(bounds, crs, nome: str = "camada") -> str:
+    """
+    CRS WGS 84 / UTM (EPSG:326xx ao norte, 327xx ao sul) do centro de uma
+    extensão (xmin, ymin, xmax, ymax) dada no CRS ``crs``.
+    """
+    if not crs:
+        raise ValueError(f"A camada não tem CRS definido: {nome}")
+    crs = crs if isinstance(crs, str) else CRS.from_user_input(crs).to_wkt()
+    oeste, sul, leste, norte = transformer_para(crs, "EPSG:4326").transform_bounds(*bounds)
+    lon, lat = (oeste + leste) / 2, (sul + norte) / 2
+    zona = min(int((lon + 180) // 6) + 1, 60)
+    if leste - oeste > 6:
+        print(f"⚠️ {nome} abrange mais de uma zona UTM; usando a do centro ({zona}).")
+    return f"EPSG:{(32600 if lat >= 0 else 32700) + zona}"
+
+
+def zona_utm(path: str, layer: str = None) -> str:
+    """Zona UTM do centro da extensão da camada, lida apenas dos metadados."""
+    info = pyogrio.read_info(path, layer=layer, force_total_bounds=True)
+    return utm_da_extensao(info['total_bounds'], info['crs'], os.path.basename(path))
+
+
+def transformar_geometrias(geoms, transformer):
+    """Aplica o Transformer às coordenadas (vetorizado); Z é mantido como está."""
+    import shapely
+
+    z = bool(shapely.has_z(geoms).any())
+    return shapely.transform(
+        geoms, lambda x, y, *resto: (*transformer.transform(x, y), *resto),
+        include_z=z, interleaved=False,
+    )
+
+
+def _substituir(tmp_path: str, out_path: str):
+    """Move o arquivo temporário (e os arquivos auxiliares do shapefile) para o destino."""
+    base_tmp, ext = os.path.splitext(tmp_path)
+    base_out = os.path.splitext(out_path)[0]
+    auxiliares = [a for a in glob.glob(glob.escape(base_tmp) + ".*") if a != tmp_path]
+    # índices espaciais do arquivo antigo ficariam inválidos
+    for sufixo in (".qix", ".sbn", ".sbx", ".sidx.npz"):
+        if os.path.exists(base_out + sufixo):
+            os.remove(base_out + sufixo)
+    for aux in auxiliares:
+        os.replace(aux, base_out + aux[len(base_tmp):])
+    os.replace(tmp_path, out_path)  # o arquivo principal por último
+
+
+@traced("reproject_layer", arquivo="path")
+def reproject_layer(path: str, crs="utm", out_path: str = None, lote_feicoes: int = 100_000,
+                    n_workers: int = None, usar_arrow: bool = None, layer: str = None) -> tuple:
+    """
+    Reprojeta uma camada vetorial em lotes, sem carregá-la inteira na memória.
+
+    Cada lote é lido, transformado por um único Transformer (em cache) e
+    acrescentado a um arquivo temporário na pasta de destino, que só
+    substitui a saída (por renomeação) quando a gravação termina: uma
+    falha no meio do processo não corrompe a camada original. Em arquivos
+    com várias camadas (GeoPackage), todas são reprojetadas para o
+    arquivo temporário, de modo que a substituição não perde nenhuma.
+
+    Parâmetros:
+        path (str): camada de entrada
+        crs: CRS de destino; 'utm' escolhe a zona WGS 84 / UTM pelo centro da
+            extensão (de cada camada)
+        out_path (str): arquivo de saída (padrão: substitui a entrada)
+        lote_feicoes (int): feições lidas, transformadas e gravadas por vez
+        n_workers (int): lotes lidos/transformados simultaneamente (1 = serial)
+        usar_arrow (bool): leitura via Arrow (padrão: se o pyarrow estiver instalado)
+        layer (str): reprojeta só esta camada (exige ``out_path`` se o arquivo tiver
+            outras camadas; padrão: todas)
+
+    Retorna:
+        tuple: (caminho gravado, CRS de destino; zonas distintas separadas por vírgula)
+    """
+    n_workers = n_workers or min(4, os.cpu_count() or 1)
+    if usar_arrow is None:
+        usar_arrow = importlib.util.find_spec("pyarrow") is not None
+    out_path = out_path or path
+
+    todas = [nome for nome, _ in pyogrio.list_layers(path)]
+    camadas = [layer] if layer else todas
+    if layer and layer not in todas:
+        raise ValueError(f"A camada '{layer}' não existe em {path}. Camadas: {todas}")
+    if layer and len(todas) > 1 and os.path.abspath(out_path) == os.path.abspath(path):
+        raise ValueError(f"{path} tem outras camadas além de '{layer}': informe out_path "
+                         "(ou reprojete o arquivo inteiro, sem layer).")
+    base, ext = os.path.splitext(out_path)
+    if ext.lower() == '.shp' and len(camadas) > 1:
+        raise ValueError(f"{path} tem {len(camadas)} camadas; um shapefile guarda só uma (use layer).")
+    tmp_path = os.path.join(os.path.dirname(os.path.abspath(out_path)),
+                            f".{os.path.basename(base)}.tmp-{os.getpid()}{ext}")
+
+    destinos = []
+    try:
+        for nome in camadas:
+            destinos.append(_reprojetar_camada(path, nome, crs, tmp_path, ext.lower() == '.shp',
+                                               lote_feicoes, n_workers, usar_arrow))
+        _substituir(tmp_path, out_path)
+    except BaseException:
+        for arquivo in glob.glob(glob.escape(os.path.splitext(tmp_path)[0]) + ".*"):
+            os.remove(arquivo)
+        raise
+    return out_path, ", ".join(dict.fromkeys(destinos))
+
+
+def _reprojetar_camada(path, layer, crs, tmp_path, saida_shp, lote_feicoes, n_workers, usar_arrow):
+    """Reprojeta uma camada de ``path`` em lotes, acrescentando-a ao arquivo temporário."""
+    import geopandas as gpd
+
+    info = pyogrio.read_info(path, layer=layer, force_feature_count=True)
+    if not info['crs']:
+        raise ValueError(f"A camada não tem CRS definido: {path} ({layer})")
+    if isinstance(crs, str) and crs.lower() == 'utm':
+        crs = zona_utm(path, layer)
+    crs_destino = CRS.from_user_input(crs)
+    transformer = transformer_para(info['crs'], crs_destino.to_wkt())
+    # no shapefile a camada é o próprio arquivo (nome temporário)
+    layer_saida = None if saida_shp else layer
+
+    def ler_lote(inicio):
+        with stage("leitura", arquivo=path, camada=layer, inicio=inicio):
+            gdf = pyogrio.read_dataframe(path, layer=layer, skip_features=inicio, max_features=lote_feicoes,
+                                         use_arrow=usar_arrow)
+        with stage("reprojecao", arquivo=path, camada=layer, inicio=inicio):
+            geoms = transformar_geometrias(gdf.geometry.values, transformer)
+        return gpd.GeoDataFrame(gdf.drop(columns=gdf.geometry.name), geometry=geoms, crs=crs_destino)
+
+    # ao menos um lote, para que camadas vazias também sejam gravadas
+    inicios = iter(range(0, max(info['features'], 1), lote_feicoes))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        # no máximo 2 lotes por worker em memória; gravação na ordem dos lotes
+        pendentes = deque(executor.submit(ler_lote, i) for _, i in zip(range(2 * n_workers), inicios))
+        gravadas = 0
+        while pendentes:
+            gdf = pendentes.popleft().result()
+            proximo = next(inicios, None)
+            if proximo is not None:
+                pendentes.append(executor.submit(ler_lote, proximo))
+            # mesmo tipo de geometria declarado na camada original
+            with stage("gravacao", arquivo=path, camada=layer, feicoes=len(gdf)):
+                pyogrio.write_dataframe(gdf, tmp_path, layer=layer_saida, geometry_type=info['geometry_type'],
+                                        append=gravadas > 0)
+            gravadas += max(len(gdf), 1)
+    return crs_destino.to_string()
+
+
+@traced("reproject_folder", arquivo="pasta")
+def reproject_folder(pasta: str, crs="utm", pasta_saida: str = None, n_workers: int = None,
+                     lote_feicoes: int = 100_000) -> dict:
+    """
+    Reprojeta todas as camadas (.shp, .gpkg, .fgb) de uma pasta, em paralelo.
+    Com crs='utm', a zona é escolhida separadamente para cada camada.
+
+    Parâmetros:
+        pasta (str): pasta com as camadas
+        crs: CRS de destino ou 'utm'
+        pasta_saida (str): pasta de saída (padrão: substitui cada camada)
+        n_workers (int): camadas processadas simultaneamente
+        lote_feicoes (int): feições por lote
+
+    Retorna:
+        dict: 'camadas' ({entrada: (saída, CRS)}) e 'falhas' ([(arquivo, erro)])
+    """
+    camadas = sorted(p for ext in EXTENSOES.values() for p in glob.glob(os.path.join(pasta, f"*{ext}"))
+                     if not os.path.basename(p).startswith('.'))
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+
+    def reprojetar(path):
+        destino = os.path.join(pasta_saida, os.path.basename(path)) if pasta_saida else None
+        # um lote por vez em cada camada: o paralelismo fica entre as camadas
+        return reproject_layer(path, crs, destino, lote_feicoes=lote_feicoes, n_workers=1)
+
+    saida = {'camadas': {}, 'falhas': []}
+    with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count() or 4) as executor:
+        futuros = [(path, executor.submit(reprojetar, path)) for path in camadas]
+        for path, futuro in futuros:
+            nome = os.path.basename(path)
+            try:
+                saida['camadas'][path] = futuro.result()
+            except Exception as e:
+                saida['falhas'].append((nome, str(e)))
+                print(f"❌ {nome}: {e}")
+                continue
+            print(f"✅ {nome} → {saida['camadas'][path][1]}")
+    return saida
@@ -0,0 +1,179 @@
+# ================================================================
+# Script: zonal.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Estatísticas zonais entre todos os shapefiles de uma pasta
+#            e todos os rasters (.tif) de outra, com cache de resultados
+#            por par (result_cache.py), gravação incremental
+#            (result_sink.py) e exportação opcional para Excel. Com
+#            min_pixels_poligono, lê os overviews dos rasters em vez da
+#            resolução original (estatísticas aproximadas).
+# Linguagem: Python
+# Dependências: geopandas, rasterio, numpy, pandas, tqdm, pyarrow, openpyxl
+# Data: 2026-10-18
+# ================================================================
+
+import os
+from collections import Counter
+import geopandas as gpd
+from tqdm import tqdm
+from geoproc.instrument import stage, traced
+from geoproc.result_cache import ResultCache, cache_key, file_fingerprint
+from geoproc.result_sink import ResultSink, export_excel
+from geoproc.zonal_engine import zonal_stats_batch
+
+# --------------------
+# PARÂMETROS
+# --------------------
+STATS_PADRAO = ['mean', 'median', 'min', 'max']
+COLUNAS_SAIDA = ['shapefile', 'raster', 'polygon_id', 'min', 'max', 'mean', 'median']
+
+
+# --------------------
+# LEITURA SOB DEMANDA DOS SHAPEFILES
+# --------------------
+def ler_camadas(shp_folder, pendentes):
+    """Lê cada shapefile com pares pendentes apenas quando o motor chega nele."""
+    for shp_file, rasters in pendentes.items():
+        if rasters:
+            with stage("leitura", arquivo=shp_file) as info:
+                gdf = gpd.read_file(os.path.join(shp_folder, shp_file))
+                info['feicoes'] = len(gdf)
+            yield shp_file, gdf, rasters
+
+
+# --------------------
+# ESTATÍSTICAS ZONAIS POR PASTA
+# --------------------
+@traced("zonal_stats_folders")
+def zonal_stats_folders(shp_folder, tif_folder, output_path=None, stats=None, n_workers=1,
+                        formato_saida='parquet', usar_cache=True, cache_dir=None,
+                        cache_modo='mtime', cache_max_gb=2, exportar_excel=False, progresso=True,
+                        min_pixels_poligono=None, gerar_overviews=False):
+    """
+    Calcula as estatísticas zonais de todos os pares shapefile × raster.
+
+    Parâmetros:
+        shp_folder (str): pasta com os shapefiles (.shp)
+        tif_folder (str): pasta com os rasters (.tif)
+        output_path (str): arquivo de resultados (padrão: estatisticas_zonais.<formato>
+            na pasta acima de ``shp_folder``)
+        stats (list): estatísticas calculadas (padrão: média, mediana, mínimo, máximo)
+        n_workers (int): processos (1 = serial; None = todos os núcleos)
+        formato_saida (str): 'parquet', 'feather' ou 'csv'
+        usar_cache (bool): reaproveita pares já calculados
+        cache_dir (str): pasta do cache (padrão: '.cache_zonal' ao lado da saída)
+        cache_modo (str): 'mtime' (tamanho + data de modificação) ou 'hash' (conteúdo)
+        cache_max_gb (float): tamanho máximo do cache
+        exportar_excel (bool): exporta também para .xlsx ao final
+        progresso (bool): exibe a barra de progresso
+        min_pixels_poligono (float): lê o overview mais grosseiro em que o menor
+            polígono ainda cobre esse número de pixels (None = resolução original)
+        gerar_overviews (bool): gera overviews internos (average) nos rasters que
+            não os têm, antes do cálculo
+
+    Retorna:
+        str: caminho do arquivo de resultados
+    """
+    stats = list(stats or STATS_PADRAO)
+    shp_files = [f for f in os.listdir(shp_folder) if f.endswith('.shp')]
+    tif_files = [f for f in os.listdir(tif_folder) if f.endswith('.tif')]
+    tif_paths = [os.path.join(tif_folder, f) for f in tif_files]
+
+    if gerar_overviews:
+        from geoproc.raster import build_overviews
+
+        for tif_path in tif_paths:
+            build_overviews(tif_path)
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(shp_folder), f'estatisticas_zonais.{formato_saida}')
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+
+    # --------------------
+    # PARES JÁ CALCULADOS (CACHE)
+    # --------------------
+    chaves, pendentes = {}, {}
+    cache = None
+    with stage("cache_consulta", modo=cache_modo if usar_cache else None):
+        if usar_cache:
+            cache = ResultCache(cache_dir or os.path.join(output_dir, '.cache_zonal'),
+                                max_bytes=int(cache_max_gb * 1024 ** 3))
+            impressoes_tif = {f: file_fingerprint(p, cache_modo) for f, p in zip(tif_files, tif_paths)}
+        for shp_file in shp_files:
+            if cache is not None:
+                impressao_shp = file_fingerprint(os.path.join(shp_folder, shp_file), cache_modo)
+                for tif_file in tif_files:
+                    chaves[shp_file, tif_file] = cache_key(
+                        impressao_shp, impressoes_tif[tif_file], stats=sorted(stats), band=1,
+                        **({'min_pixels': min_pixels_poligono, 'overview_por': 'menor_poligono'}
+                           if min_pixels_poligono else {})
+                    )
+            pendentes[shp_file] = [
+                p for f, p in zip(tif_files, tif_paths)
+                if cache is None or chaves[shp_file, f] not in cache
+            ]
+    n_pendentes = sum(len(v) for v in pendentes.values())
+    print(f"Pares a calcular: {n_pendentes} de {len(shp_files) * len(tif_files)}")
+
+    # --------------------
+    # LOOP PRINCIPAL: PROCESSA TODOS OS PARES SHAPEFILE × RASTER
+    # --------------------
+    sink = ResultSink(output_path, formato=formato_saida)
+    # o motor devolve os pares pendentes na mesma ordem shapefile × raster
+    calculados = zonal_stats_batch(
+        ler_camadas(shp_folder, pendentes),
+        tif_paths,
+        stats=stats,
+        n_workers=n_workers,
+        min_pixels=min_pixels_poligono,
+    )
+    fatores = Counter()
+    barra = tqdm(total=len(shp_files) * len(tif_files), disable=not progresso,
+                 desc="Estatísticas zonais (shapefile × raster)")
+    with sink, barra:
+        for shp_file in shp_files:
+            for tif_file, tif_path in zip(tif_files, tif_paths):
+                chave = chaves.get((shp_file, tif_file))
+                if tif_path in pendentes[shp_file]:
+                    _, _, temp_df = next(calculados)
+                    fatores[temp_df.attrs.get('fator_overview', 1)] += 1
+                    if cache is not None:
+                        with stage("cache_gravacao", arquivo=shp_file, raster=tif_file):
+                            cache.put(chave, temp_df)  # grava já, para retomar se interrompido
+                else:
+                    with stage("cache_leitura", arquivo=shp_file, raster=tif_file):
+                        temp_df = cache.get(chave)
+
+                # Identificação do par shapefile × raster
+                temp_df['shapefile'] = shp_file
+                temp_df['raster'] = tif_file
+                temp_df['polygon_id'] = range(1, len(temp_df) + 1)
+
+                # Acrescenta ao arquivo de resultados
+                with stage("gravacao", arquivo=shp_file, raster=tif_file, linhas=len(temp_df)):
+                    sink.write(temp_df[[c for c in COLUNAS_SAIDA if c in temp_df.columns]])
+                barra.update()
+
+    if min_pixels_poligono and fatores:
+        resumo = ", ".join(f"{n} em 1/{f}" if f > 1 else f"{n} na resolução original"
+                           for f, n in sorted(fatores.items()))
+        print(f"Resolução lida (pares calculados): {resumo}")
+
+    if cache is not None:
+        removidas = cache.evict()
+        if removidas:
+            print(f"Cache: {removidas} entrada(s) antiga(s) removida(s).")
+
+    if sink.linhas == 0:
+        raise RuntimeError("Nenhum resultado gerado: verifique as pastas de shapefiles e rasters.")
+    print(f"Processo concluído! {sink.linhas} linhas salvas em: {output_path}")
+
+    # --------------------
+    # EXPORTAÇÃO OPCIONAL PARA EXCEL
+    # --------------------
+    if exportar_excel:
+        xlsx_path = os.path.splitext(output_path)[0] + '.xlsx'
+        with stage("excel", arquivo=xlsx_path):
+            n_abas = export_excel(output_path, xlsx_path)
+        print(f"Planilha Excel salva em: {xlsx_path} ({n_abas} aba(s))")
+    return output_path
@@ -0,0 +1,532 @@
+# ================================================================
+# Script: zonal_engine.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Motor de estatísticas zonais em passagem única. Rasteriza
+#            cada camada de polígonos uma só vez por grade raster
+#            distinta (array de rótulos em cache) e calcula mínimo,
+#            máximo, média e mediana de todas as zonas com reduções
+#            vetorizadas do NumPy, lendo o raster em faixas alinhadas
+#            aos blocos internos do GeoTIFF. As faixas podem ser
+#            distribuídas entre processos (resultado idêntico ao serial).
+#            Com min_pixels, lê o overview mais grosseiro em que o
+#            menor polígono ainda cobre esse número de pixels
+#            (estatísticas aproximadas, com E/S muito menor).
+# Linguagem: Python
+# Dependências: geopandas, rasterio, shapely, numpy, pandas
+# Data: 2026-10-18
+# ================================================================
+
+import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import rasterio
+import shapely
+from rasterio import features
+from rasterio.windows import Window, from_bounds
+from rasterio.windows import transform as window_transform
+from geoproc.instrument import stage
+
+# --------------------
+# PARÂMETROS
+# --------------------
+STATS_SUPORTADAS = ('min', 'max', 'mean', 'median')
+MAX_PIXELS_FAIXA = 4_194_304  # pixels lidos por faixa (~16 MB em float32)
+
+
+# --------------------
+# GRADE E RÓTULOS
+# --------------------
+def grid_key(src):
+    """
+    Identifica a grade de um raster aberto. Rasters com a mesma chave
+    (CRS, transformação afim e dimensões) compartilham o mesmo array de rótulos.
+
+    Parâmetros:
+        src (rasterio.DatasetReader): raster aberto
+
+    Retorna:
+        tuple: chave imutável da grade
+    """
+    crs = src.crs.to_wkt() if src.crs else None
+    return (crs, tuple(src.transform)[:6], src.width, src.height)
+
+
+def _grupos_sem_sobreposicao(geoms):
+    """Separa as geometrias em grupos cujos interiores não se sobrepõem (coloração gulosa)."""
+    n = len(geoms)
+    validos = ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+    tree = shapely.STRtree(geoms)
+    a, b = tree.query(geoms, predicate='intersects')
+    sel = (a < b) & validos[a] & validos[b]
+    a, b = a[sel], b[sel]
+    if a.size:
+        # apenas interiores que se sobrepõem disputam os mesmos pixels
+        sobrepoe = shapely.relate_pattern(geoms[a], geoms[b], 'T********')
+        a, b = a[sobrepoe], b[sobrepoe]
+
+    indices = np.flatnonzero(validos)
+    if a.size == 0:
+        return [indices]
+
+    vizinhos = {}
+    for i, j in zip(a.tolist(), b.tolist()):
+        vizinhos.setdefault(i, []).append(j)
+        vizinhos.setdefault(j, []).append(i)
+
+    cor = np.zeros(n, dtype=np.int64)
+    for i in sorted(vizinhos):
+        usadas = {cor[j] for j in vizinhos[i] if j < i}
+        c = 0
+        while c in usadas:
+            c += 1
+        cor[i] = c
+
+    return [indices[cor[indices] == c] for c in range(int(cor.max()) + 1)]
+
+
+def build_labels(gdf, src, all_touched=False):
+    """
+    Rasteriza a camada de polígonos na grade do raster ``src``.
+
+    O array cobre apenas a janela que envolve a camada. O rótulo de cada
+    pixel é o índice da feição + 1 (0 = fora das zonas). Polígonos cujos
+    interiores se sobrepõem vão para arrays separados, de modo que cada
+    feição recebe todos os seus pixels, como na rasterização individual.
+
+    Parâmetros:
+        gdf (geopandas.GeoDataFrame): camada de polígonos
+        src (rasterio.DatasetReader): raster que define a grade
+        all_touched (bool): inclui todos os pixels tocados pelo polígono
+
+    Retorna:
+        tuple: (janela, lista de arrays int32) ou (None, []) se não houver interseção
+    """
+    if gdf.crs is not None and src.crs is not None and gdf.crs != src.crs:
+        with stage("reprojecao", feicoes=len(gdf)):
+            gdf = gdf.to_crs(src.crs)
+
+    geoms = np.asarray(gdf.geometry.array, dtype=object)
+    grupos = _grupos_sem_sobreposicao(geoms)
+    if sum(len(g) for g in grupos) == 0:
+        return None, []
+
+    xmin, ymin, xmax, ymax = shapely.total_bounds(geoms)
+    j = from_bounds(xmin, ymin, xmax, ymax, transform=src.transform)
+    # arredonda para fora (com 1 pixel de folga) e limita à extensão do raster
+    col0 = max(0, math.floor(j.col_off) - 1)
+    lin0 = max(0, math.floor(j.row_off) - 1)
+    col1 = min(src.width, math.ceil(j.col_off + j.width) + 1)
+    lin1 = min(src.height, math.ceil(j.row_off + j.height) + 1)
+    if col1 <= col0 or lin1 <= lin0:
+        return None, []
+
+    janela = Window(col0, lin0, col1 - col0, lin1 - lin0)
+    transf = window_transform(janela, src.transform)
+    rotulos = []
+    for idx in grupos:
+        arr = features.rasterize(
+            zip(geoms[idx], (idx + 1).tolist()),
+            out_shape=(janela.height, janela.width),
+            transform=transf,
+            fill=0,
+            dtype='int32',
+            all_touched=all_touched,
+        )
+        rotulos.append(arr)
+    return janela, rotulos
+
+
+# --------------------
+# OVERVIEWS (RESOLUÇÃO ADEQUADA AOS POLÍGONOS)
+# --------------------
+def _areas_na_grade(gdf, src, cache):
+    """Áreas dos polígonos no CRS do raster (guardadas no cache de rótulos da camada)."""
+    chave = ('areas', src.crs.to_wkt() if src.crs else None)
+    if cache is not None and chave in cache:
+        return cache[chave]
+    if gdf.crs is not None and src.crs is not None and gdf.crs != src.crs:
+        gdf = gdf.to_crs(src.crs)
+    areas = shapely.area(np.asarray(gdf.geometry.array, dtype=object))
+    areas = areas[np.isfinite(areas) & (areas > 0)]
+    if cache is not None:
+        cache[chave] = areas
+    return areas
+
+
+def escolher_overview(gdf, src, min_pixels, band=1, cache=None):
+    """
+    Escolhe o overview mais grosseiro em que o menor polígono da camada
+    ainda cobre ao menos ``min_pixels`` pixels: nenhuma zona fica abaixo do
+    limite (uma zona pequena na mediana ficaria com 0 ou 1 pixel).
+
+    Parâmetros:
+        gdf (geopandas.GeoDataFrame): camada de polígonos
+        src (rasterio.DatasetReader): raster em resolução original
+        min_pixels (float): pixels por polígono exigidos
+        band (int): banda cujos overviews são considerados
+        cache (dict): cache da camada (guarda as áreas por CRS)
+
+    Retorna:
+        tuple: (nível do overview ou None para a resolução original, fator de redução)
+    """
+    fatores = src.overviews(band)
+    if not min_pixels or not fatores:
+        return None, 1
+    areas = _areas_na_grade(gdf, src, cache)
+    if areas.size == 0:
+        return None, 1
+    a, b, _, d, e, _ = tuple(src.transform)[:6]
+    pixels = float(areas.min()) / abs(a * e - b * d)
+    nivel, fator = None, 1
+    for i, f in enumerate(fatores):
+        if pixels / (f * f) >= min_pixels:
+            nivel, fator = i, f
+    return nivel, fator
+
+
+def _faixas(src, janela, max_pixels=MAX_PIXELS_FAIXA):
+    """Divide a janela em faixas horizontais alinhadas à altura dos blocos do raster."""
+    altura_bloco = src.block_shapes[0][0]
+    passo = max(altura_bloco, (max_pixels // max(janela.width, 1)) // altura_bloco * altura_bloco)
+    lin, fim = janela.row_off, janela.row_off + janela.height
+    while lin < fim:
+        prox = min(fim, (lin // passo + 1) * passo)
+        yield Window(janela.col_off, lin, janela.width, prox - lin)
+        lin = prox
+
+
+# --------------------
+# REDUÇÕES POR GRUPO (NUMPY)
+# --------------------
+def _acumulador(n_zonas, mediana):
+    """Cria o acumulador vazio das reduções parciais."""
+    return {
+        'count': np.zeros(n_zonas + 1, dtype=np.int64),
+        'sum': np.zeros(n_zonas + 1, dtype=np.float64),
+        'min': np.full(n_zonas + 1, np.inf),
+        'max': np.full(n_zonas + 1, -np.inf),
+        'rotulos': [] if mediana else None,
+        'valores': [] if mediana else None,
+    }
+
+
+def _reduzir_faixa(dados, rotulos_faixa, n_zonas, mediana):
+    """
+    Calcula as reduções parciais de uma faixa: contagem e soma via
+    ``bincount`` e mínimo/máximo via ``ufunc.at``. Para a mediana, guarda
+    os pares (rótulo, valor) válidos, ordenados depois em uma única vez.
+    """
+    valido = ~np.ma.getmaskarray(dados)
+    valores = np.ma.getdata(dados)
+    if np.issubdtype(valores.dtype, np.floating):
+        valido &= ~np.isnan(valores)
+
+    parcial = _acumulador(n_zonas, mediana)
+    for rot in rotulos_faixa:
+        sel = valido & (rot > 0)
+        if not sel.any():
+            continue
+        lab = rot[sel]
+        v = valores[sel]
+        v64 = v.astype(np.float64)
+        parcial['count'] += np.bincount(lab, minlength=n_zonas + 1)
+        parcial['sum'] += np.bincount(lab, weights=v64, minlength=n_zonas + 1)
+        np.minimum.at(parcial['min'], lab, v64)
+        np.maximum.at(parcial['max'], lab, v64)
+        if mediana:
+            parcial['rotulos'].append(lab)
+            parcial['valores'].append(v)
+    return parcial
+
+
+def _combinar(acc, parcial):
+    """Incorpora uma redução parcial ao acumulador (na ordem das faixas)."""
+    acc['count'] += parcial['count']
+    acc['sum'] += parcial['sum']
+    np.minimum(acc['min'], parcial['min'], out=acc['min'])
+    np.maximum(acc['max'], parcial['max'], out=acc['max'])
+    if acc['rotulos'] is not None:
+        acc['rotulos'].extend(parcial['rotulos'])
+        acc['valores'].extend(parcial['valores'])
+    return acc
+
+
+def _mediana_por_zona(rotulos, valores, contagem):
+    """Mediana de cada zona por ordenação única (rótulo, valor)."""
+    n = len(contagem) - 1
+    med = np.full(n, np.nan)
+    if not rotulos:
+        return med
+    lab = np.concatenate(rotulos)
+    val = np.concatenate(valores).astype(np.float64)
+    ordem = np.lexsort((val, lab))
+    val = val[ordem]
+
+    cont = contagem[1:]
+    inicio = np.cumsum(contagem)[:-1]  # posição do primeiro valor de cada zona
+    tem = cont > 0
+    baixo = inicio[tem] + (cont[tem] - 1) // 2
+    alto = inicio[tem] + cont[tem] // 2
+    med[tem] = (val[baixo] + val[alto]) / 2
+    return med
+
+
+def _finalizar(acc, stats):
+    """Converte o acumulador nas colunas de estatísticas (NaN para zonas sem pixels)."""
+    cont = acc['count'][1:]
+    vazio = cont == 0
+    saida = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if 'min' in stats:
+            saida['min'] = np.where(vazio, np.nan, acc['min'][1:])
+        if 'max' in stats:
+            saida['max'] = np.where(vazio, np.nan, acc['max'][1:])
+        if 'mean' in stats:
+            saida['mean'] = np.where(vazio, np.nan, acc['sum'][1:] / cont)
+    if 'median' in stats:
+        saida['median'] = _mediana_por_zona(acc['rotulos'], acc['valores'], acc['count'])
+    if 'count' in stats:
+        saida['count'] = cont
+    return saida
+
+
+# --------------------
+# TAREFAS (CAMADA × RASTER × FAIXA)
+# --------------------
+# handles mantidos por thread (datasets do rasterio não podem ser
+# compartilhados entre threads, p. ex. etapas simultâneas de um pipeline)
+_local = threading.local()
+MAX_RASTERS_ABERTOS = 64
+
+
+def _rasters_abertos():
+    abertos = getattr(_local, "rasters", None)
+    if abertos is None:
+        abertos = _local.rasters = OrderedDict()
+    return abertos
+
+
+def _abrir_raster(tif_path, nivel=None):
+    """Abre o raster (ou um nível de overview) uma única vez por thread e mantém o handle (LRU)."""
+    abertos = _rasters_abertos()
+    chave = (tif_path, nivel)
+    src = abertos.get(chave)
+    if src is None:
+        src = rasterio.open(tif_path) if nivel is None else rasterio.open(tif_path, overview_level=nivel)
+        abertos[chave] = src
+        if len(abertos) > MAX_RASTERS_ABERTOS:
+            abertos.popitem(last=False)[1].close()
+    else:
+        abertos.move_to_end(chave)
+    return src
+
+
+def _fechar_rasters():
+    """Fecha os handles mantidos pela thread atual."""
+    abertos = _rasters_abertos()
+    while abertos:
+        abertos.popitem()[1].close()
+
+
+def _rotulos_em_cache(gdf, src, cache, all_touched):
+    """Obtém (ou gera e guarda) os rótulos da camada para a grade de ``src``."""
+    chave = (grid_key(src), all_touched)
+    if cache is not None and chave in cache:
+        return cache[chave]
+    with stage("rasterizacao", raster=os.path.basename(src.name), feicoes=len(gdf)):
+        rotulos = build_labels(gdf, src, all_touched=all_touched)
+    if cache is not None:
+        cache[chave] = rotulos
+    return rotulos
+
+
+def _tarefas_par(gdf, tif_path, cache, band, all_touched, mediana, max_pixels, min_pixels=None):
+    """
+    Gera as tarefas (faixas com zonas) de um par camada × raster, em ordem.
+
+    O planejamento usa handles próprios, fechados ao final: os handles de
+    leitura (_abrir_raster) ficam só com quem processa as faixas.
+
+    Retorna:
+        tuple: (fator do overview lido, 1 = resolução original; lista de tarefas)
+    """
+    with rasterio.open(tif_path) as src:
+        nivel, fator = escolher_overview(gdf, src, min_pixels, band, cache)
+        if nivel is None:
+            return fator, _tarefas_grade(gdf, src, tif_path, nivel, cache, band, all_touched, mediana, max_pixels)
+    with rasterio.open(tif_path, overview_level=nivel) as src:
+        return fator, _tarefas_grade(gdf, src, tif_path, nivel, cache, band, all_touched, mediana, max_pixels)
+
+
+def _tarefas_grade(gdf, src, tif_path, nivel, cache, band, all_touched, mediana, max_pixels):
+    """Tarefas de um par na grade de ``src`` (resolução original ou um overview)."""
+    janela, rotulos = _rotulos_em_cache(gdf, src, cache, all_touched)
+    if janela is None:
+        return []
+    tarefas = []
+    for faixa in _faixas(src, janela, max_pixels):
+        ini = faixa.row_off - janela.row_off
+        rot_faixa = [r[ini:ini + faixa.height] for r in rotulos]
+        if any(r.any() for r in rot_faixa):
+            tarefas.append((tif_path, nivel, band, faixa.flatten(), rot_faixa, len(gdf), mediana))
+    return tarefas
+
+
+def _iniciar_worker():
+    """Descarta handles herdados do processo principal (cada worker abre os seus)."""
+    _local.rasters = OrderedDict()
+
+
+def _contexto_processos():
+    """
+    Workers iniciados por forkserver (ou spawn): um fork direto copiaria
+    handles do GDAL e travas de outras threads (p. ex. etapas simultâneas
+    de um pipeline) para dentro dos workers.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    contexto = multiprocessing.get_context('forkserver')
+    # o servidor importa os módulos dos workers uma vez; cada worker nasce dele já pronto
+    # (um único servidor por processo: a lista vale também para dn_to_reflectance)
+    contexto.set_forkserver_preload(['geoproc.zonal_engine', 'geoproc.raster'])
+    return contexto
+
+
+def _processar_tarefa(tarefa):
+    """Lê uma faixa do raster (handle reaproveitado) e devolve sua redução parcial."""
+    tif_path, nivel, band, faixa, rot_faixa, n_zonas, mediana = tarefa
+    src = _abrir_raster(tif_path, nivel)
+    dados = src.read(band, window=Window(*faixa), masked=True)
+    return _reduzir_faixa(dados, rot_faixa, n_zonas, mediana)
+
+
+# --------------------
+# FUNÇÕES PRINCIPAIS
+# --------------------
+def _validar_stats(stats):
+    stats = list(stats)
+    invalidas = set(stats) - set(STATS_SUPORTADAS) - {'count'}
+    if invalidas:
+        raise ValueError(f"Estatísticas não suportadas: {sorted(invalidas)}")
+    return stats
+
+
+def _tabela(acc, stats, fator):
+    """Tabela final de um par; a contagem lida em overview volta a pixels da resolução original."""
+    resultado = pd.DataFrame(_finalizar(acc, stats), columns=stats)
+    if fator > 1 and 'count' in resultado:
+        resultado['count'] *= fator * fator
+    return resultado
+
+
+def zonal_stats_layer(gdf, tif_path, stats=STATS_SUPORTADAS, cache=None,
+                      band=1, all_touched=False, max_pixels=MAX_PIXELS_FAIXA, min_pixels=None):
+    """
+    Calcula estatísticas zonais de todas as feições de uma camada sobre um raster.
+
+    Parâmetros:
+        gdf (geopandas.GeoDataFrame): camada de polígonos (já carregada)
+        tif_path (str): caminho do raster (.tif)
+        stats (sequence): estatísticas entre 'min', 'max', 'mean', 'median', 'count'
+        cache (dict): cache de rótulos da camada, reutilizado entre rasters da mesma grade
+        band (int): banda a ser lida
+        all_touched (bool): inclui todos os pixels tocados pelo polígono
+        max_pixels (int): limite de pixels por leitura
+        min_pixels (float): pixels por polígono exigidos para ler um overview
+            (None = sempre a resolução original)
+
+    Retorna:
+        pandas.DataFrame: uma linha por feição (ordem de ``gdf``), colunas = ``stats``
+            ('count' em pixels da resolução original); o fator do overview lido
+            fica em ``attrs['fator_overview']``
+    """
+    stats = _validar_stats(stats)
+    mediana = 'median' in stats
+    acc = _acumulador(len(gdf), mediana)
+    fator, tarefas = _tarefas_par(gdf, tif_path, cache, band, all_touched, mediana, max_pixels, min_pixels)
+    try:
+        with stage("estatisticas", raster=os.path.basename(tif_path), faixas=len(tarefas), overview=fator):
+            for tarefa in tarefas:
+                _combinar(acc, _processar_tarefa(tarefa))
+            resultado = _tabela(acc, stats, fator)
+    finally:
+        _fechar_rasters()
+    resultado.attrs['fator_overview'] = fator
+    return resultado
+
+
+def zonal_stats_batch(camadas, tif_paths, stats=STATS_SUPORTADAS, n_workers=1,
+                      band=1, all_touched=False, max_pixels=MAX_PIXELS_FAIXA, min_pixels=None):
+    """
+    Calcula estatísticas zonais para todos os pares camada × raster.
+
+    O trabalho é dividido em tarefas (camada, raster, faixa). Cada camada é
+    rasterizada uma vez por grade no processo principal; as faixas são lidas
+    e reduzidas pelos workers (processos novos, via forkserver ou spawn),
+    que mantêm abertos os GeoTIFFs já usados. As reduções parciais são
+    combinadas na ordem das faixas, de modo que o resultado com
+    ``n_workers > 1`` é idêntico ao da execução serial.
+
+    Com ``min_pixels``, cada par lê o overview mais grosseiro do raster em
+    que o menor polígono da camada ainda cobre ``min_pixels`` pixels: a
+    média fica próxima da original (overviews gerados por 'average'), e
+    mínimo, máximo e mediana passam a ser os dos pixels reamostrados. A
+    contagem ('count') é dada em pixels da resolução original (pixels do
+    overview × fator²), aproximada nas bordas.
+
+    Parâmetros:
+        camadas (iterable): pares (nome, GeoDataFrame), lidos sob demanda; aceita
+            também (nome, GeoDataFrame, rasters) para restringir os rasters da camada
+        tif_paths (list): caminhos dos rasters (.tif)
+        stats (sequence): estatísticas entre 'min', 'max', 'mean', 'median', 'count'
+        n_workers (int): processos de trabalho (1 = serial; None = todos os núcleos)
+        band (int): banda a ser lida
+        all_touched (bool): inclui todos os pixels tocados pelo polígono
+        max_pixels (int): limite de pixels por leitura
+        min_pixels (float): pixels por polígono exigidos para ler um overview
+            (None = sempre a resolução original)
+
+    Retorna:
+        generator: tuplas (nome, tif_path, DataFrame) na ordem camada × raster;
+            o fator do overview lido fica em ``DataFrame.attrs['fator_overview']``
+    """
+    stats = _validar_stats(stats)
+    mediana = 'median' in stats
+    n_workers = n_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=n_workers, mp_context=_contexto_processos(),
+                                   initializer=_iniciar_worker) if n_workers > 1 else None
+
+    try:
+        for nome, gdf, *rasters in camadas:
+            rasters = rasters[0] if rasters else tif_paths
+            cache = {}
+            fatores, por_raster = zip(*[
+                _tarefas_par(gdf, tif_path, cache, band, all_touched, mediana, max_pixels, min_pixels)
+                for tif_path in rasters
+            ]) if rasters else ((), ())
+            tarefas = [t for lista in por_raster for t in lista]
+            if executor is None:
+                parciais = map(_processar_tarefa, tarefas)
+            else:
+                lote = max(1, len(tarefas) // (n_workers * 4))
+                parciais = executor.map(_processar_tarefa, tarefas, chunksize=lote)
+
+            for tif_path, fator, lista in zip(rasters, fatores, por_raster):
+                # com n_workers > 1, mede a espera pelas faixas calculadas nos workers
+                with stage("estatisticas", arquivo=nome, raster=os.path.basename(tif_path),
+                           faixas=len(lista), overview=fator):
+                    acc = _acumulador(len(gdf), mediana)
+                    for _ in lista:
+                        _combinar(acc, next(parciais))
+                    resultado = _tabela(acc, stats, fator)
+                resultado.attrs['fator_overview'] = fator
+                yield nome, tif_path, resultado
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        _fechar_rasters()
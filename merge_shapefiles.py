@@ -3,60 +3,77 @@
 # Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
 # Descrição: Une múltiplos shapefiles (.shp) em um único arquivo vetorial.
 #            Adiciona coluna "source_file" indicando a origem de cada feição.
+#            A união é feita em fluxo: o esquema comum é calculado apenas
+#            pelos metadados das camadas e as feições são gravadas camada
+#            a camada, em lotes reprojetados para o CRS de referência,
+#            sem carregar todos os shapefiles na memória. A leitura (via
+#            Arrow) e a reprojeção dos lotes rodam em paralelo, mantendo
+#            a ordem de gravação da execução serial; tempo e memória por
+#            etapa podem ser registrados (arquivo_trace). A lógica está em
+#            geoproc.vector.merge_layers (também: geoproc merge <pasta>).
 # Linguagem: Python
-# Dependências: geopandas, pandas, shutil, glob, os
+# Dependências: geopandas, pyogrio, pyarrow (opcional), pyproj, shutil, glob, os
 # Data: 2025-10-25
 # ================================================================
 
-import geopandas as gpd
-import pandas as pd
 import os
 import shutil
 import glob
+from geoproc.instrument import enable_tracing, stage
+from geoproc.vector import EXTENSOES, merge_layers
 
 # --------------------
-# 1. CONFIGURAÇÃO DE PASTAS
+# CONFIGURAÇÕES
 # --------------------
-input_dir = input("Informe o caminho da pasta com os shapefiles: ").strip()
-if not os.path.isdir(input_dir):
-    raise NotADirectoryError(f"Pasta não encontrada: {input_dir}")
+# formato de saída: 'GPKG' (padrão, sem limite de 2 GB), 'FlatGeobuf' ou 'ESRI Shapefile'
+formato_saida = 'GPKG'
 
-output_dir = os.path.join(input_dir, "shapefile_unificado")
-os.makedirs(output_dir, exist_ok=True)
+# feições lidas, reprojetadas e gravadas por vez
+lote_feicoes = 100_000
 
-# --------------------
-# 2. LEITURA E UNIÃO
-# --------------------
-shapefiles = glob.glob(os.path.join(input_dir, "*.shp"))
-if not shapefiles:
-    raise FileNotFoundError("Nenhum arquivo .shp encontrado na pasta informada.")
+# lotes lidos/reprojetados simultaneamente (1 = serial)
+n_workers = os.cpu_count() or 4
 
-print(f"\n📁 {len(shapefiles)} shapefiles encontrados. Unificando...\n")
+# tempo, CPU, E/S e memória por etapa (esquema, leitura, reprojeção, gravação)
+# e arquivo: '.jsonl' ou trace do Chrome ('.json'); None = desativada
+arquivo_trace = None
 
-gdfs = []
-for shp_path in shapefiles:
-    gdf = gpd.read_file(shp_path)
-    gdf["source_file"] = os.path.basename(shp_path)
-    gdfs.append(gdf)
+if __name__ == "__main__":
+    if arquivo_trace:
+        enable_tracing(arquivo_trace)  # arquivo concluído ao final da execução
 
-# Garante mesmo CRS
-crs_ref = gdfs[0].crs
-for gdf in gdfs:
-    if gdf.crs != crs_ref:
-        gdf.to_crs(crs_ref, inplace=True)
+    # --------------------
+    # 1. CONFIGURAÇÃO DE PASTAS
+    # --------------------
+    input_dir = input("Informe o caminho da pasta com os shapefiles: ").strip()
+    if not os.path.isdir(input_dir):
+        raise NotADirectoryError(f"Pasta não encontrada: {input_dir}")
 
-merged = gpd.GeoDataFrame(pd.concat(gdfs, ignore_index=True), crs=crs_ref)
+    output_dir = os.path.join(input_dir, "shapefile_unificado")
+    os.makedirs(output_dir, exist_ok=True)
 
-# --------------------
-# 3. SALVAMENTO E COMPACTAÇÃO
-# --------------------
-out_path = os.path.join(output_dir, "shapefile_unificado.shp")
-merged.to_file(out_path)
-print(f"✅ Shapefile unificado salvo em: {out_path}")
+    shapefiles = sorted(glob.glob(os.path.join(input_dir, "*.shp")))
+    if not shapefiles:
+        raise FileNotFoundError("Nenhum arquivo .shp encontrado na pasta informada.")
+
+    print(f"\n📁 {len(shapefiles)} shapefiles encontrados. Unificando...\n")
+
+    # --------------------
+    # 2. UNIÃO EM FLUXO (CAMADA A CAMADA, EM LOTES)
+    # --------------------
+    out_path = os.path.join(output_dir, f"shapefile_unificado{EXTENSOES[formato_saida]}")
+    gravadas = merge_layers(shapefiles, out_path, driver=formato_saida,
+                            lote_feicoes=lote_feicoes, n_workers=n_workers)
+
+    # --------------------
+    # 3. SALVAMENTO E COMPACTAÇÃO
+    # --------------------
+    print(f"✅ Arquivo unificado salvo em: {out_path} ({gravadas} feições)")
 
-# Compacta a pasta
-zip_path = os.path.join(input_dir, "shapefile_unificado.zip")
-shutil.make_archive(zip_path.replace(".zip", ""), "zip", output_dir)
-print(f"📦 Arquivo compactado salvo em: {zip_path}")
+    # Compacta a pasta
+    zip_path = os.path.join(input_dir, "shapefile_unificado.zip")
+    with stage("compactacao", arquivo=zip_path):
+        shutil.make_archive(zip_path.replace(".zip", ""), "zip", output_dir)
+    print(f"📦 Arquivo compactado salvo em: {zip_path}")
 
-print("\n🚀 Processo concluído com sucesso.")
+    print("\n🚀 Processo concluído com sucesso.")
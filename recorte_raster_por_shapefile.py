@@ -0,0 +1,61 @@
+# ================================================================
+# Script: recorte_raster_por_shapefile.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+#
+# Descrição: Versão em Python de recorte_raster_por_shapefile.R.
+#             Recorta (crop + mask) imagens raster (.tif) utilizando um
+#             shapefile como limite da área de interesse, lendo apenas
+#             a janela que intersecta o polígono e processando-a bloco
+#             a bloco em paralelo. Em vez de reprojetar o raster inteiro,
+#             reprojeta o polígono para o CRS do raster (padrão) ou
+#             apenas a janela recortada para o CRS do shapefile.
+#             Exporta GeoTIFF em blocos (tiled) e comprimido, ou COG.
+#             A lógica está em geoproc.raster.clip_raster
+#             (também: geoproc clip <shapefile> <pasta de rasters>).
+# Linguagem: Python
+# Dependências: rasterio, geopandas, shapely, numpy
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import glob
+import geopandas as gpd
+from geoproc.raster import clip_raster
+
+# ------------------------------------------------------------
+# 1. Definir diretórios e opções
+# ------------------------------------------------------------
+dir_bandas = "data/rasters"
+dir_shape  = "data/shapes"
+dir_saida  = "results/recortes"
+
+shape_path = os.path.join(dir_shape, "area_experimental.shp")
+
+# False: reprojeta o polígono para o CRS do raster (sem reamostragem)
+# True: entrega no CRS do shapefile, reprojetando apenas a janela recortada
+reprojetar_para_shape = False
+
+# 'GTiff' (em blocos, comprimido) ou 'COG' (Cloud-Optimized GeoTIFF)
+formato_saida = 'GTiff'
+
+# blocos processados simultaneamente
+n_workers = os.cpu_count() or 4
+
+# ------------------------------------------------------------
+# 2. Carregar shapefile e listar arquivos raster (.tif)
+# ------------------------------------------------------------
+if __name__ == "__main__":
+    os.makedirs(dir_saida, exist_ok=True)
+    shape = gpd.read_file(shape_path)
+    arquivos = sorted(glob.glob(os.path.join(dir_bandas, "*.tif")))
+
+    # ------------------------------------------------------------
+    # 3. Recortar e exportar cada raster
+    # ------------------------------------------------------------
+    for arquivo in arquivos:
+        nome_banda = os.path.splitext(os.path.basename(arquivo))[0]
+        nome_saida = os.path.join(dir_saida, f"{nome_banda}_recorte.tif")
+        if clip_raster(arquivo, shape, nome_saida, reprojetar_para_shape, formato_saida, n_workers):
+            print(f"✅ Raster recortado salvo em: {nome_saida}")
+
+    print(f"Processamento concluído. Resultados em: {dir_saida}")
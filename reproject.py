@@ -1,30 +1,41 @@
 # ================================================================
 # Script: reproject_shapefile_utm.py
 # Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
-# Descrição: Reprojeta um shapefile de coordenadas geográficas (EPSG:4326)
-#            para o sistema métrico UTM (EPSG:32721 - WGS 84 / UTM zone 21S).
+# Descrição: Reprojeta um shapefile (ou todas as camadas de uma pasta)
+#            para o sistema métrico UTM. A zona é escolhida pela extensão
+#            de cada camada (ou fixada em crs_destino); as feições são
+#            processadas em lotes e a saída só substitui o arquivo
+#            original quando a gravação termina.
+#            A lógica está em geoproc.vector (também: geoproc reproject ...).
 # Linguagem: Python
-# Dependência: geopandas
+# Dependência: geopandas, pyogrio, pyproj
 # Data: 2025-10-25
 # ================================================================
 
-import geopandas as gpd
 from pathlib import Path
+from geoproc.vector import reproject_folder, reproject_layer
 
 # --------------------
 # ENTRADA
 # --------------------
-# caminho do shapefile original (em EPSG:4326)
+# shapefile original (em EPSG:4326) ou pasta com várias camadas
 shp_path = Path(r"D:\.shp")
 
-# --------------------
-# PROCESSAMENTO
-# --------------------
-gdf = gpd.read_file(shp_path)
-gdf = gdf.to_crs("EPSG:32721")  # reprojeta para UTM 21S (sul do Brasil)
+# CRS de destino: 'utm' (zona pela extensão da camada) ou um código fixo,
+# ex.: "EPSG:32721" (WGS 84 / UTM zone 21S)
+crs_destino = "utm"
+
+# camadas reprojetadas ao mesmo tempo (pasta) e feições por lote
+n_workers = None
+lote_feicoes = 100_000
 
 # --------------------
-# SAÍDA
+# PROCESSAMENTO E SAÍDA
 # --------------------
-gdf.to_file(shp_path, driver="ESRI Shapefile")
-print(f"Reprojeção concluída: {shp_path.name} → EPSG:32721")
+if __name__ == "__main__":
+    if shp_path.is_dir():
+        saida = reproject_folder(str(shp_path), crs_destino, n_workers=n_workers, lote_feicoes=lote_feicoes)
+        print(f"Reprojeção concluída: {len(saida['camadas'])} camada(s), {len(saida['falhas'])} falha(s)")
+    else:
+        _, crs = reproject_layer(str(shp_path), crs_destino, lote_feicoes=lote_feicoes)
+        print(f"Reprojeção concluída: {shp_path.name} → {crs}")
@@ -0,0 +1,60 @@
+# ================================================================
+# Script: test_areas.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes das áreas por classe (geoproc/areas.py): classe
+#            dissolvida (sobreposições contadas uma vez), inclusive
+#            entre arquivos com o mesmo rótulo, como no script em R.
+# Linguagem: Python
+# Dependências: pytest, geopandas, shapely
+# Data: 2026-10-18
+# ================================================================
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+import shapely  # noqa: E402
+from geoproc.areas import areas_por_classe  # noqa: E402
+
+X0, Y0 = 500_000, 7_000_000
+
+
+def gravar(path, caixas, crs="EPSG:32722"):
+    geoms = [shapely.box(X0 + x0, Y0 + y0, X0 + x1, Y0 + y1) for x0, y0, x1, y1 in caixas]
+    gdf = gpd.GeoDataFrame(geometry=geoms, crs="EPSG:32722").to_crs(crs)
+    gdf.to_file(path)
+    return str(path)
+
+
+def test_mesmo_rotulo_em_varios_arquivos(tmp_path):
+    arquivos = [
+        gravar(tmp_path / "doentes_1.shp", [(0, 0, 10, 10), (5, 0, 15, 10)]),       # 150 m²
+        gravar(tmp_path / "saudaveis.shp", [(100, 0, 120, 10)]),                    # 200 m²
+        gravar(tmp_path / "doentes_2.shp", [(10, 0, 20, 10), (50, 50, 60, 60)]),    # +50 +100 m²
+    ]
+    tabela = areas_por_classe(arquivos, ["Doentes", "Saudaveis", "Doentes"], talhao_ha=1)
+
+    assert tabela['classe'].tolist() == ["Doentes", "Saudaveis", "TOTAL_CLASSIFICADO", "TOTAL_PLANTAS"]
+    area = dict(zip(tabela['classe'], tabela['area_m2']))
+    assert area["Doentes"] == pytest.approx(300)
+    assert area["Saudaveis"] == pytest.approx(200)
+    assert area["TOTAL_CLASSIFICADO"] == pytest.approx(500)
+    assert tabela['pct_talhao'].iloc[0] == pytest.approx(3.0)
+
+
+def test_crs_diferentes_e_classes_de_plantas(tmp_path):
+    arquivos = [
+        gravar(tmp_path / "a.shp", [(0, 0, 100, 100)], crs="EPSG:4326"),
+        gravar(tmp_path / "b.shp", [(50, 0, 150, 100)]),
+    ]
+    tabela = areas_por_classe(arquivos, ["Mortas", "Solo"], talhao_ha=2, classes_plantas=["Mortas"])
+    area = dict(zip(tabela['classe'], tabela['area_m2']))
+
+    assert area["Mortas"] == pytest.approx(10_000, rel=1e-3)
+    assert area["Solo"] == pytest.approx(10_000, rel=1e-3)
+    assert area["TOTAL_PLANTAS"] == pytest.approx(area["Mortas"])
+
+
+def test_rotulos_devem_acompanhar_arquivos(tmp_path):
+    arquivo = gravar(tmp_path / "a.shp", [(0, 0, 1, 1)])
+    with pytest.raises(ValueError, match="um rótulo por arquivo"):
+        areas_por_classe([arquivo], ["A", "B"], talhao_ha=1)
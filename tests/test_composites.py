@@ -0,0 +1,77 @@
+# ================================================================
+# Script: test_composites.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes das amostras compostas (geoproc/composites.py):
+#            resultado idêntico, bit a bit, ao do algoritmo original
+#            (sample + np.array_split + média por bloco).
+# Linguagem: Python
+# Dependências: pytest, pandas, numpy
+# Data: 2026-10-18
+# ================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+from geoproc.composites import amostras_compostas
+
+
+def referencia(df, n_amostras, random_state=42):
+    """Algoritmo original de generate_composite_samples.py (laços por classe × preditora)."""
+    amostras_por_preditor = {}
+    for classe in df['classe'].unique():
+        for pred in df['preditoras'].unique():
+            df_pred = (
+                df[(df['classe'] == classe) & (df['preditoras'] == pred)]
+                .sample(frac=1, random_state=random_state)
+                .reset_index(drop=True)
+            )
+            # np.array_split(df_pred, n_amostras), pelas posições das linhas
+            splits = [df_pred.iloc[idx] for idx in np.array_split(np.arange(len(df_pred)), n_amostras)]
+            for i, bloco in enumerate(splits):
+                key = (classe, i + 1)
+                if key not in amostras_por_preditor:
+                    amostras_por_preditor[key] = {'amostra_id': i + 1, 'classe': classe}
+                amostras_por_preditor[key][pred] = bloco['median'].mean()
+    df_final = pd.DataFrame(list(amostras_por_preditor.values()))
+    cols = ['amostra_id', 'classe'] + sorted(
+        [c for c in df_final.columns if c not in ['amostra_id', 'classe']]
+    )
+    return df_final[cols]
+
+
+def dados(semente=0, n_classes=4, n_preditoras=5, max_linhas=60, fracao_nan=0.05):
+    """Grupos classe × preditora de tamanhos variados (inclusive vazios e menores que n_amostras)."""
+    rng = np.random.default_rng(semente)
+    partes = []
+    for c in range(n_classes):
+        for p in range(n_preditoras):
+            n = int(rng.integers(0, max_linhas))
+            partes.append(pd.DataFrame({
+                'classe': f"classe_{c}",
+                'preditoras': f"b{p:02d}",
+                'median': rng.normal(100, 30, n),
+            }))
+    df = pd.concat(partes, ignore_index=True).sample(frac=1, random_state=semente).reset_index(drop=True)
+    df.loc[rng.random(len(df)) < fracao_nan, 'median'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("n_amostras", [1, 3, 15, 70])
+@pytest.mark.parametrize("random_state", [42, 7])
+def test_identico_ao_algoritmo_original(n_amostras, random_state):
+    df = dados(semente=random_state)
+    esperado = referencia(df, n_amostras, random_state)
+    obtido = amostras_compostas(df, n_amostras, random_state)
+    pd.testing.assert_frame_equal(obtido, esperado, check_exact=True)
+
+
+def test_classes_numericas_e_bloco_so_com_nan():
+    df = pd.DataFrame({
+        'classe': [1, 1, 1, 2, 2, 2, 2],
+        'preditoras': ['ndvi', 'ndvi', 'evi', 'ndvi', 'ndvi', 'evi', 'evi'],
+        'median': [0.5, np.nan, 0.2, np.nan, np.nan, 0.4, 0.1],
+    })
+    esperado = referencia(df, 2)
+    obtido = amostras_compostas(df, 2)
+    pd.testing.assert_frame_equal(obtido, esperado, check_exact=True)
+    assert obtido.loc[obtido['classe'] == 2, 'ndvi'].isna().all()
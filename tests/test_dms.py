@@ -0,0 +1,61 @@
+# ================================================================
+# Script: test_dms.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes da conversão DMS → graus decimais/UTM em blocos
+#            (geoproc/dms.py): linhas inválidas registradas com o
+#            número da linha do CSV, em qualquer bloco.
+# Linguagem: Python
+# Dependências: pytest, pandas, pyproj, chardet
+# Data: 2026-10-18
+# ================================================================
+
+import pandas as pd
+import pytest
+from geoproc.dms import convert_dms_csv
+
+# linhas de dados (0 = primeira após o cabeçalho) com coordenada inválida;
+# com blocos de 5 linhas: primeira e última de um bloco e um bloco inteiro
+INVALIDAS = [0, 4, 5, 6, 7, 8, 9, 12, 22]
+N = 23
+
+
+@pytest.fixture
+def csv_dms(tmp_path):
+    linhas = ["ponto;lat;long;alt;sigmaLat;sigmaLong;sigmaAlt"]
+    for i in range(N):
+        lat = f"-27°{i:02d}'10.5\""
+        lon = "sem coordenada" if i in INVALIDAS else f"-51°{i:02d}'30''"
+        linhas.append(f"P{i};{lat};{lon};{100 + i};0.1;0.1;0.2")
+    path = tmp_path / "pontos.csv"
+    path.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunksize", [5, 7, None])
+def test_linhas_invalidas_em_varios_blocos(tmp_path, csv_dms, chunksize):
+    saida = tmp_path / f"saida_{chunksize}"
+    resultado = convert_dms_csv(csv_dms, output_dir=str(saida), chunksize=chunksize)
+
+    assert resultado['linhas'] == N
+    assert resultado['invalidas'] == len(INVALIDAS)
+    erros = pd.read_csv(resultado['erros'])
+    assert erros['linha'].tolist() == [i + 2 for i in INVALIDAS]  # cabeçalho = linha 1
+    assert erros['ponto'].tolist() == [f"P{i}" for i in INVALIDAS]
+
+    validas = [i for i in range(N) if i not in INVALIDAS]
+    kml = pd.read_csv(resultado['kml'])
+    assert kml['ponto'].tolist() == [f"P{i}" for i in validas]
+    assert kml['latitude'].tolist() == pytest.approx([-(27 + i / 60 + 10.5 / 3600) for i in validas])
+    assert kml['longitude'].tolist() == pytest.approx([-(51 + i / 60 + 30 / 3600) for i in validas])
+    utm = pd.read_csv(resultado['utm'])
+    assert len(utm) == len(validas) and set(utm['utm_zone']) == {22}
+
+
+def test_sem_linhas_invalidas_nao_grava_erros(tmp_path):
+    path = tmp_path / "pontos.csv"
+    path.write_text("ponto;lat;long;alt;sigmaLat;sigmaLong;sigmaAlt\n"
+                    "P1;-27°00'00\";-51°00'00\";10;0.1;0.1;0.2\n", encoding="utf-8")
+    resultado = convert_dms_csv(str(path), chunksize=1)
+
+    assert resultado['invalidas'] == 0 and resultado['erros'] is None
+    assert not (tmp_path / "coordenadas_erros.csv").exists()
@@ -0,0 +1,64 @@
+# ================================================================
+# Script: test_instrument.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes da instrumentação (geoproc/instrument.py): pico de
+#            RSS das etapas aninhadas e do processo preservados quando
+#            o VmHWM é zerado entre etapas.
+# Linguagem: Python
+# Dependências: pytest, numpy
+# Data: 2026-10-18
+# ================================================================
+
+import json
+import numpy as np
+import pytest
+from geoproc import instrument
+from geoproc.instrument import pico_rss_mb, reiniciar_pico, rss_atual_mb, stage, tracing
+
+MB = 1024 ** 2
+
+
+@pytest.fixture
+def linux():
+    if not reiniciar_pico():
+        pytest.skip("VmHWM não pode ser zerado neste sistema")
+
+
+def alocar(mb):
+    """Aloca e toca ``mb`` MB (entram no RSS) e libera ao sair."""
+    dados = np.ones(mb * MB, dtype=np.uint8)
+    return int(dados[::4096].sum())
+
+
+def test_pico_das_etapas_envolventes(tmp_path, linux):
+    trace = tmp_path / "trace.jsonl"
+    with tracing(str(trace)):
+        base = rss_atual_mb()
+        with stage("externa"):
+            alocar(200)
+            with stage("interna_1"):
+                pass
+            with stage("interna_2"):
+                alocar(50)
+    etapas = {r['etapa']: r for r in map(json.loads, trace.read_text().splitlines())}
+
+    assert etapas['externa']['rss_pico_mb'] >= base + 190
+    # as internas não herdam o pico anterior da externa
+    assert etapas['interna_1']['rss_pico_mb'] < base + 100
+    assert base + 40 <= etapas['interna_2']['rss_pico_mb'] < base + 100
+    assert etapas['interna_2']['pai'] == 'externa'
+
+
+def test_pico_do_processo_sobrevive_as_etapas(tmp_path, linux):
+    base = rss_atual_mb()
+    alocar(200)
+    with tracing(str(tmp_path / "trace.jsonl")):
+        with stage("a"):
+            pass
+        with stage("b"):
+            pass
+    assert instrument._status_linux("VmHWM") < base + 100  # zerado pelas etapas
+    assert pico_rss_mb() >= base + 190                       # mas preservado aqui
+
+    reiniciar_pico()  # nova medição explícita
+    assert pico_rss_mb() < base + 100
@@ -0,0 +1,46 @@
+# ================================================================
+# Script: test_pipeline.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes do executor de fluxos declarativos
+#            (geoproc/pipeline.py): etapas encadeadas em memória.
+# Linguagem: Python
+# Dependências: pytest, geopandas, shapely
+# Data: 2026-10-18
+# ================================================================
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+import shapely  # noqa: E402
+from geoproc.pipeline import run_pipeline  # noqa: E402
+
+
+@pytest.fixture
+def talhoes(tmp_path):
+    geoms = [shapely.box(500_000 + 20 * i, 7_000_000, 500_010 + 20 * i, 7_000_010) for i in range(6)]
+    path = str(tmp_path / "talhoes.shp")
+    gpd.GeoDataFrame({'id': range(1, 7)}, geometry=geoms, crs="EPSG:32722").to_file(path)
+    return path
+
+
+@pytest.mark.parametrize("valores", [["2", "5"], [2, 5], ["2.0", "5"]])
+def test_filtro_em_memoria_converte_valores(talhoes, valores):
+    # o filtro sobre uma etapa anterior deve aceitar os mesmos valores que o filtro de arquivo
+    etapas = [
+        {'nome': 'lido', 'op': 'read', 'entrada': talhoes},
+        {'nome': 'filtrado', 'op': 'filter', 'entrada': 'lido', 'campo': 'id', 'valores': valores},
+        {'nome': 'direto', 'op': 'filter', 'entrada': talhoes, 'campo': 'id', 'valores': valores},
+    ]
+    resultado = run_pipeline({'etapas': etapas}, n_workers=1)
+
+    assert resultado['filtrado']['id'].tolist() == [2, 5]
+    assert resultado['direto']['id'].tolist() == [2, 5]
+
+
+def test_filtro_em_memoria_rejeita_valor_invalido(talhoes):
+    etapas = [
+        {'nome': 'lido', 'op': 'read', 'entrada': talhoes},
+        {'nome': 'filtrado', 'op': 'filter', 'entrada': 'lido', 'campo': 'id', 'valores': ['abc']},
+    ]
+    with pytest.raises(RuntimeError, match="inválido"):
+        run_pipeline({'etapas': etapas}, n_workers=1)
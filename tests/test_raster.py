@@ -0,0 +1,59 @@
+# ================================================================
+# Script: test_raster.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes da conversão de DN para reflectância
+#            (geoproc/raster.py): valores, estatísticas da mesma
+#            passagem e nomes de saída únicos.
+# Linguagem: Python
+# Dependências: pytest, numpy, rasterio
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+from geoproc.raster import ESCALA_DN, dn_to_reflectance, nomes_saida
+
+
+def gravar_dn(path, deslocamento, largura=700, altura=1100):
+    """Raster uint16 de 2 bandas com algumas linhas em nodata (0)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dados = ((np.arange(largura * altura * 2).reshape(2, altura, largura) % 60000) + deslocamento).astype(np.uint16)
+    dados[:, 10:20, :] = 0
+    with rasterio.open(path, "w", driver="GTiff", width=largura, height=altura, count=2, dtype="uint16",
+                       crs="EPSG:32722", transform=from_origin(500_000, 7_001_100, 1, 1), nodata=0) as dst:
+        dst.write(dados)
+    return str(path), dados
+
+
+def test_nomes_saida_unicos():
+    arquivos = ["/a/x/orto.tif", "/a/y/orto.tif", "/a/y/b1.tif", "/b/x/orto.tif"]
+    assert nomes_saida(arquivos) == ["x_orto_ref.tif", "y_orto_ref.tif", "b1_ref.tif", "x_orto_2_ref.tif"]
+
+
+def test_mesmo_nome_em_pastas_diferentes_e_repetidos(tmp_path, monkeypatch):
+    monkeypatch.setattr("geoproc.raster.MAX_PIXELS_FAIXA", 200_000)  # faixas de 512 linhas
+    a, dados_a = gravar_dn(tmp_path / "voo1" / "orto.tif", 1)
+    b, dados_b = gravar_dn(tmp_path / "voo2" / "orto.tif", 500)
+    saida = tmp_path / "ref"
+
+    estatisticas, histogramas = dn_to_reflectance([a, b, a], str(saida), n_workers=2)
+
+    assert sorted(os.listdir(saida)) == ["voo1_orto_ref.tif", "voo2_orto_ref.tif"]
+    for nome, dados in (("voo1_orto_ref.tif", dados_a), ("voo2_orto_ref.tif", dados_b)):
+        with rasterio.open(saida / nome) as src:
+            ref = src.read()
+        validos = dados != 0
+        np.testing.assert_array_equal(ref[validos], dados[validos].astype(np.float32) / np.float32(ESCALA_DN))
+        assert np.isnan(ref[~validos]).all()
+
+        linhas = estatisticas[estatisticas['arquivo'] == nome]
+        assert linhas['banda'].tolist() == [1, 2]
+        for b in range(2):
+            esperado = dados[b][validos[b]].astype(np.float32) / np.float32(ESCALA_DN)
+            assert linhas['min'].iloc[b] == pytest.approx(esperado.min())
+            assert linhas['max'].iloc[b] == pytest.approx(esperado.max())
+            contagem = histogramas.loc[(histogramas['arquivo'] == nome) & (histogramas['banda'] == b + 1), 'contagem']
+            assert contagem.sum() == validos[b].sum()
@@ -0,0 +1,126 @@
+# ================================================================
+# Script: test_result_cache.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes do cache de resultados por par de arquivos
+#            (geoproc/result_cache.py): impressões digitais, acerto
+#            do cache, remoção das entradas menos usadas e reuso dos
+#            pares já calculados pelas estatísticas zonais.
+# Linguagem: Python
+# Dependências: pytest, pandas, pyarrow, geopandas, rasterio, shapely
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from geoproc.result_cache import ResultCache, cache_key, file_fingerprint
+
+
+# --------------------
+# IMPRESSÃO DIGITAL E CHAVE
+# --------------------
+def test_impressao_muda_com_o_arquivo(tmp_path):
+    path = tmp_path / "a.tif"
+    path.write_bytes(b"x" * 100)
+    antes = {modo: file_fingerprint(str(path), modo) for modo in ('mtime', 'hash')}
+
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert file_fingerprint(str(path), 'mtime') != antes['mtime']
+    assert file_fingerprint(str(path), 'hash') == antes['hash']  # mesmo conteúdo
+
+    path.write_bytes(b"y" * 100)
+    assert file_fingerprint(str(path), 'hash') != antes['hash']
+    with pytest.raises(ValueError, match="Modo inválido"):
+        file_fingerprint(str(path), 'md5')
+
+
+def test_impressao_do_shapefile_inclui_auxiliares(tmp_path):
+    for ext in ('.shp', '.shx', '.dbf'):
+        (tmp_path / f"t{ext}").write_bytes(b"0" * 10)
+    antes = file_fingerprint(str(tmp_path / "t.shp"), 'hash')
+    (tmp_path / "t.dbf").write_bytes(b"1" * 10)  # só os atributos mudaram
+    assert file_fingerprint(str(tmp_path / "t.shp"), 'hash') != antes
+
+
+def test_chave_depende_dos_parametros():
+    assert cache_key("a", "b", stats=['mean'], band=1) == cache_key("a", "b", band=1, stats=['mean'])
+    assert cache_key("a", "b", stats=['mean']) != cache_key("a", "b", stats=['max'])
+    assert cache_key("a", "b") != cache_key("b", "a")
+
+
+# --------------------
+# CACHE EM DISCO
+# --------------------
+def test_acerto_e_ausencia(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    chave = cache_key("a", "b")
+    assert chave not in cache and cache.get(chave) is None
+
+    df = pd.DataFrame({'mean': [1.5, 2.5], 'count': [3, 4]})
+    cache.put(chave, df)
+    assert chave in cache
+    pd.testing.assert_frame_equal(cache.get(chave), df)
+    assert not [f for _, _, fs in os.walk(tmp_path) for f in fs if f.endswith('.tmp')]
+
+
+def test_remove_as_menos_usadas(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    chaves = [cache_key(str(i)) for i in range(3)]
+    for i, chave in enumerate(chaves):
+        cache.put(chave, pd.DataFrame({'v': np.arange(100) + i}))
+        t = (i + 1) * 1_000_000_000
+        os.utime(cache._path(chave), ns=(t, t))  # 0 é a mais antiga
+    assert cache.evict() == 0  # sem limite
+
+    cache.get(chaves[0])  # a mais antiga passa a ser a mais recente
+    total = cache.size()
+    assert cache.evict(max_bytes=total - 1) == 1
+    assert chaves[1] not in cache
+    assert chaves[0] in cache and chaves[2] in cache
+
+    assert ResultCache(str(tmp_path / "cache"), max_bytes=0).evict() == 2
+    assert cache.size() == 0
+
+
+# --------------------
+# REUSO NAS ESTATÍSTICAS ZONAIS
+# --------------------
+def test_zonal_reaproveita_pares(tmp_path, capsys):
+    gpd = pytest.importorskip("geopandas")
+    import rasterio
+    import shapely
+    from rasterio.transform import from_origin
+    from geoproc.zonal import zonal_stats_folders
+
+    shp_folder, tif_folder = tmp_path / "shp", tmp_path / "tif"
+    shp_folder.mkdir()
+    tif_folder.mkdir()
+    for nome, x in (("a", 2), ("b", 20)):
+        gpd.GeoDataFrame(geometry=[shapely.box(500_000 + x, 7_000_002, 500_010 + x, 7_000_012)],
+                         crs="EPSG:32722").to_file(shp_folder / f"{nome}.shp")
+    dados = np.arange(32 * 32, dtype=np.float32).reshape(32, 32)
+    with rasterio.open(tif_folder / "r.tif", "w", driver="GTiff", width=32, height=32, count=1,
+                       dtype="float32", crs="EPSG:32722", transform=from_origin(500_000, 7_000_032, 1, 1)) as dst:
+        dst.write(dados, 1)
+    saida = str(tmp_path / "resultado.parquet")
+
+    def rodar():
+        capsys.readouterr()
+        zonal_stats_folders(str(shp_folder), str(tif_folder), output_path=saida, progresso=False)
+        return capsys.readouterr().out, pd.read_parquet(saida)
+
+    saida1, df1 = rodar()
+    assert "Pares a calcular: 2 de 2" in saida1
+    saida2, df2 = rodar()
+    assert "Pares a calcular: 0 de 2" in saida2
+    pd.testing.assert_frame_equal(df1, df2)
+
+    # só o par do shapefile alterado é recalculado
+    gpd.GeoDataFrame(geometry=[shapely.box(500_004, 7_000_004, 500_008, 7_000_008)],
+                     crs="EPSG:32722").to_file(shp_folder / "a.shp")
+    saida3, df3 = rodar()
+    assert "Pares a calcular: 1 de 2" in saida3
+    assert df3.loc[df3['shapefile'] == 'b.shp'].reset_index(drop=True).equals(
+        df1.loc[df1['shapefile'] == 'b.shp'].reset_index(drop=True))
+    assert df3.loc[df3['shapefile'] == 'a.shp', 'mean'].iloc[0] != df1.loc[df1['shapefile'] == 'a.shp', 'mean'].iloc[0]
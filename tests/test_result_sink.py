@@ -0,0 +1,111 @@
+# ================================================================
+# Script: test_result_sink.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes da gravação incremental de resultados
+#            (geoproc/result_sink.py): Parquet, Feather e CSV em
+#            vários lotes, substituição atômica do destino, dataset
+#            particionado e exportação para Excel em várias abas.
+# Linguagem: Python
+# Dependências: pytest, pandas, numpy, pyarrow, openpyxl
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from geoproc.result_sink import ResultSink, export_excel, formato_por_extensao, iter_batches, write_partition
+
+
+def lotes(n_lotes=5, linhas=7):
+    """Lotes com colunas de tipos diferentes e NaN em uma delas."""
+    for i in range(n_lotes):
+        inicio = i * linhas
+        yield pd.DataFrame({
+            'shapefile': [f"s{inicio + j}.shp" for j in range(linhas)],
+            'polygon_id': np.arange(inicio, inicio + linhas, dtype=np.int64),
+            'mean': np.where(np.arange(linhas) % 3 == 0, np.nan, np.arange(linhas) * 0.5 + i),
+        })
+
+
+def ler(path):
+    formato = formato_por_extensao(path)
+    if formato == 'parquet':
+        return pd.read_parquet(path)
+    if formato == 'feather':
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+# --------------------
+# FORMATOS
+# --------------------
+@pytest.mark.parametrize("nome", ["r.parquet", "r.feather", "r.csv", "r.arrow"])
+@pytest.mark.parametrize("linhas_por_grupo", [1, 10, 1000])
+def test_formatos_em_varios_lotes(tmp_path, nome, linhas_por_grupo):
+    path = str(tmp_path / nome)
+    esperado = pd.concat(lotes(), ignore_index=True)
+    with ResultSink(path, linhas_por_grupo=linhas_por_grupo) as sink:
+        for df in lotes():
+            sink.write(df)
+        sink.write(esperado.iloc[:0])  # lotes vazios são ignorados
+
+    assert sink.linhas == len(esperado)
+    pd.testing.assert_frame_equal(ler(path), esperado)
+    pd.testing.assert_frame_equal(pd.concat(iter_batches(path, linhas=4), ignore_index=True), esperado)
+    assert os.listdir(tmp_path) == [nome]
+
+
+def test_colunas_na_ordem_do_primeiro_lote(tmp_path):
+    path = str(tmp_path / "r.parquet")
+    with ResultSink(path) as sink:
+        sink.write(pd.DataFrame({'a': [1], 'b': [2.0]}))
+        sink.write(pd.DataFrame({'b': [4.0], 'a': [3]}))
+    pd.testing.assert_frame_equal(pd.read_parquet(path), pd.DataFrame({'a': [1, 3], 'b': [2.0, 4.0]}))
+
+
+def test_formato_nao_suportado():
+    with pytest.raises(ValueError, match="não suportado"):
+        ResultSink("r.xlsx")
+
+
+@pytest.mark.parametrize("nome", ["r.parquet", "r.csv"])
+def test_falha_mantem_o_resultado_anterior(tmp_path, nome):
+    path = str(tmp_path / nome)
+    with ResultSink(path) as sink:
+        sink.write(pd.DataFrame({'v': [1, 2]}))
+
+    with pytest.raises(RuntimeError):
+        with ResultSink(path, linhas_por_grupo=1) as sink:
+            sink.write(pd.DataFrame({'v': [9]}))
+            raise RuntimeError("interrompido")
+    assert ler(path)['v'].tolist() == [1, 2]
+
+
+# --------------------
+# DATASET PARTICIONADO E EXCEL
+# --------------------
+def test_dataset_particionado(tmp_path):
+    df = pd.concat(lotes(2), ignore_index=True).assign(raster=lambda d: np.where(d.index % 2, "b.tif", "a.tif"))
+    caminhos = write_partition(df, str(tmp_path / "ds"), 'raster')
+
+    assert sorted(os.path.relpath(c, tmp_path) for c in caminhos) == [
+        os.path.join("ds", "raster=a.tif", "part-0.parquet"), os.path.join("ds", "raster=b.tif", "part-0.parquet")]
+    lido = pd.read_parquet(tmp_path / "ds").sort_values('polygon_id').reset_index(drop=True)
+    assert lido['raster'].astype(str).tolist() == df['raster'].tolist()
+    pd.testing.assert_frame_equal(lido.drop(columns='raster'), df.drop(columns='raster'))
+
+
+def test_excel_em_varias_abas(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "r.feather")
+    with ResultSink(path) as sink:
+        for df in lotes():
+            sink.write(df)
+
+    assert export_excel(path, str(tmp_path / "r.xlsx"), max_linhas=10) == 4
+    wb = openpyxl.load_workbook(tmp_path / "r.xlsx")
+    assert wb.sheetnames == ["resultados", "resultados_2", "resultados_3", "resultados_4"]
+    linhas = [linha for aba in wb for linha in list(aba.values)[1:]]
+    assert [linha[1] for linha in linhas] == list(range(35))
+    assert linhas[0][2] is None  # NaN vira célula vazia
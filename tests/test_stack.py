@@ -0,0 +1,111 @@
+# ================================================================
+# Script: test_stack.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes da pilha multibanda em disco (geoproc/stack.py):
+#            reaproveitamento e reconstrução (arquivos alterados ou em
+#            outra ordem), detecção de fontes desatualizadas e
+#            estatísticas zonais iguais às do zonal_engine.
+# Linguagem: Python
+# Dependências: pytest, numpy, rasterio, geopandas, shapely
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+gpd = pytest.importorskip("geopandas")
+import shapely  # noqa: E402
+from geoproc.stack import ARQUIVO_DADOS, RasterStack, build_stack  # noqa: E402
+from geoproc.zonal_engine import zonal_stats_layer  # noqa: E402
+
+NODATA = -9999.0
+
+
+def gravar(path, valor, largura=40, altura=30):
+    """Raster float32 com valores distintos por arquivo (valor + índice do pixel)."""
+    dados = (np.arange(largura * altura, dtype=np.float32).reshape(altura, largura) + valor)
+    dados[0, :5] = NODATA
+    with rasterio.open(path, "w", driver="GTiff", width=largura, height=altura, count=1, dtype="float32",
+                       crs="EPSG:32722", transform=from_origin(500_000, 7_000_030, 1, 1), nodata=NODATA) as dst:
+        dst.write(dados, 1)
+    return str(path)
+
+
+@pytest.fixture
+def rasters(tmp_path):
+    pasta = tmp_path / "tif"
+    pasta.mkdir()
+    return [gravar(pasta / f"{nome}.tif", valor) for nome, valor in (("a", 0), ("b", 1000), ("c", 2000))]
+
+
+def montada(destino):
+    return os.stat(os.path.join(destino, ARQUIVO_DADOS)).st_mtime_ns
+
+
+# --------------------
+# MONTAGEM E REAPROVEITAMENTO
+# --------------------
+def test_reaproveita_pilha_atualizada(tmp_path, rasters):
+    destino = str(tmp_path / "pilha")
+    build_stack(os.path.dirname(rasters[0]), destino)
+    antes = montada(destino)
+
+    build_stack(os.path.dirname(rasters[0]), destino)
+    assert montada(destino) == antes
+    build_stack(os.path.dirname(rasters[0]), destino, reconstruir=True)
+    assert montada(destino) != antes
+
+
+def test_outra_ordem_reconstroi_com_as_bandas_na_nova_ordem(tmp_path, rasters):
+    destino = str(tmp_path / "pilha")
+    build_stack(rasters, destino)
+    build_stack(rasters[::-1], destino)
+
+    pilha = RasterStack(destino)
+    assert pilha.bandas == ["c", "b", "a"]
+    valores = pilha.sample([500_010.5], [7_000_020.5])  # linha 9, coluna 10
+    assert valores.iloc[0].tolist() == [2000 + 370, 1000 + 370, 370]
+
+
+def test_raster_alterado_fica_desatualizado(tmp_path, rasters):
+    destino = str(tmp_path / "pilha")
+    build_stack(rasters, destino)
+    assert RasterStack(destino).desatualizados() == []
+
+    gravar(rasters[1], 5000)
+    os.utime(rasters[1], ns=(1_000_000_000, 1_000_000_000))  # mtime sempre diferente
+    assert RasterStack(destino).desatualizados() == ["b.tif"]
+
+    build_stack(rasters, destino)
+    pilha = RasterStack(destino)
+    assert pilha.desatualizados() == []
+    assert pilha.sample([500_010.5], [7_000_020.5])['b'].iloc[0] == 5000 + 370
+
+
+def test_grade_diferente_e_rejeitada(tmp_path, rasters):
+    outro = gravar(tmp_path / "d.tif", 0, largura=41)
+    with pytest.raises(ValueError, match="fora da grade"):
+        build_stack(rasters + [outro], str(tmp_path / "pilha"))
+
+
+# --------------------
+# CONSULTAS
+# --------------------
+def test_zonal_igual_ao_motor(tmp_path, rasters):
+    destino = build_stack(rasters, str(tmp_path / "pilha"))
+    gdf = gpd.GeoDataFrame(geometry=[
+        shapely.box(500_000.5, 7_000_020.2, 500_012.3, 7_000_029.9),   # inclui nodata
+        shapely.Point(500_020, 7_000_010).buffer(6.2),
+        shapely.box(500_100, 7_000_100, 500_110, 7_000_110),           # fora da grade
+    ], crs="EPSG:32722")
+    stats = ['min', 'max', 'mean', 'median', 'count']
+
+    resultado = RasterStack(destino).zonal_stats(gdf, stats=stats)
+    for raster in rasters:
+        nome = os.path.splitext(os.path.basename(raster))[0]
+        obtido = resultado[resultado['raster'] == nome][stats].reset_index(drop=True)
+        esperado = zonal_stats_layer(gdf, raster, stats=stats)[stats].reset_index(drop=True)
+        np.testing.assert_allclose(obtido.to_numpy(dtype=float), esperado.to_numpy(dtype=float), equal_nan=True)
@@ -0,0 +1,127 @@
+# ================================================================
+# Script: test_vector.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes de comportamento das operações vetoriais
+#            (geoproc/vector.py): união, filtro com exportação e
+#            reprojeção em lotes.
+# Linguagem: Python
+# Dependências: pytest, geopandas, pyogrio, shapely
+# Data: 2026-10-18
+# ================================================================
+
+import os
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+import pyogrio  # noqa: E402
+import shapely  # noqa: E402
+from geoproc.cli import main  # noqa: E402
+from geoproc.vector import merge_layers, reproject_layer  # noqa: E402
+
+
+# --------------------
+# DADOS SINTÉTICOS
+# --------------------
+def camada(n, x0=0.0, crs="EPSG:32722"):
+    """Quadrados de 10 m com campos id (inteiro) e nome (texto)."""
+    geoms = [shapely.box(x0 + 20 * i, 7_000_000, x0 + 20 * i + 10, 7_000_010) for i in range(n)]
+    return gpd.GeoDataFrame({'id': range(1, n + 1), 'nome': [f"T{i}" for i in range(1, n + 1)]},
+                            geometry=geoms, crs=crs)
+
+
+@pytest.fixture
+def shapefiles(tmp_path):
+    pasta = tmp_path / "entrada"
+    pasta.mkdir()
+    paths = []
+    for i, n in enumerate((5, 7, 3)):
+        path = str(pasta / f"c{i}.shp")
+        camada(n, x0=500_000 + 1000 * i).to_file(path)
+        paths.append(path)
+    return paths
+
+
+# --------------------
+# UNIÃO
+# --------------------
+def test_merge_substitui_so_a_saida(tmp_path, shapefiles):
+    saida = tmp_path / "dados.gpkg"
+    vizinhos = [tmp_path / "dados.csv"]
+    camada(2).to_file(tmp_path / "dados.shp")
+    vizinhos += [tmp_path / f"dados{ext}" for ext in ('.shp', '.shx', '.dbf', '.prj')]
+    (tmp_path / "dados.csv").write_text("a,b\n1,2\n")
+    camada(1).to_file(saida)  # saída anterior
+
+    assert merge_layers(shapefiles, str(saida), lote_feicoes=4, n_workers=2) == 15
+    assert pyogrio.read_info(str(saida), layer="shapefile_unificado")['features'] == 15
+    assert all(v.exists() for v in vizinhos)
+
+
+def test_merge_shapefile_em_lotes_com_nome_especial(tmp_path, shapefiles):
+    saida = tmp_path / "saida[1].shp"
+    camada(2).to_file(saida)  # saída anterior
+    (tmp_path / "saida[1].csv").write_text("x\n")
+
+    assert merge_layers(shapefiles, str(saida), driver='ESRI Shapefile', lote_feicoes=4) == 15
+    assert pyogrio.read_info(str(saida))['features'] == 15
+    assert (tmp_path / "saida[1].csv").exists()
+    assert not [f for f in os.listdir(tmp_path) if f.startswith("shapefile_unificado")]
+
+
+# --------------------
+# FILTRO
+# --------------------
+def test_filter_cli_valores_texto_em_campo_inteiro(tmp_path, shapefiles):
+    saida = tmp_path / "filtrados"
+    main(["filter", shapefiles[1], "--campo", "id", "--valores", "2", "3", "99", "-o", str(saida)])
+
+    assert pyogrio.read_info(str(saida / "feicoes_filtradas.shp"))['features'] == 2
+    for valor in ("2", "3"):
+        gdf = gpd.read_file(saida / f"{valor}.shp")
+        assert gdf['id'].tolist() == [int(valor)]
+    assert not (saida / "99.shp").exists()
+
+
+# --------------------
+# REPROJEÇÃO
+# --------------------
+def test_reproject_shapefile_no_lugar(tmp_path):
+    path = str(tmp_path / "talhoes.shp")
+    original = camada(9, x0=500_000).to_crs("EPSG:4326")
+    original.to_file(path)
+
+    destino, crs = reproject_layer(path, "utm", lote_feicoes=4, n_workers=2)
+
+    assert destino == path and crs == "EPSG:32722"
+    gdf = gpd.read_file(path)
+    assert gdf.crs.to_epsg() == 32722
+    assert gdf['id'].tolist() == list(range(1, 10))
+    assert (shapely.hausdorff_distance(gdf.geometry.values, camada(9, x0=500_000).geometry.values) < 1e-3).all()
+    # só os arquivos do shapefile, sem temporários
+    assert sorted(os.listdir(tmp_path)) == sorted(f"talhoes{e}" for e in ('.shp', '.shx', '.dbf', '.prj', '.cpg'))
+
+
+def test_reproject_gpkg_mantem_todas_as_camadas(tmp_path):
+    path = str(tmp_path / "dados.gpkg")
+    camada(5, x0=500_000).to_crs("EPSG:4326").to_file(path, layer="talhoes")
+    camada(3, x0=600_000).to_crs("EPSG:4326").to_file(path, layer="parcelas")
+
+    reproject_layer(path, "EPSG:32722", lote_feicoes=2)
+
+    assert sorted(nome for nome, _ in pyogrio.list_layers(path)) == ["parcelas", "talhoes"]
+    for nome, n in (("talhoes", 5), ("parcelas", 3)):
+        gdf = gpd.read_file(path, layer=nome)
+        assert len(gdf) == n and gdf.crs.to_epsg() == 32722
+
+
+def test_reproject_camada_unica_de_gpkg_exige_saida(tmp_path):
+    path = str(tmp_path / "dados.gpkg")
+    camada(2).to_file(path, layer="a")
+    camada(2).to_file(path, layer="b")
+
+    with pytest.raises(ValueError, match="out_path"):
+        reproject_layer(path, "EPSG:4326", layer="a")
+    saida = str(tmp_path / "a.gpkg")
+    reproject_layer(path, "EPSG:4326", out_path=saida, layer="a")
+    assert [nome for nome, _ in pyogrio.list_layers(saida)] == ["a"]
+    assert gpd.read_file(path, layer="a").crs.to_epsg() == 32722
@@ -0,0 +1,88 @@
+# ================================================================
+# Script: test_zonal_engine.py
+# Autor: Eng. Florestal MSc. Sally Deborah P. da Silva
+# Descrição: Testes de regressão do motor de estatísticas zonais
+#            (geoproc/zonal_engine.py): resultado igual ao do
+#            rasterstats em um raster sintético (float32, nodata,
+#            polígonos sobrepostos) e execução paralela idêntica à serial.
+# Linguagem: Python
+# Dependências: pytest, rasterstats, geopandas, rasterio, shapely, numpy
+# Data: 2026-10-18
+# ================================================================
+
+import numpy as np
+import pytest
+import rasterio
+import shapely
+from rasterio.transform import from_origin
+
+gpd = pytest.importorskip("geopandas")
+from geoproc.zonal_engine import zonal_stats_batch, zonal_stats_layer  # noqa: E402
+
+STATS = ['min', 'max', 'mean', 'median', 'count']
+NODATA = -9999.0
+
+
+# --------------------
+# DADOS SINTÉTICOS
+# --------------------
+@pytest.fixture(scope="module")
+def raster(tmp_path_factory):
+    """GeoTIFF float32 ladrilhado (blocos 16 × 16) com uma faixa e pixels esparsos em nodata."""
+    rng = np.random.default_rng(42)
+    dados = (rng.random((120, 96)) * 50 + 10).astype(np.float32)
+    dados[40:44, :] = NODATA
+    dados[rng.random(dados.shape) < 0.05] = NODATA
+    path = tmp_path_factory.mktemp("zonal") / "sintetico.tif"
+    with rasterio.open(path, "w", driver="GTiff", width=96, height=120, count=1, dtype="float32",
+                       crs="EPSG:32722", transform=from_origin(500_000, 7_000_120, 1, 1),
+                       nodata=NODATA, tiled=True, blockxsize=16, blockysize=16) as dst:
+        dst.write(dados, 1)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def poligonos():
+    """Polígonos sobrepostos, fora de alinhamento com a grade, um fora do raster e um só em nodata."""
+    x0, y0 = 500_000, 7_000_000
+    geoms = [
+        shapely.box(x0 + 3.3, y0 + 5.7, x0 + 40.2, y0 + 60.9),
+        shapely.box(x0 + 20.1, y0 + 30.4, x0 + 70.8, y0 + 90.2),                 # sobrepõe o 1º
+        shapely.Point(x0 + 35.5, y0 + 45.5).buffer(18.3),                       # sobrepõe ambos
+        shapely.Polygon([(x0 + 60, y0 + 2), (x0 + 95, y0 + 10), (x0 + 80, y0 + 38)]),
+        shapely.box(x0 + 10.2, y0 + 76.1, x0 + 50.7, y0 + 79.9),                # só nodata
+        shapely.box(x0 + 500, y0 + 500, x0 + 520, y0 + 520),                    # fora do raster
+    ]
+    return gpd.GeoDataFrame({'id': range(len(geoms))}, geometry=geoms, crs="EPSG:32722")
+
+
+# --------------------
+# TESTES
+# --------------------
+def test_igual_ao_rasterstats(raster, poligonos):
+    rasterstats = pytest.importorskip("rasterstats")
+
+    resultado = zonal_stats_layer(poligonos, raster, stats=STATS)
+    referencia = rasterstats.zonal_stats(poligonos, raster, stats=STATS, nodata=NODATA)
+
+    assert len(resultado) == len(referencia)
+    for i, esperado in enumerate(referencia):
+        obtido = resultado.iloc[i]
+        assert obtido['count'] == esperado['count'], f"feição {i}"
+        for stat in ('min', 'max', 'mean', 'median'):
+            if esperado[stat] is None:
+                assert np.isnan(obtido[stat]), f"feição {i}: {stat}"
+            else:
+                assert obtido[stat] == pytest.approx(esperado[stat], rel=1e-6), f"feição {i}: {stat}"
+
+
+def test_paralelo_igual_ao_serial(raster, poligonos):
+    # faixas pequenas: várias tarefas por par, distribuídas entre os workers
+    camadas = [('a', poligonos), ('b', poligonos.iloc[::-1].reset_index(drop=True))]
+    serial = list(zonal_stats_batch(camadas, [raster, raster], stats=STATS, n_workers=1, max_pixels=256))
+    paralelo = list(zonal_stats_batch(camadas, [raster, raster], stats=STATS, n_workers=2, max_pixels=256))
+
+    assert len(serial) == len(paralelo) == 4
+    for (nome_s, tif_s, df_s), (nome_p, tif_p, df_p) in zip(serial, paralelo):
+        assert (nome_s, tif_s) == (nome_p, tif_p)
+        assert df_s.equals(df_p)